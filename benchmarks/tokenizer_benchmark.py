@@ -0,0 +1,74 @@
+"""Compare the throughput of the extractor's word tokenizers.
+
+Tokenises every sentence of a corpus with each tokenizer accepted by the
+``tokenizer`` config option and reports tokens per second, best of
+``--repeat`` runs.  Sentences are split once up front, exactly as
+:class:`~pattern_language_miner.extractor.pattern_extractor.PatternExtractor`
+does, so only word tokenisation is timed.
+
+Usage::
+
+    PYTHONPATH=src python benchmarks/tokenizer_benchmark.py
+    PYTHONPATH=src python benchmarks/tokenizer_benchmark.py --corpus ./docs --scale 1
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import time
+from pathlib import Path
+from typing import List
+
+import nltk
+
+from pattern_language_miner.extractor.word_tokenizers import TOKENIZERS, get_tokenizer
+
+DEFAULT_CORPUS = Path(__file__).parent.parent / "tests" / "data" / "corpus"
+
+
+def load_sentences(corpus: Path) -> List[str]:
+    """Split every ``.md``/``.txt``/``.html`` file under *corpus* into sentences."""
+    text = "\n\n".join(
+        path.read_text(encoding="utf-8")
+        for path in sorted(corpus.rglob("*"))
+        if path.suffix in {".md", ".txt", ".html"}
+    )
+    try:
+        sentences = nltk.sent_tokenize(text)
+    except LookupError:
+        # Without punkt data, fall back to splitting on terminal punctuation.
+        sentences = re.split(r"(?<=[.!?])\s+", text)
+    return [s.lower() for s in sentences if s.strip()]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", type=Path, default=DEFAULT_CORPUS)
+    parser.add_argument(
+        "--scale", type=int, default=200, help="Repeat the corpus this many times."
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per tokenizer.")
+    args = parser.parse_args()
+
+    sentences = load_sentences(args.corpus) * args.scale
+    print(f"{len(sentences):,} sentences from {args.corpus}\n")
+    print(f"{'tokenizer':<10} {'tokens':>10} {'seconds':>9} {'tokens/s':>12}")
+
+    for name in sorted(TOKENIZERS):
+        try:
+            tokenize = get_tokenizer(name)
+            tokenize("warm up.")
+        except (ImportError, LookupError) as exc:
+            print(f"{name:<10} unavailable: {type(exc).__name__}")
+            continue
+        best = float("inf")
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            n_tokens = sum(len(tokenize(sentence)) for sentence in sentences)
+            best = min(best, time.perf_counter() - start)
+        print(f"{name:<10} {n_tokens:>10,} {best:>9.3f} {n_tokens / best:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,20 +6,27 @@ Commands
 --------
 analyze
     Extract lexical n-gram patterns from a directory of documents.
+dedup
+    Merge contained and near-duplicate patterns.
 enrich
     Add inferred metadata to raw extracted patterns.
 cluster
     Cluster enriched patterns by semantic similarity.
+assign
+    Add new patterns to the clusters of a previous ``cluster`` run.
 generate-sentences
     Convert pattern YAML files to readable sentences.
 summarize-clusters
     Produce a Markdown summary of clustered patterns.
 export-graph
     Export enriched patterns as a knowledge graph.
+run-all
+    Run analyze through export in one process, passing data in memory.
 """
 
 from __future__ import annotations
 
+import itertools
 import json
 import logging
 import os
@@ -28,11 +35,29 @@ from pathlib import Path
 import click
 import networkx as nx
 
+from pattern_language_miner.cluster.assignment import ClusterModel
+from pattern_language_miner.cluster.backends import available_backends
+from pattern_language_miner.cluster.cluster_report import (
+    iter_cluster_report,
+    report_format_for,
+)
+from pattern_language_miner.cluster.embedding_cache import EmbeddingCache
 from pattern_language_miner.cluster.pattern_cluster import PatternClusterer
+from pattern_language_miner.dedup.pattern_dedup import PatternDeduplicator
 from pattern_language_miner.enricher.pattern_enricher import PatternEnricher
 from pattern_language_miner.extractor.pattern_extractor import PatternExtractor
 from pattern_language_miner.generator.generate_sentences import SentenceGenerator
 from pattern_language_miner.graph.graph_export import export_graph
+from pattern_language_miner.pipeline.events import EventBus, PipelineEventType
+from pattern_language_miner.pipeline.pipeline import Pipeline, PipelineStep
+from pattern_language_miner.pipeline.steps import (
+    AnalyzeStep,
+    ClusterStep,
+    DedupStep,
+    EnrichStep,
+    ExportStep,
+    GenerateStep,
+)
 from pattern_language_miner.writer.yaml_writer import YamlWriter
 
 logger = logging.getLogger(__name__)
@@ -116,6 +141,86 @@ def analyze(
     logger.info("Extracted patterns written to %s.", output_dir)
 
 
+# ---------------------------------------------------------------------------
+# dedup
+# ---------------------------------------------------------------------------
+
+
+@cli.command(name="dedup")
+@click.option(
+    "--input-dir",
+    required=True,
+    type=click.Path(exists=True),
+    help="Directory of extracted YAML pattern files.",
+)
+@click.option(
+    "--output-dir",
+    required=True,
+    type=click.Path(),
+    help="Directory to write deduplicated pattern files.",
+)
+@click.option(
+    "--field",
+    default="pattern",
+    show_default=True,
+    help="Pattern field holding the text to compare.",
+)
+@click.option(
+    "--min-containment",
+    default=0.2,
+    show_default=True,
+    help="Merge a pattern into one it contains when it accounts for at least "
+    "this share of the shorter pattern's occurrences (>1 disables).",
+)
+@click.option(
+    "--jaccard-threshold",
+    default=0.8,
+    show_default=True,
+    help="Shingle Jaccard similarity for lexical near-duplicates (>1 disables).",
+)
+@click.option(
+    "--cosine-threshold",
+    default=0.92,
+    show_default=True,
+    help="Embedding cosine similarity for semantic near-duplicates.",
+)
+@click.option(
+    "--embedding-cache",
+    type=click.Path(exists=True),
+    default=None,
+    help="Embedding cache from a cluster run; enables the semantic pass.",
+)
+@click.option(
+    "--model-name",
+    default="all-MiniLM-L6-v2",
+    show_default=True,
+    help="Model that produced the cached embeddings.",
+)
+def dedup(
+    input_dir: str,
+    output_dir: str,
+    field: str,
+    min_containment: float,
+    jaccard_threshold: float,
+    cosine_threshold: float,
+    embedding_cache: str | None,
+    model_name: str,
+) -> None:
+    """Merge contained and near-duplicate patterns before enrichment."""
+    logger.info("Deduplicating patterns in %s.", input_dir)
+    cache = EmbeddingCache(embedding_cache, model_name) if embedding_cache else None
+    PatternDeduplicator(
+        input_dir=input_dir,
+        output_dir=output_dir,
+        field=field,
+        embedding_cache=cache,
+        min_containment=min_containment,
+        jaccard_threshold=jaccard_threshold,
+        cosine_threshold=cosine_threshold,
+    ).run()
+    logger.info("Deduplicated patterns written to %s.", output_dir)
+
+
 # ---------------------------------------------------------------------------
 # enrich
 # ---------------------------------------------------------------------------
@@ -147,6 +252,23 @@ def enrich(input_dir: str, output_dir: str) -> None:
 # ---------------------------------------------------------------------------
 
 
+def _parse_n_clusters(
+    ctx: click.Context, param: click.Parameter, value: str
+) -> int | None:
+    """Convert ``--n-clusters`` to an int, or ``None`` for ``auto``."""
+    if str(value).lower() == "auto":
+        return None
+    try:
+        n = int(value)
+    except ValueError:
+        raise click.BadParameter(
+            f"expected an integer or 'auto', got {value!r}"
+        ) from None
+    if n < 1:
+        raise click.BadParameter("must be at least 1")
+    return n
+
+
 @cli.command(name="cluster")
 @click.option(
     "--input-dir",
@@ -174,37 +296,229 @@ def enrich(input_dir: str, output_dir: str) -> None:
 )
 @click.option(
     "--n-clusters",
+    default="5",
+    show_default=True,
+    callback=_parse_n_clusters,
+    help="Number of KMeans clusters, or 'auto' to choose k by sweeping "
+    "--k-min..--k-max.",
+)
+@click.option(
+    "--k-min",
+    default=2,
+    show_default=True,
+    help="Smallest k tried by --n-clusters auto.",
+)
+@click.option(
+    "--k-max",
+    default=10,
+    show_default=True,
+    help="Largest k tried by --n-clusters auto.",
+)
+@click.option(
+    "--k-metric",
+    type=click.Choice(["silhouette", "elbow"], case_sensitive=False),
+    default="silhouette",
+    show_default=True,
+    help="Score used by --n-clusters auto.",
+)
+@click.option(
+    "--algorithm",
+    type=click.Choice(available_backends(), case_sensitive=False),
+    default="kmeans",
+    show_default=True,
+    help="Clustering backend. 'hdbscan' chooses the number of clusters "
+    "itself and ignores --n-clusters.",
+)
+@click.option(
+    "--min-cluster-size",
     default=5,
     show_default=True,
-    help="Number of KMeans clusters.",
+    help="Smallest cluster reported by --algorithm hdbscan.",
+)
+@click.option(
+    "--plot-backend",
+    type=click.Choice(["matplotlib", "raster"], case_sensitive=False),
+    default="matplotlib",
+    show_default=True,
+    help="Render clusters.png with matplotlib, or by binning points into a "
+    "pixel buffer (much faster for large corpora).",
+)
+@click.option(
+    "--report-format",
+    type=click.Choice(["json", "jsonl"], case_sensitive=False),
+    default="json",
+    show_default=True,
+    help="Write clustered_patterns.json (array) or clustered_patterns.jsonl "
+    "(streamed JSON Lines).",
+)
+@click.option(
+    "--embedding-cache",
+    type=click.Path(),
+    default=None,
+    help="Embedding cache file [default: OUTPUT_DIR/embeddings.npz].",
+)
+@click.option(
+    "--no-embedding-cache",
+    is_flag=True,
+    default=False,
+    help="Always re-encode patterns instead of using the embedding cache.",
 )
 def cluster(
     input_dir: str,
     output_dir: str,
     field: str,
     batch_size: int,
-    n_clusters: int,
+    n_clusters: int | None,
+    k_min: int,
+    k_max: int,
+    k_metric: str,
+    algorithm: str,
+    min_cluster_size: int,
+    plot_backend: str,
+    report_format: str,
+    embedding_cache: str | None,
+    no_embedding_cache: bool,
 ) -> None:
     """Cluster patterns using semantic similarity."""
     logger.info("Starting pattern clustering.")
     out = Path(output_dir)
     out.mkdir(parents=True, exist_ok=True)
 
-    clusterer = PatternClusterer(input_dir=input_dir, field=field)
+    cache_path = neighbor_cache_path = None
+    if not no_embedding_cache:
+        cache_path = Path(embedding_cache) if embedding_cache else out / "embeddings.npz"
+        neighbor_cache_path = cache_path.with_name("neighbors.npz")
+
+    clusterer = PatternClusterer(
+        input_dir=input_dir,
+        field=field,
+        cache_path=cache_path,
+        neighbor_cache_path=neighbor_cache_path,
+    )
     clusterer.load_patterns()
     if not clusterer.patterns:
         logger.warning("No patterns loaded. Exiting.")
         return
 
     embeddings = clusterer.embed_patterns(batch_size=batch_size)
+    if n_clusters is None:
+        n_clusters, scores = clusterer.select_n_clusters(
+            embeddings, k_min=k_min, k_max=k_max, metric=k_metric.lower()
+        )
+        selection = {
+            "metric": k_metric.lower(),
+            "best_k": n_clusters,
+            "scores": {str(k): v for k, v in scores.items()},
+        }
+        (out / "cluster_selection.json").write_text(
+            json.dumps(selection, indent=2), encoding="utf-8"
+        )
     reduced, cluster_ids = clusterer.cluster_and_reduce(
-        embeddings, n_clusters=n_clusters
+        embeddings,
+        n_clusters=n_clusters,
+        algorithm=algorithm.lower(),
+        min_cluster_size=min_cluster_size,
+    )
+    clusterer.visualize_clusters(
+        reduced, cluster_ids, out / "clusters.png", backend=plot_backend.lower()
     )
-    clusterer.visualize_clusters(reduced, cluster_ids, out / "clusters.png")
-    clusterer.generate_cluster_report(cluster_ids, out / "clustered_patterns.json")
+    fmt = report_format.lower()
+    clusterer.generate_cluster_report(
+        cluster_ids, out / f"clustered_patterns.{fmt}", format_=fmt
+    )
+    clusterer.save_cluster_model(out / "cluster_model.npz")
     logger.info("Clustering complete. Results in %s.", out)
 
 
+# ---------------------------------------------------------------------------
+# assign
+# ---------------------------------------------------------------------------
+
+
+@cli.command(name="assign")
+@click.option(
+    "--input-dir",
+    required=True,
+    type=click.Path(exists=True),
+    help="Directory of enriched YAML pattern files, old and new.",
+)
+@click.option(
+    "--output-dir",
+    required=True,
+    type=click.Path(exists=True),
+    help="Output directory of a previous cluster run.",
+)
+@click.option(
+    "--drift-threshold",
+    default=1.5,
+    show_default=True,
+    help="Refit all clusters when new patterns sit this many times farther "
+    "from their centroids than the fitted ones.",
+)
+@click.option(
+    "--batch-size",
+    default=32,
+    show_default=True,
+    help="Batch size for embedding processing.",
+)
+@click.option(
+    "--report-format",
+    type=click.Choice(["json", "jsonl"], case_sensitive=False),
+    default="json",
+    show_default=True,
+    help="Write clustered_patterns.json (array) or clustered_patterns.jsonl "
+    "(streamed JSON Lines).",
+)
+@click.option(
+    "--embedding-cache",
+    type=click.Path(),
+    default=None,
+    help="Embedding cache file [default: OUTPUT_DIR/embeddings.npz].",
+)
+def assign(
+    input_dir: str,
+    output_dir: str,
+    drift_threshold: float,
+    batch_size: int,
+    report_format: str,
+    embedding_cache: str | None,
+) -> None:
+    """Assign new patterns to the clusters of a previous cluster run."""
+    out = Path(output_dir)
+    model = ClusterModel.load(out / "cluster_model.npz")
+    cache_path = Path(embedding_cache) if embedding_cache else out / "embeddings.npz"
+
+    clusterer = PatternClusterer(
+        input_dir=input_dir,
+        field=model.field,
+        model_name=model.model_name,
+        cache_path=cache_path,
+    )
+    clusterer.load_patterns()
+    if not clusterer.patterns:
+        logger.warning("No patterns loaded. Exiting.")
+        return
+
+    try:
+        cluster_ids, refitted = clusterer.assign_patterns(
+            model, drift_threshold=drift_threshold, batch_size=batch_size
+        )
+    except ValueError as exc:
+        raise click.ClickException(
+            f"{exc} Re-run 'cluster' on {out} to fit a usable model."
+        ) from exc
+    fmt = report_format.lower()
+    clusterer.generate_cluster_report(
+        cluster_ids, out / f"clustered_patterns.{fmt}", format_=fmt
+    )
+    clusterer.save_cluster_model(out / "cluster_model.npz")
+    logger.info(
+        "Assignment complete (%s). Results in %s.",
+        "full refit" if refitted else "incremental",
+        out,
+    )
+
+
 # ---------------------------------------------------------------------------
 # generate-sentences
 # ---------------------------------------------------------------------------
@@ -251,7 +565,7 @@ def generate_sentences(input_dir: str, output_path: str, fmt: str) -> None:
     "--input-json",
     required=True,
     type=click.Path(exists=True),
-    help="Path to clustered_patterns.json file.",
+    help="Path to clustered_patterns.json or clustered_patterns.jsonl.",
 )
 @click.option(
     "--output-path",
@@ -260,41 +574,65 @@ def generate_sentences(input_dir: str, output_path: str, fmt: str) -> None:
     help="Path to write the Markdown summary.",
 )
 def summarize_clusters(input_json: str, output_path: str) -> None:
-    """Generate a Markdown summary of clustered patterns."""
+    """Generate a Markdown summary of clustered patterns.
+
+    JSON Lines reports are streamed and must be grouped by cluster, as
+    ``cluster --report-format jsonl`` writes them.  JSON array reports are
+    loaded and grouped in memory.
+    """
     logger.info("Summarising clustered patterns from %s.", input_json)
 
-    with open(input_json, "r", encoding="utf-8") as fh:
-        data = json.load(fh)
-
-    clusters: dict = {}
-    for pattern in data:
-        cid = pattern.get("cluster", "unassigned")
-        clusters.setdefault(cid, []).append(pattern)
-
-    lines = ["# Cluster Summary\n"]
-    for cid in sorted(clusters):
-        lines.append(f"## Cluster {cid}\n")
-        for p in clusters[cid]:
-            title = p.get("title", "Untitled").strip()
-            problem = p.get("problem", "")
-            summary = p.get("summary", "")
-            tags = ", ".join(p.get("tags", []))
-            concepts = ", ".join(p.get("concepts", []))
-            lines.append(f"- **{title}**")
-            if problem:
-                lines.append(f"  - Problem: {problem}")
-            if summary:
-                lines.append(f"  - Summary: {summary}")
-            if tags:
-                lines.append(f"  - Tags: {tags}")
-            if concepts:
-                lines.append(f"  - Concepts: {concepts}")
-        lines.append("")
-
-    Path(output_path).write_text("\n".join(lines), encoding="utf-8")
+    rows = iter_cluster_report(input_json)
+    if report_format_for(input_json) == "json":
+        rows = iter(sorted(rows, key=_cluster_sort_key))
+
+    seen: set = set()
+    with open(output_path, "w", encoding="utf-8") as out:
+        out.write("# Cluster Summary\n\n")
+        for cid, group in itertools.groupby(
+            rows, key=lambda p: p.get("cluster", "unassigned")
+        ):
+            if cid in seen:
+                logger.warning(
+                    "Cluster %s appears in more than one run of %s; "
+                    "the report is not grouped by cluster.",
+                    cid,
+                    input_json,
+                )
+            seen.add(cid)
+            out.write(f"## Cluster {cid}\n\n")
+            for p in group:
+                out.write("\n".join(_summary_lines(p)) + "\n")
+            out.write("\n")
+
     logger.info("Summary written to %s.", output_path)
 
 
+def _cluster_sort_key(pattern: dict) -> tuple:
+    """Order numeric cluster ids numerically, ahead of any other label."""
+    cid = pattern.get("cluster", "unassigned")
+    return (0, cid, "") if isinstance(cid, int) else (1, 0, str(cid))
+
+
+def _summary_lines(p: dict) -> list:
+    """Render one pattern as Markdown bullet lines."""
+    title = p.get("title", "Untitled").strip()
+    problem = p.get("problem", "")
+    summary = p.get("summary", "")
+    tags = ", ".join(p.get("tags", []))
+    concepts = ", ".join(p.get("concepts", []))
+    lines = [f"- **{title}**"]
+    if problem:
+        lines.append(f"  - Problem: {problem}")
+    if summary:
+        lines.append(f"  - Summary: {summary}")
+    if tags:
+        lines.append(f"  - Tags: {tags}")
+    if concepts:
+        lines.append(f"  - Concepts: {concepts}")
+    return lines
+
+
 # ---------------------------------------------------------------------------
 # export-graph
 # ---------------------------------------------------------------------------
@@ -305,7 +643,7 @@ def summarize_clusters(input_json: str, output_path: str) -> None:
     "--input-json",
     required=True,
     type=click.Path(exists=True),
-    help="Path to enriched patterns JSON file.",
+    help="Path to enriched patterns JSON or JSON Lines file.",
 )
 @click.option(
     "--output-path",
@@ -325,8 +663,7 @@ def export_graph_cmd(input_json: str, output_path: str, fmt: str) -> None:
     """Export enriched pattern data as a knowledge graph."""
     logger.info("Exporting graph from %s as %s.", input_json, fmt)
 
-    with open(input_json, "r", encoding="utf-8") as fh:
-        patterns = json.load(fh)
+    patterns = iter_cluster_report(input_json)
 
     def _sanitize(text: str) -> str:
         return text.strip().replace(" ", "_").replace("-", "_").replace(".", "_")
@@ -356,5 +693,172 @@ def export_graph_cmd(input_json: str, output_path: str, fmt: str) -> None:
     logger.info("Graph export complete.")
 
 
+# ---------------------------------------------------------------------------
+# run-all
+# ---------------------------------------------------------------------------
+
+#: File suffix of each ``--graph-format``.
+_GRAPH_SUFFIXES = {
+    "graphml": "graphml",
+    "neo4j": "cypher",
+    "mermaid": "mmd",
+    "json": "json",
+}
+
+#: File suffix of each ``--sentence-format``.
+_SENTENCE_SUFFIXES = {"text": "txt", "markdown": "md", "html": "html"}
+
+
+@cli.command(name="run-all")
+@click.option(
+    "--config",
+    required=True,
+    type=click.Path(exists=True),
+    help="YAML config file defining pattern extraction settings.",
+)
+@click.option(
+    "--input-dir",
+    required=True,
+    type=click.Path(exists=True),
+    help="Input directory of documents to analyse.",
+)
+@click.option(
+    "--output-dir",
+    required=True,
+    type=click.Path(),
+    help="Directory for the clusters, sentences and graph.",
+)
+@click.option(
+    "--field",
+    default="pattern",
+    show_default=True,
+    help="Pattern field to deduplicate and cluster on.",
+)
+@click.option(
+    "--dedup/--no-dedup",
+    default=False,
+    show_default=True,
+    help="Merge contained and near-duplicate patterns before enrichment.",
+)
+@click.option(
+    "--n-clusters",
+    default="5",
+    show_default=True,
+    callback=_parse_n_clusters,
+    help="Number of clusters, or 'auto' to choose k by silhouette score.",
+)
+@click.option(
+    "--algorithm",
+    type=click.Choice(available_backends(), case_sensitive=False),
+    default="kmeans",
+    show_default=True,
+    help="Clustering backend.",
+)
+@click.option(
+    "--batch-size",
+    default=32,
+    show_default=True,
+    help="Batch size for embedding processing.",
+)
+@click.option(
+    "--sentence-format",
+    type=click.Choice(sorted(_SENTENCE_SUFFIXES), case_sensitive=False),
+    default="markdown",
+    show_default=True,
+    help="Output format for generated sentences.",
+)
+@click.option(
+    "--graph-format",
+    type=click.Choice(sorted(_GRAPH_SUFFIXES), case_sensitive=False),
+    default="graphml",
+    show_default=True,
+    help="Graph output format.",
+)
+@click.option(
+    "--workers",
+    default=1,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Steps run at once. With 2 or more, cluster, generate and export "
+    "run concurrently after enrichment.",
+)
+@click.option(
+    "--write-intermediate",
+    is_flag=True,
+    default=False,
+    help="Also write the patterns after each stage as YAML files "
+    "(OUTPUT_DIR/raw, deduped, enriched), as the separate commands do.",
+)
+def run_all(
+    config: str,
+    input_dir: str,
+    output_dir: str,
+    field: str,
+    dedup: bool,
+    n_clusters: int | None,
+    algorithm: str,
+    batch_size: int,
+    sentence_format: str,
+    graph_format: str,
+    workers: int,
+    write_intermediate: bool,
+) -> None:
+    """Run analyze, enrich, cluster, generate and export in one process.
+
+    Patterns and embeddings are handed from step to step in memory, so no
+    YAML files are written or re-read between stages unless
+    --write-intermediate is given.
+    """
+    out = Path(output_dir)
+
+    def stage_dir(name: str) -> Path | None:
+        return out / name if write_intermediate else None
+
+    sentence_format = sentence_format.lower()
+    graph_format = graph_format.lower()
+    cluster_dir = out / "clusters"
+    steps: list[PipelineStep] = [
+        AnalyzeStep(
+            PatternExtractor(config_path=Path(config), input_dir=Path(input_dir)),
+            intermediate_dir=stage_dir("raw"),
+        )
+    ]
+    if dedup:
+        steps.append(DedupStep(field=field, intermediate_dir=stage_dir("deduped")))
+    steps += [
+        EnrichStep(intermediate_dir=stage_dir("enriched")),
+        ClusterStep(
+            PatternClusterer(
+                input_dir=out,
+                field=field,
+                cache_path=cluster_dir / "embeddings.npz",
+                neighbor_cache_path=cluster_dir / "neighbors.npz",
+            ),
+            cluster_dir,
+            n_clusters=n_clusters,
+            algorithm=algorithm.lower(),
+            batch_size=batch_size,
+        ),
+        GenerateStep(
+            SentenceGenerator(
+                input_dir=out,
+                output_path=out / f"sentences.{_SENTENCE_SUFFIXES[sentence_format]}",
+                format_=sentence_format,
+            )
+        ),
+        ExportStep(
+            out / f"graph.{_GRAPH_SUFFIXES[graph_format]}", format_=graph_format
+        ),
+    ]
+
+    bus = EventBus()
+    bus.subscribe(
+        PipelineEventType.STEP_COMPLETE,
+        lambda event: click.echo(f"[{event.step_name}] done"),
+    )
+    Pipeline(steps, event_bus=bus, max_workers=workers).execute({})
+    logger.info("Pipeline results written to %s.", out)
+
+
 if __name__ == "__main__":
     cli()
@@ -1,9 +1,28 @@
 """Cluster sub-package.
 
 Provides :class:`~pattern_language_miner.cluster.pattern_cluster.PatternClusterer`
-for KMeans/UMAP-based semantic clustering.
+for KMeans/UMAP-based semantic clustering,
+:func:`~pattern_language_miner.cluster.backends.register_backend` for
+plugging in further clustering algorithms,
+:class:`~pattern_language_miner.cluster.neighbors.NeighborIndex` for the
+kNN graph shared by UMAP and the neighbour-based backends,
+:class:`~pattern_language_miner.cluster.embedding_cache.EmbeddingCache`
+for reusing embeddings across runs, and
+:class:`~pattern_language_miner.cluster.assignment.ClusterModel` for
+assigning new patterns to previously fitted clusters.
 """
 
+from .assignment import ClusterModel, assign_to_centroids
+from .backends import register_backend
+from .embedding_cache import EmbeddingCache
+from .neighbors import NeighborIndex
 from .pattern_cluster import PatternClusterer
 
-__all__ = ["PatternClusterer"]
+__all__ = [
+    "ClusterModel",
+    "EmbeddingCache",
+    "NeighborIndex",
+    "PatternClusterer",
+    "assign_to_centroids",
+    "register_backend",
+]
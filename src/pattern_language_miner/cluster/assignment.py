@@ -0,0 +1,136 @@
+"""Persisted cluster centroids and nearest-centroid assignment.
+
+Provides :class:`ClusterModel`, the state saved by the ``cluster`` command
+so that later runs can place new patterns into the existing clusters
+without refitting, and :func:`assign_to_centroids`, the vectorised
+nearest-centroid step used to do so.
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def assign_to_centroids(
+    embeddings: np.ndarray, centroids: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Assign each row of *embeddings* to its nearest centroid.
+
+    Squared distances are expanded as ``|x|² - 2x·c + |c|²`` so the whole
+    assignment is a single matrix product.
+
+    Args:
+        embeddings: Array of shape ``(n_samples, dim)``.
+        centroids: Array of shape ``(n_clusters, dim)``.
+
+    Returns:
+        A 2-tuple of ``(labels, distances)``: the index of the nearest
+        centroid and the Euclidean distance to it, both of length
+        *n_samples*.  Without centroids every label is ``-1`` (noise) and
+        every distance is infinite.
+
+    Example:
+        >>> labels, _ = assign_to_centroids(np.array([[0.0], [9.0]]),
+        ...                                 np.array([[1.0], [10.0]]))
+        >>> labels.tolist()
+        [0, 1]
+    """
+    if embeddings.shape[0] == 0:
+        return np.empty(0, dtype=int), np.empty(0, dtype=float)
+    if centroids.shape[0] == 0:
+        n_samples = embeddings.shape[0]
+        return np.full(n_samples, -1, dtype=int), np.full(n_samples, np.inf)
+    sq = (
+        np.einsum("ij,ij->i", embeddings, embeddings)[:, None]
+        - 2.0 * embeddings @ centroids.T
+        + np.einsum("ij,ij->i", centroids, centroids)[None, :]
+    )
+    labels = np.argmin(sq, axis=1)
+    nearest = np.maximum(sq[np.arange(len(labels)), labels], 0.0)
+    return labels, np.sqrt(nearest)
+
+
+@dataclass
+class ClusterModel:
+    """Fitted clustering state that survives between runs.
+
+    Attributes:
+        centroids: Array of shape ``(n_clusters, dim)``.
+        labels: Cluster id of every known pattern, keyed by the cache key
+            of its embedded text (see
+            :func:`~pattern_language_miner.cluster.embedding_cache.text_key`).
+        model_name: Sentence-transformer that produced the centroids.
+        field: Pattern field that was embedded.
+        baseline_distance: Mean distance from the fitted patterns to their
+            centroid.  New patterns are compared against it to measure
+            drift.
+    """
+
+    centroids: np.ndarray
+    labels: Dict[str, int]
+    model_name: str
+    field: str
+    baseline_distance: float
+
+    def drift(self, distances: np.ndarray) -> float:
+        """Return how far *distances* sit from the fit, relative to baseline.
+
+        Args:
+            distances: Nearest-centroid distances of newly assigned patterns.
+
+        Returns:
+            The ratio of their mean to :attr:`baseline_distance`; ``0.0``
+            when *distances* is empty.
+        """
+        if distances.size == 0:
+            return 0.0
+        if self.baseline_distance <= 0:
+            return float("inf") if distances.mean() > 0 else 1.0
+        return float(distances.mean() / self.baseline_distance)
+
+    def save(self, path: str | Path) -> None:
+        """Write the model to a ``.npz`` archive at *path*."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("wb") as fh:
+            np.savez_compressed(
+                fh,
+                centroids=self.centroids,
+                keys=np.array(list(self.labels), dtype="U40"),
+                labels=np.array(list(self.labels.values()), dtype=int),
+                model_name=np.array(self.model_name),
+                field=np.array(self.field),
+                baseline_distance=np.array(self.baseline_distance),
+            )
+        logger.info(
+            "Cluster model saved to %s (%d centroid(s), %d pattern(s)).",
+            path,
+            len(self.centroids),
+            len(self.labels),
+        )
+
+    @classmethod
+    def load(cls, path: str | Path) -> "ClusterModel":
+        """Read a model previously written by :meth:`save`.
+
+        Raises:
+            FileNotFoundError: If *path* does not exist.
+        """
+        path = Path(path)
+        if not path.exists():
+            raise FileNotFoundError(f"Cluster model not found: {path}")
+        with np.load(path, allow_pickle=False) as data:
+            return cls(
+                centroids=data["centroids"],
+                labels=dict(zip(data["keys"].tolist(), data["labels"].tolist())),
+                model_name=str(data["model_name"]),
+                field=str(data["field"]),
+                baseline_distance=float(data["baseline_distance"]),
+            )
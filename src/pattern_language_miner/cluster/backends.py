@@ -0,0 +1,125 @@
+"""Pluggable clustering algorithms for :class:`PatternClusterer`.
+
+Each backend is a callable with the signature::
+
+    backend(embeddings, neighbors, n_clusters, min_cluster_size) -> labels
+
+where *neighbors* is the shared
+:class:`~pattern_language_miner.cluster.neighbors.NeighborIndex` and
+*labels* is an integer array with ``-1`` marking noise.  Backends that do
+not need neighbours or a cluster count simply ignore those arguments.
+
+Built-in backends:
+
+- ``kmeans`` — spherical partitioning into exactly *n_clusters* groups.
+- ``agglomerative`` — Ward linkage constrained to the sparse kNN graph,
+  so merges only happen between neighbouring patterns.
+- ``hdbscan`` — density-based clustering on the sparse kNN distance
+  graph.  Chooses the number of clusters itself and labels outliers
+  ``-1``.
+
+Register additional algorithms with :func:`register_backend`.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Callable, Dict
+
+import numpy as np
+from sklearn.cluster import HDBSCAN, AgglomerativeClustering, KMeans
+
+from .neighbors import NeighborIndex
+
+logger = logging.getLogger(__name__)
+
+#: Signature shared by all clustering backends.
+ClusteringBackend = Callable[[np.ndarray, NeighborIndex, int, int], np.ndarray]
+
+#: Backends that consult the shared neighbour index.
+NEIGHBOR_BACKENDS: set[str] = {"agglomerative", "hdbscan"}
+
+
+def _kmeans(
+    embeddings: np.ndarray,
+    neighbors: NeighborIndex | None,
+    n_clusters: int,
+    min_cluster_size: int,
+) -> np.ndarray:
+    kmeans = KMeans(n_clusters=n_clusters, random_state=42, n_init="auto")
+    return kmeans.fit_predict(embeddings)
+
+
+def _agglomerative(
+    embeddings: np.ndarray,
+    neighbors: NeighborIndex,
+    n_clusters: int,
+    min_cluster_size: int,
+) -> np.ndarray:
+    model = AgglomerativeClustering(
+        n_clusters=n_clusters,
+        linkage="ward",
+        connectivity=neighbors.connectivity_graph(),
+    )
+    return model.fit_predict(embeddings)
+
+
+def _hdbscan(
+    embeddings: np.ndarray,
+    neighbors: NeighborIndex,
+    n_clusters: int,
+    min_cluster_size: int,
+) -> np.ndarray:
+    # HDBSCAN's core distance needs min_samples neighbours besides the point.
+    min_samples = max(1, min(min_cluster_size, neighbors.n_neighbors - 1))
+    model = HDBSCAN(
+        min_cluster_size=max(2, min_cluster_size),
+        min_samples=min_samples,
+        metric="precomputed",
+        copy=False,
+    )
+    return model.fit_predict(neighbors.distance_graph(embeddings))
+
+
+_BACKENDS: Dict[str, ClusteringBackend] = {
+    "kmeans": _kmeans,
+    "agglomerative": _agglomerative,
+    "hdbscan": _hdbscan,
+}
+
+
+def register_backend(
+    name: str, backend: ClusteringBackend, uses_neighbors: bool = False
+) -> None:
+    """Make *backend* selectable as ``algorithm=name``.
+
+    Args:
+        name: Identifier used on the CLI and in
+            :meth:`~pattern_language_miner.cluster.pattern_cluster.PatternClusterer.cluster_and_reduce`.
+        backend: Callable following :data:`ClusteringBackend`.
+        uses_neighbors: Whether *backend* reads the shared neighbour index.
+    """
+    _BACKENDS[name.lower()] = backend
+    if uses_neighbors:
+        NEIGHBOR_BACKENDS.add(name.lower())
+    logger.debug("Registered clustering backend %s.", name)
+
+
+def get_backend(name: str) -> ClusteringBackend:
+    """Return the backend registered as *name*.
+
+    Raises:
+        ValueError: If no such backend exists.
+    """
+    try:
+        return _BACKENDS[name.lower()]
+    except KeyError:
+        raise ValueError(
+            f"Unsupported clustering algorithm {name!r}. "
+            f"Choose from: {', '.join(available_backends())}"
+        ) from None
+
+
+def available_backends() -> list[str]:
+    """Return the registered backend names in sorted order."""
+    return sorted(_BACKENDS)
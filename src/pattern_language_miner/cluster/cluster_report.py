@@ -0,0 +1,134 @@
+"""Reading and writing cluster reports.
+
+Two on-disk formats are supported:
+
+- **JSON** — a single indented array (the original format).  Reading it
+  requires loading the whole file.
+- **JSON Lines** — one compact object per line, written row by row and
+  grouped by cluster id.  It can be read lazily, so consumers such as
+  ``summarize-clusters`` and ``export-graph`` run in constant memory.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Tuple
+
+logger = logging.getLogger(__name__)
+
+#: Report formats understood by :func:`write_cluster_report`.
+REPORT_FORMATS: frozenset[str] = frozenset({"json", "jsonl"})
+
+#: File suffixes treated as JSON Lines.
+JSONL_SUFFIXES: frozenset[str] = frozenset({".jsonl", ".ndjson"})
+
+
+def report_format_for(path: str | Path) -> str:
+    """Infer the report format from the suffix of *path*.
+
+    Args:
+        path: Report file path.
+
+    Returns:
+        ``"jsonl"`` for ``.jsonl`` / ``.ndjson`` files, otherwise ``"json"``.
+    """
+    return "jsonl" if Path(path).suffix.lower() in JSONL_SUFFIXES else "json"
+
+
+def write_cluster_report(
+    rows: Iterable[Tuple[Dict[str, Any], int]],
+    output_path: Path,
+    format_: str | None = None,
+) -> int:
+    """Write ``(pattern, cluster_id)`` pairs as a cluster report.
+
+    In JSON Lines mode each row is serialised and written as soon as it is
+    produced; nothing is accumulated.  Callers that want the report to be
+    consumable by ``summarize-clusters`` in one pass should supply rows
+    grouped by cluster id.
+
+    Args:
+        rows: Pairs of pattern dict and cluster id.
+        output_path: Destination file.
+        format_: ``"json"`` or ``"jsonl"``; inferred from *output_path*
+            when omitted.
+
+    Returns:
+        The number of rows written.
+
+    Raises:
+        ValueError: If *format_* is not in :data:`REPORT_FORMATS`.
+    """
+    fmt = (format_ or report_format_for(output_path)).lower()
+    if fmt not in REPORT_FORMATS:
+        raise ValueError(
+            f"Unsupported report format {format_!r}. "
+            f"Choose from: {', '.join(sorted(REPORT_FORMATS))}"
+        )
+
+    count = 0
+    with Path(output_path).open("w", encoding="utf-8") as fh:
+        if fmt == "json":
+            report = []
+            for pattern, cluster_id in rows:
+                entry = dict(pattern)
+                entry["cluster"] = int(cluster_id)
+                report.append(entry)
+            json.dump(report, fh, indent=2, ensure_ascii=False)
+            return len(report)
+
+        for pattern, cluster_id in rows:
+            entry = dict(pattern)
+            entry["cluster"] = int(cluster_id)
+            fh.write(json.dumps(entry, ensure_ascii=False, separators=(",", ":")))
+            fh.write("\n")
+            count += 1
+    return count
+
+
+def iter_cluster_report(path: str | Path) -> Iterator[Dict[str, Any]]:
+    """Yield the entries of a JSON or JSON Lines report.
+
+    JSON Lines files are read one line at a time.  A plain JSON file must
+    hold an array and is loaded in full.  The format is taken from the
+    suffix, falling back to sniffing the first non-blank character.
+
+    Args:
+        path: Report file written by :func:`write_cluster_report` (or any
+            JSON array of pattern objects).
+
+    Yields:
+        One pattern dict per entry.
+
+    Raises:
+        ValueError: If a plain JSON file does not contain an array.
+    """
+    path = Path(path)
+    with path.open("r", encoding="utf-8") as fh:
+        if not _looks_like_jsonl(path, fh):
+            data = json.load(fh)
+            if not isinstance(data, list):
+                raise ValueError(f"{path} does not contain a JSON array.")
+            yield from data
+            return
+        for lineno, line in enumerate(fh, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as exc:
+                logger.warning("Skipping malformed line %d of %s: %s", lineno, path, exc)
+
+
+def _looks_like_jsonl(path: Path, fh) -> bool:
+    """Decide whether *fh* holds JSON Lines, leaving it at the start."""
+    if path.suffix.lower() in JSONL_SUFFIXES:
+        return True
+    if path.suffix.lower() == ".json":
+        return False
+    head = fh.read(256).lstrip()
+    fh.seek(0)
+    return not head.startswith("[")
@@ -0,0 +1,155 @@
+"""On-disk cache for sentence-transformer embeddings.
+
+Provides :class:`EmbeddingCache`, which stores one vector per distinct
+text in a compressed ``.npz`` archive.  Entries are keyed by a SHA-1 digest
+of the text, and the whole archive is bound to the model that produced it,
+so re-running a command on an unchanged corpus never re-encodes a pattern.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def text_key(text: str) -> str:
+    """Return the cache key for *text*.
+
+    Args:
+        text: The exact string passed to the encoder.
+
+    Returns:
+        A 40-character hexadecimal SHA-1 digest.
+
+    Example:
+        >>> len(text_key("install the package"))
+        40
+    """
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """Persist embeddings for previously encoded texts.
+
+    The archive is loaded lazily on first use.  If it was produced by a
+    different model it is ignored (and overwritten on the next
+    :meth:`save`), because vectors from different models are not
+    comparable.
+
+    Args:
+        path: Location of the ``.npz`` archive.  Need not exist yet.
+        model_name: Identifier of the sentence-transformer model whose
+            vectors are stored.
+
+    Example:
+        >>> cache = EmbeddingCache("./out/embeddings.npz", "all-MiniLM-L6-v2")
+        >>> vectors, missing = cache.lookup(["install the package"])
+    """
+
+    def __init__(self, path: str | Path, model_name: str) -> None:
+        self.path = Path(path)
+        self.model_name = model_name
+        self._vectors: Dict[str, np.ndarray] = {}
+        self._loaded = False
+        self._dirty = False
+
+    def __len__(self) -> int:
+        self._ensure_loaded()
+        return len(self._vectors)
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def lookup(self, texts: Sequence[str]) -> Tuple[List[np.ndarray | None], List[int]]:
+        """Fetch cached vectors for *texts*.
+
+        Args:
+            texts: Texts to look up, in caller order.
+
+        Returns:
+            A 2-tuple of ``(vectors, missing)``.  *vectors* is aligned with
+            *texts* and holds ``None`` for cache misses; *missing* lists the
+            indices of those misses.
+        """
+        self._ensure_loaded()
+        vectors: List[np.ndarray | None] = []
+        missing: List[int] = []
+        for idx, text in enumerate(texts):
+            vec = self._vectors.get(text_key(text))
+            if vec is None:
+                missing.append(idx)
+            vectors.append(vec)
+        logger.debug(
+            "Embedding cache: %d hit(s), %d miss(es).",
+            len(texts) - len(missing),
+            len(missing),
+        )
+        return vectors, missing
+
+    def update(self, texts: Sequence[str], embeddings: np.ndarray) -> None:
+        """Add or replace the vectors for *texts*.
+
+        Args:
+            texts: Texts that were encoded.
+            embeddings: Array of shape ``(len(texts), dim)``.
+        """
+        self._ensure_loaded()
+        for text, vec in zip(texts, embeddings):
+            self._vectors[text_key(text)] = np.asarray(vec, dtype=np.float32)
+        self._dirty = self._dirty or len(texts) > 0
+
+    def save(self) -> None:
+        """Write the cache to :attr:`path` if it changed since loading."""
+        if not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        keys = np.array(list(self._vectors), dtype="U40")
+        vectors = (
+            np.stack(list(self._vectors.values()))
+            if self._vectors
+            else np.empty((0, 0), dtype=np.float32)
+        )
+        # np.savez appends ".npz" to names without it, so write via a handle.
+        with self.path.open("wb") as fh:
+            np.savez_compressed(
+                fh,
+                keys=keys,
+                vectors=vectors,
+                model_name=np.array(self.model_name),
+            )
+        self._dirty = False
+        logger.info("Embedding cache saved to %s (%d vector(s)).", self.path, len(keys))
+
+    # ------------------------------------------------------------------
+    # Private helpers
+    # ------------------------------------------------------------------
+
+    def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        if not self.path.exists():
+            return
+        try:
+            with np.load(self.path, allow_pickle=False) as data:
+                cached_model = str(data["model_name"])
+                if cached_model != self.model_name:
+                    logger.warning(
+                        "Ignoring embedding cache %s: built with %s, not %s.",
+                        self.path,
+                        cached_model,
+                        self.model_name,
+                    )
+                    return
+                self._vectors = dict(zip(data["keys"].tolist(), data["vectors"]))
+        except (OSError, ValueError, KeyError) as exc:
+            logger.warning("Could not read embedding cache %s: %s", self.path, exc)
+            return
+        logger.debug("Loaded %d cached embedding(s) from %s.", len(self._vectors), self.path)
@@ -0,0 +1,163 @@
+"""Shared k-nearest-neighbour index over pattern embeddings.
+
+Provides :class:`NeighborIndex`, computed once per embedding matrix and
+reused by every consumer that needs neighbours: the UMAP projection, the
+connectivity constraint of agglomerative clustering and the sparse
+distance graph fed to HDBSCAN.  The index can be persisted next to the
+embedding cache so that switching clustering algorithms between runs does
+not repeat the neighbour search.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+from pathlib import Path
+from typing import Tuple
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import connected_components
+from sklearn.neighbors import NearestNeighbors
+
+logger = logging.getLogger(__name__)
+
+#: Smallest edge weight in :meth:`NeighborIndex.distance_graph`.  Sparse
+#: matrices treat a stored zero as a missing edge, so the zero distance
+#: between identical embeddings is clamped to this value instead.
+MIN_DISTANCE: float = 1e-10
+
+
+def embedding_fingerprint(embeddings: np.ndarray) -> str:
+    """Return a digest identifying the contents of *embeddings*."""
+    data = np.ascontiguousarray(embeddings)
+    digest = hashlib.sha1(str(data.shape).encode("ascii"))
+    digest.update(data.tobytes())
+    return digest.hexdigest()
+
+
+class NeighborIndex:
+    """The *n_neighbors* nearest neighbours of every embedding.
+
+    Follows the UMAP convention: each point is its own first neighbour, so
+    row *i* of :attr:`indices` starts with *i*.
+
+    Args:
+        indices: Array of shape ``(n_samples, n_neighbors)``.
+        distances: Euclidean distances matching *indices*.
+        fingerprint: :func:`embedding_fingerprint` of the source matrix.
+
+    Example:
+        >>> index = NeighborIndex.build(embeddings, n_neighbors=15)
+        >>> graph = index.connectivity_graph()
+    """
+
+    def __init__(
+        self, indices: np.ndarray, distances: np.ndarray, fingerprint: str
+    ) -> None:
+        self.indices = indices
+        self.distances = distances
+        self.fingerprint = fingerprint
+
+    @property
+    def n_neighbors(self) -> int:
+        """Neighbours per point, counting the point itself."""
+        return self.indices.shape[1]
+
+    @classmethod
+    def build(cls, embeddings: np.ndarray, n_neighbors: int = 15) -> "NeighborIndex":
+        """Search the neighbours of every row of *embeddings*.
+
+        Args:
+            embeddings: Array of shape ``(n_samples, dim)``.
+            n_neighbors: Neighbours per point including itself; clamped to
+                *n_samples*.
+        """
+        n_samples = embeddings.shape[0]
+        k = max(1, min(n_neighbors, n_samples))
+        logger.info("Building %d-nearest-neighbour index over %d point(s).", k, n_samples)
+        nn = NearestNeighbors(n_neighbors=k).fit(embeddings)
+        distances, indices = nn.kneighbors(embeddings)
+        return cls(indices, distances, embedding_fingerprint(embeddings))
+
+    # ------------------------------------------------------------------
+    # Views
+    # ------------------------------------------------------------------
+
+    def umap_knn(self) -> Tuple[np.ndarray, np.ndarray, None]:
+        """Return the index in the shape of UMAP's ``precomputed_knn``."""
+        return self.indices, self.distances, None
+
+    def connectivity_graph(self) -> csr_matrix:
+        """Return the directed kNN adjacency matrix, without self-loops."""
+        return self._graph(np.ones_like(self.distances[:, 1:]))
+
+    def distance_graph(self, embeddings: np.ndarray) -> csr_matrix:
+        """Return a symmetric, connected sparse distance matrix.
+
+        Disconnected components of the kNN graph are bridged by one edge
+        between consecutive components, weighted with the true distance
+        between their first members, so density-based clustering sees them
+        as far apart rather than failing on a disconnected graph.  Edge
+        weights are at least :data:`MIN_DISTANCE`, so duplicate embeddings
+        stay connected.
+
+        Args:
+            embeddings: The matrix the index was built from; only the
+                component representatives are read.
+        """
+        weights = np.maximum(self.distances[:, 1:], MIN_DISTANCE)
+        # With duplicates a point need not be its own first neighbour; zero
+        # the self-loops this leaves and drop them.
+        weights[self.indices[:, 1:] == np.arange(len(weights))[:, None]] = 0.0
+        graph = self._graph(weights)
+        graph.eliminate_zeros()
+        graph = graph.maximum(graph.T).tocsr()
+        n_components, labels = connected_components(graph, directed=False)
+        if n_components == 1:
+            return graph
+
+        logger.debug("Bridging %d disconnected kNN component(s).", n_components)
+        reps = np.unique(labels, return_index=True)[1]
+        rows, cols, weights = [], [], []
+        for a, b in zip(reps[:-1], reps[1:]):
+            rows += [a, b]
+            cols += [b, a]
+            distance = float(np.linalg.norm(embeddings[a] - embeddings[b]))
+            weights += [max(distance, MIN_DISTANCE)] * 2
+        bridges = csr_matrix((weights, (rows, cols)), shape=graph.shape)
+        return (graph + bridges).tocsr()
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def save(self, path: str | Path) -> None:
+        """Write the index to a ``.npz`` archive at *path*."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("wb") as fh:
+            np.savez_compressed(
+                fh,
+                indices=self.indices,
+                distances=self.distances,
+                fingerprint=np.array(self.fingerprint),
+            )
+
+    @classmethod
+    def load(cls, path: str | Path) -> "NeighborIndex":
+        """Read an index previously written by :meth:`save`."""
+        with np.load(Path(path), allow_pickle=False) as data:
+            return cls(data["indices"], data["distances"], str(data["fingerprint"]))
+
+    # ------------------------------------------------------------------
+    # Private helpers
+    # ------------------------------------------------------------------
+
+    def _graph(self, weights: np.ndarray) -> csr_matrix:
+        n_samples, k = weights.shape
+        rows = np.repeat(np.arange(n_samples), k)
+        return csr_matrix(
+            (weights.ravel(), (rows, self.indices[:, 1:].ravel())),
+            shape=(n_samples, n_samples),
+        )
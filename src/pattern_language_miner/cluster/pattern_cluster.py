@@ -1,26 +1,45 @@
 """Semantic pattern clustering module.
 
 Uses :class:`~sentence_transformers.SentenceTransformer` embeddings,
-KMeans clustering, and UMAP dimensionality reduction to group similar
-patterns and visualise the results.
+KMeans (or another registered backend, see
+:mod:`~pattern_language_miner.cluster.backends`) clustering, and UMAP
+dimensionality reduction to group similar patterns and visualise the
+results.
 """
 
 from __future__ import annotations
 
-import json
 import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, Dict, List, Tuple
 
-import matplotlib.pyplot as plt
 import numpy as np
 import umap
 import yaml
 from sentence_transformers import SentenceTransformer
 from sklearn.cluster import KMeans
+from sklearn.metrics import silhouette_score
+
+from .assignment import ClusterModel, assign_to_centroids
+from .backends import get_backend
+from .cluster_report import report_format_for, write_cluster_report
+from .embedding_cache import EmbeddingCache, text_key
+from .neighbors import NeighborIndex, embedding_fingerprint
+from .raster import rasterize_points, write_png
 
 logger = logging.getLogger(__name__)
 
+#: Scoring methods accepted by :meth:`PatternClusterer.select_n_clusters`.
+SELECTION_METRICS: frozenset[str] = frozenset({"silhouette", "elbow"})
+
+#: Rendering backends accepted by :meth:`PatternClusterer.visualize_clusters`.
+PLOT_BACKENDS: frozenset[str] = frozenset({"matplotlib", "raster"})
+
+#: Fewest samples UMAP can project; smaller inputs are projected with PCA.
+MIN_UMAP_SAMPLES = 4
+
 
 class PatternClusterer:
     """Cluster semantic-embedding vectors of pattern texts.
@@ -29,17 +48,30 @@ class PatternClusterer:
 
     1. Load patterns from YAML files (:meth:`load_patterns`).
     2. Encode field values with a sentence transformer (:meth:`embed_patterns`).
-    3. Cluster with KMeans and reduce dimensions with UMAP
-       (:meth:`cluster_and_reduce`).
+    3. Cluster with KMeans, agglomerative or HDBSCAN and reduce dimensions
+       with UMAP (:meth:`cluster_and_reduce`).  All neighbour-based steps
+       share one :class:`~pattern_language_miner.cluster.neighbors.NeighborIndex`.
     4. Visualise the 2-D projection (:meth:`visualize_clusters`).
-    5. Save a JSON report with cluster assignments
+    5. Save a JSON or JSON Lines report with cluster assignments
        (:meth:`generate_cluster_report`).
 
+    The fitted centroids are kept in :attr:`cluster_model`; once saved
+    with :meth:`save_cluster_model`, a later run can place new patterns
+    into the same clusters with :meth:`assign_patterns`.
+
     Args:
         input_dir: Directory of ``*.yaml`` pattern files to load.
         field: Pattern field to embed (e.g. ``"solution"``).
         model_name: Sentence-transformer model identifier.
         batch_size: Number of sentences encoded per batch.
+        cache_path: Optional ``.npz`` file used as an
+            :class:`~pattern_language_miner.cluster.embedding_cache.EmbeddingCache`.
+            Texts already present in the cache are not re-encoded, and the
+            model is only loaded when at least one text is missing.
+        neighbor_cache_path: Optional ``.npz`` file holding the
+            :class:`~pattern_language_miner.cluster.neighbors.NeighborIndex`
+            of the last embedding matrix, reused while the embeddings are
+            unchanged.
 
     Example:
         >>> clusterer = PatternClusterer("./enriched", field="solution")
@@ -54,6 +86,8 @@ class PatternClusterer:
         field: str,
         model_name: str = "all-MiniLM-L6-v2",
         batch_size: int = 64,
+        cache_path: str | Path | None = None,
+        neighbor_cache_path: str | Path | None = None,
     ) -> None:
         self.input_dir = Path(input_dir)
         self.field = field
@@ -61,7 +95,27 @@ class PatternClusterer:
         self.batch_size = batch_size
         self.patterns: List[Dict[str, Any]] = []
         self.embeddings: np.ndarray | None = None
-        self.model = SentenceTransformer(model_name)
+        self.cluster_model: ClusterModel | None = None
+        self.cache: EmbeddingCache | None = (
+            EmbeddingCache(cache_path, model_name) if cache_path else None
+        )
+        self.neighbor_cache_path = (
+            Path(neighbor_cache_path) if neighbor_cache_path else None
+        )
+        self._neighbors: NeighborIndex | None = None
+        self._model: SentenceTransformer | None = None
+
+    @property
+    def model(self) -> SentenceTransformer:
+        """The sentence-transformer, loaded on first access."""
+        if self._model is None:
+            logger.info("Loading sentence-transformer model %s.", self.model_name)
+            self._model = SentenceTransformer(self.model_name)
+        return self._model
+
+    @model.setter
+    def model(self, value: SentenceTransformer) -> None:
+        self._model = value
 
     # ------------------------------------------------------------------
     # Public API
@@ -92,53 +146,145 @@ class PatternClusterer:
     def embed_patterns(self, batch_size: int | None = None) -> np.ndarray:
         """Encode pattern field values as sentence embeddings.
 
+        When :attr:`cache` is set, only texts missing from the cache are
+        encoded and the cache is saved afterwards.
+
         Args:
             batch_size: Override the instance-level :attr:`batch_size`.
 
         Returns:
             A NumPy array of shape ``(n_patterns, embedding_dim)``.
         """
-        bs = batch_size or self.batch_size
-        texts = [p[self.field] for p in self.patterns]
-        total = len(texts)
-        logger.info("Encoding %d pattern(s) in batches of %d.", total, bs)
+        self.embeddings = self._embed_texts(
+            [p[self.field] for p in self.patterns], batch_size
+        )
+        logger.info("All embeddings generated. Shape: %s", self.embeddings.shape)
+        return self.embeddings
 
-        all_embeddings: list = []
-        for start in range(0, total, bs):
-            end = min(start + bs, total)
-            batch = texts[start:end]
-            logger.debug(
-                "Encoding batch %d: items %d-%d",
-                start // bs + 1,
-                start,
-                end - 1,
+    def select_n_clusters(
+        self,
+        embeddings: np.ndarray,
+        k_min: int = 2,
+        k_max: int = 10,
+        metric: str = "silhouette",
+        sample_size: int = 2000,
+        n_jobs: int | None = None,
+    ) -> Tuple[int, Dict[int, float]]:
+        """Pick a KMeans cluster count by sweeping *k_min*..*k_max*.
+
+        Every candidate is fitted on the same *embeddings* array, in
+        parallel threads, so trying more values of *k* never re-encodes a
+        pattern.
+
+        Scoring methods:
+
+        - ``"silhouette"`` — mean silhouette coefficient, computed on a
+          random subsample of at most *sample_size* points.  The highest
+          score wins.
+        - ``"elbow"`` — KMeans inertia.  The winner is the knee of the
+          inertia curve: the point farthest from the straight line joining
+          the first and last candidates.
+
+        Args:
+            embeddings: Array of shape ``(n_samples, dim)``.
+            k_min: Smallest candidate cluster count (at least 2).
+            k_max: Largest candidate; clamped to ``n_samples - 1``.
+            metric: One of :data:`SELECTION_METRICS`.
+            sample_size: Silhouette subsample size.
+            n_jobs: Worker threads; defaults to one per CPU, capped at the
+                number of candidates.
+
+        Returns:
+            A 2-tuple of ``(best_k, scores)`` where *scores* maps each
+            candidate *k* to its silhouette score or inertia.  With fewer
+            than three samples there is nothing to compare, and the result
+            is ``(1, {})``.
+
+        Raises:
+            ValueError: If *metric* is unknown.
+        """
+        if metric not in SELECTION_METRICS:
+            raise ValueError(
+                f"Unsupported selection metric {metric!r}. "
+                f"Choose from: {', '.join(sorted(SELECTION_METRICS))}"
             )
-            batch_embs = self.model.encode(batch, show_progress_bar=False)
-            all_embeddings.extend(batch_embs)
+        n_samples = embeddings.shape[0]
+        if n_samples < 3:
+            logger.warning(
+                "Only %d sample(s); using a single cluster instead of a sweep.",
+                n_samples,
+            )
+            return 1, {}
+        k_min = max(2, k_min)
+        k_max = min(k_max, n_samples - 1)
+        if k_max < k_min:
+            k_min = k_max
+        candidates = list(range(k_min, k_max + 1))
+        workers = n_jobs or min(len(candidates), os.cpu_count() or 1)
+        logger.info(
+            "Sweeping k=%d..%d by %s on %d worker(s).", k_min, k_max, metric, workers
+        )
 
-        self.embeddings = np.array(all_embeddings)
-        logger.info("All embeddings generated. Shape: %s", self.embeddings.shape)
-        return self.embeddings
+        def _score(k: int) -> float:
+            kmeans = KMeans(n_clusters=k, random_state=42, n_init="auto")
+            labels = kmeans.fit_predict(embeddings)
+            if metric == "elbow":
+                return float(kmeans.inertia_)
+            if len(set(labels.tolist())) < 2:
+                return -1.0
+            return float(
+                silhouette_score(
+                    embeddings,
+                    labels,
+                    sample_size=min(sample_size, n_samples),
+                    random_state=42,
+                )
+            )
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            scores = dict(zip(candidates, pool.map(_score, candidates)))
+
+        if metric == "elbow":
+            best_k = _knee(candidates, [scores[k] for k in candidates])
+        else:
+            best_k = max(candidates, key=lambda k: scores[k])
+        logger.info("Selected k=%d (%s=%.4f).", best_k, metric, scores[best_k])
+        return best_k, scores
 
     def cluster_and_reduce(
         self,
         embeddings: np.ndarray,
         n_clusters: int = 5,
+        algorithm: str = "kmeans",
+        min_cluster_size: int = 5,
     ) -> Tuple[np.ndarray, np.ndarray]:
-        """Run KMeans clustering and UMAP 2-D reduction.
+        """Cluster *embeddings* and reduce them to 2-D with UMAP.
 
         If *n_clusters* exceeds the sample count it is clamped automatically.
+        Inputs too small for UMAP (see :data:`MIN_UMAP_SAMPLES`) are
+        projected onto their principal axes instead.
+        The neighbour index from :meth:`neighbor_index` is shared by UMAP
+        and by neighbour-based backends, so it is computed at most once per
+        embedding matrix.
 
         Args:
             embeddings: Array of shape ``(n_samples, dim)`` from
                 :meth:`embed_patterns`.
-            n_clusters: Number of KMeans clusters.
+            n_clusters: Number of clusters for ``kmeans`` and
+                ``agglomerative``; ignored by ``hdbscan``.
+            algorithm: Name of a backend registered in
+                :mod:`~pattern_language_miner.cluster.backends`.
+            min_cluster_size: Smallest cluster ``hdbscan`` will report.
 
         Returns:
             A 2-tuple of ``(reduced_2d, cluster_ids)`` where *reduced_2d*
             has shape ``(n_samples, 2)`` and *cluster_ids* is a 1-D integer
-            array of length *n_samples*.
+            array of length *n_samples*.  ``-1`` marks noise.
+
+        Raises:
+            ValueError: If *algorithm* is not registered.
         """
+        backend = get_backend(algorithm)
         n_samples = embeddings.shape[0]
         if n_clusters > n_samples:
             logger.warning(
@@ -149,34 +295,308 @@ class PatternClusterer:
             )
             n_clusters = n_samples
 
-        logger.info("Clustering with KMeans (k=%d).", n_clusters)
-        kmeans = KMeans(n_clusters=n_clusters, random_state=42, n_init="auto")
-        cluster_ids: np.ndarray = kmeans.fit_predict(embeddings)
-        logger.info("KMeans clustering finished.")
+        neighbors = self.neighbor_index(embeddings, n_neighbors=min(15, n_samples - 1))
+
+        logger.info("Clustering with %s (k=%d).", algorithm, n_clusters)
+        cluster_ids: np.ndarray = backend(
+            embeddings, neighbors, n_clusters, min_cluster_size
+        )
+        logger.info(
+            "%s clustering finished: %d cluster(s), %d noise point(s).",
+            algorithm,
+            len(set(cluster_ids.tolist()) - {-1}),
+            int((cluster_ids < 0).sum()),
+        )
+        self._remember_fit(
+            embeddings, _label_centroids(embeddings, cluster_ids), cluster_ids
+        )
+
+        if n_samples < MIN_UMAP_SAMPLES:
+            logger.info("Too few samples for UMAP; projecting with PCA.")
+            return _project_2d(embeddings), cluster_ids
 
         logger.info("Reducing dimensions with UMAP for 2-D projection.")
         reducer = umap.UMAP(
-            n_neighbors=min(15, n_samples - 1), random_state=42
+            n_neighbors=neighbors.n_neighbors,
+            precomputed_knn=neighbors.umap_knn(),
+            random_state=42,
         )
         reduced: np.ndarray = reducer.fit_transform(embeddings)
         logger.info("Dimensionality reduction complete.")
         return reduced, cluster_ids
 
+    def neighbor_index(
+        self, embeddings: np.ndarray, n_neighbors: int = 15
+    ) -> NeighborIndex:
+        """Return the shared neighbour index for *embeddings*.
+
+        The index is reused from memory, or from :attr:`neighbor_cache_path`,
+        whenever it was built from identical embeddings with at least
+        *n_neighbors* neighbours; otherwise it is rebuilt and cached.
+
+        Args:
+            embeddings: Array of shape ``(n_samples, dim)``.
+            n_neighbors: Neighbours per point, counting the point itself.
+
+        Returns:
+            A :class:`~pattern_language_miner.cluster.neighbors.NeighborIndex`
+            with exactly *n_neighbors* columns.
+        """
+        n_neighbors = max(1, min(n_neighbors, embeddings.shape[0]))
+        fingerprint = embedding_fingerprint(embeddings)
+        index = self._neighbors
+        if index is None and self.neighbor_cache_path and self.neighbor_cache_path.exists():
+            try:
+                index = NeighborIndex.load(self.neighbor_cache_path)
+            except (OSError, ValueError, KeyError) as exc:
+                logger.warning(
+                    "Could not read neighbour cache %s: %s", self.neighbor_cache_path, exc
+                )
+
+        if (
+            index is None
+            or index.fingerprint != fingerprint
+            or index.n_neighbors < n_neighbors
+        ):
+            index = NeighborIndex.build(embeddings, n_neighbors)
+            if self.neighbor_cache_path:
+                index.save(self.neighbor_cache_path)
+        else:
+            logger.info("Reusing cached %d-nearest-neighbour index.", index.n_neighbors)
+        self._neighbors = index
+
+        if index.n_neighbors == n_neighbors:
+            return index
+        return NeighborIndex(
+            index.indices[:, :n_neighbors], index.distances[:, :n_neighbors], fingerprint
+        )
+
+    def save_cluster_model(self, path: Path) -> None:
+        """Persist :attr:`cluster_model` for later :meth:`assign_patterns` runs.
+
+        Args:
+            path: Destination ``.npz`` file.
+
+        Raises:
+            RuntimeError: If nothing has been clustered yet.
+        """
+        if self.cluster_model is None:
+            raise RuntimeError("No fitted clusters to save; run cluster_and_reduce first.")
+        if len(self.cluster_model.centroids) == 0:
+            logger.warning(
+                "Every pattern is noise; the saved model cannot assign new patterns."
+            )
+        self.cluster_model.save(path)
+
+    def assign_patterns(
+        self,
+        model: ClusterModel,
+        drift_threshold: float = 1.5,
+        batch_size: int | None = None,
+    ) -> Tuple[np.ndarray, bool]:
+        """Place :attr:`patterns` into the clusters of a saved *model*.
+
+        Patterns the model already knows keep their cluster id.  Only new
+        patterns are embedded, and they are assigned to their nearest
+        centroid in one vectorised step.  If their mean centroid distance
+        exceeds *drift_threshold* times the model's baseline, every pattern
+        is refitted with KMeans seeded from the old centroids, which keeps
+        cluster ids aligned with the previous run.
+
+        Args:
+            model: A model loaded with
+                :meth:`~pattern_language_miner.cluster.assignment.ClusterModel.load`.
+            drift_threshold: Drift ratio above which a full refit happens.
+            batch_size: Override the instance-level :attr:`batch_size`.
+
+        Returns:
+            A 2-tuple of ``(cluster_ids, refitted)``.  The updated model is
+            stored in :attr:`cluster_model`.
+
+        Raises:
+            ValueError: If *model* was built from another field or
+                embedding model, or has no clusters (every fitted pattern
+                was noise).
+        """
+        if len(model.centroids) == 0:
+            raise ValueError(
+                "Cluster model has no clusters; every pattern was labelled as "
+                "noise when it was fitted."
+            )
+        if model.field != self.field or model.model_name != self.model_name:
+            raise ValueError(
+                f"Cluster model was fitted on field {model.field!r} with "
+                f"{model.model_name!r}, not {self.field!r} with {self.model_name!r}."
+            )
+        texts = [p[self.field] for p in self.patterns]
+        keys = [text_key(t) for t in texts]
+        new_idx = [i for i, key in enumerate(keys) if key not in model.labels]
+        logger.info(
+            "Assigning %d new pattern(s); %d already clustered.",
+            len(new_idx),
+            len(texts) - len(new_idx),
+        )
+
+        cluster_ids = np.array([model.labels.get(key, -1) for key in keys], dtype=int)
+        self.cluster_model = model
+        if not new_idx:
+            return cluster_ids, False
+
+        new_embeddings = self._embed_texts([texts[i] for i in new_idx], batch_size)
+        new_labels, distances = assign_to_centroids(new_embeddings, model.centroids)
+        drift = model.drift(distances)
+        logger.info("Drift ratio %.3f (threshold %.3f).", drift, drift_threshold)
+
+        if drift <= drift_threshold:
+            cluster_ids[new_idx] = new_labels
+            for i, label in zip(new_idx, new_labels.tolist()):
+                model.labels[keys[i]] = label
+            return cluster_ids, False
+
+        logger.warning(
+            "Drift %.3f exceeds %.3f; refitting all %d pattern(s).",
+            drift,
+            drift_threshold,
+            len(texts),
+        )
+        self.embeddings = self._embed_texts(texts, batch_size)
+        kmeans = KMeans(
+            n_clusters=len(model.centroids),
+            init=model.centroids.astype(self.embeddings.dtype),
+            n_init=1,
+            random_state=42,
+        )
+        cluster_ids = kmeans.fit_predict(self.embeddings)
+        self._remember_fit(self.embeddings, kmeans.cluster_centers_, cluster_ids)
+        return cluster_ids, True
+
     def visualize_clusters(
         self,
         reduced: np.ndarray,
         cluster_ids: np.ndarray,
         output_path: Path,
+        backend: str = "matplotlib",
     ) -> None:
-        """Save a scatter-plot PNG of the 2-D cluster projection.
+        """Save a PNG of the 2-D cluster projection.
+
+        Backends:
+
+        - ``"matplotlib"`` — an annotated scatter plot with one marker per
+          pattern.  Matplotlib is imported only when this backend is used.
+        - ``"raster"`` — points binned directly into a pixel buffer by
+          :func:`~pattern_language_miner.cluster.raster.rasterize_points`.
+          No axes or legend, but fast and lean for very large corpora.
 
         Args:
             reduced: 2-D coordinates from :meth:`cluster_and_reduce`.
             cluster_ids: Cluster label for each point.
             output_path: Destination path for the PNG file.
+            backend: One of :data:`PLOT_BACKENDS`.
+
+        Raises:
+            ValueError: If *backend* is unknown.
         """
-        logger.info("Rendering cluster plot to %s.", output_path)
-        fig, ax = plt.subplots(figsize=(10, 6))
+        if backend not in PLOT_BACKENDS:
+            raise ValueError(
+                f"Unsupported plot backend {backend!r}. "
+                f"Choose from: {', '.join(sorted(PLOT_BACKENDS))}"
+            )
+        logger.info("Rendering cluster plot to %s (%s).", output_path, backend)
+        if backend == "raster":
+            write_png(rasterize_points(reduced, cluster_ids), output_path)
+        else:
+            self._plot_matplotlib(reduced, cluster_ids, output_path)
+        logger.info("Cluster plot saved to %s.", output_path)
+
+    def generate_cluster_report(
+        self,
+        cluster_ids: np.ndarray,
+        output_path: Path,
+        format_: str | None = None,
+    ) -> None:
+        """Write a report mapping each pattern to its cluster ID.
+
+        With ``format_="jsonl"`` (the default for ``.jsonl`` paths) entries
+        are streamed one per line, grouped by cluster id, without building
+        the report in memory.  Otherwise an indented JSON array is written.
+
+        Args:
+            cluster_ids: Cluster labels from :meth:`cluster_and_reduce`.
+            output_path: Destination path for the report.
+            format_: ``"json"`` or ``"jsonl"``; inferred from *output_path*
+                when omitted.
+        """
+        logger.info("Generating cluster report to %s.", output_path)
+        fmt = format_ or report_format_for(output_path)
+        if fmt == "jsonl":
+            order = np.argsort(cluster_ids, kind="stable")
+            rows = ((self.patterns[i], cluster_ids[i]) for i in order)
+        else:
+            rows = zip(self.patterns, cluster_ids)
+        count = write_cluster_report(rows, output_path, fmt)
+        logger.info("Cluster report written (%d entries).", count)
+
+    # ------------------------------------------------------------------
+    # Private helpers
+    # ------------------------------------------------------------------
+
+    def _embed_texts(self, texts: List[str], batch_size: int | None) -> np.ndarray:
+        """Return embeddings for *texts*, encoding only cache misses."""
+        if self.cache is None:
+            return self._encode(texts, batch_size)
+        cached, missing = self.cache.lookup(texts)
+        if missing:
+            fresh = self._encode([texts[i] for i in missing], batch_size)
+            self.cache.update([texts[i] for i in missing], fresh)
+            self.cache.save()
+            for i, vec in zip(missing, fresh):
+                cached[i] = vec
+        logger.info(
+            "Reused %d cached embedding(s); encoded %d.",
+            len(texts) - len(missing),
+            len(missing),
+        )
+        if not cached:
+            return np.empty((0, 0), dtype=np.float32)
+        return np.stack(cached).astype(np.float32)
+
+    def _remember_fit(
+        self, embeddings: np.ndarray, centroids: np.ndarray, cluster_ids: np.ndarray
+    ) -> None:
+        """Record a fit in :attr:`cluster_model` when it covers :attr:`patterns`."""
+        if len(self.patterns) != embeddings.shape[0]:
+            return
+        clustered = cluster_ids >= 0
+        distances = np.linalg.norm(
+            embeddings[clustered] - centroids[cluster_ids[clustered]], axis=1
+        )
+        self.cluster_model = ClusterModel(
+            centroids=np.asarray(centroids, dtype=np.float32),
+            labels={
+                text_key(p[self.field]): int(cid)
+                for p, cid in zip(self.patterns, cluster_ids)
+            },
+            model_name=self.model_name,
+            field=self.field,
+            baseline_distance=float(distances.mean()) if distances.size else 0.0,
+        )
+
+    @staticmethod
+    def _plot_matplotlib(
+        reduced: np.ndarray, cluster_ids: np.ndarray, output_path: Path
+    ) -> None:
+        """Render the legacy scatter plot with matplotlib.
+
+        Uses a bare :class:`~matplotlib.figure.Figure` on an Agg canvas
+        rather than pyplot, whose global state is not thread-safe, so the
+        plot can be drawn from a pipeline worker thread.
+        """
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        fig = Figure(figsize=(10, 6))
+        FigureCanvasAgg(fig)
+        ax = fig.subplots()
         scatter = ax.scatter(
             reduced[:, 0],
             reduced[:, 1],
@@ -190,27 +610,81 @@ class PatternClusterer:
         ax.set_ylabel("UMAP-2")
         fig.tight_layout()
         fig.savefig(output_path)
-        plt.close(fig)
-        logger.info("Cluster plot saved to %s.", output_path)
 
-    def generate_cluster_report(
-        self,
-        cluster_ids: np.ndarray,
-        output_path: Path,
-    ) -> None:
-        """Write a JSON file mapping each pattern to its cluster ID.
+    def _encode(self, texts: List[str], batch_size: int | None) -> np.ndarray:
+        """Encode *texts* with :attr:`model` in batches."""
+        bs = batch_size or self.batch_size
+        total = len(texts)
+        logger.info("Encoding %d pattern(s) in batches of %d.", total, bs)
 
-        Args:
-            cluster_ids: Cluster labels from :meth:`cluster_and_reduce`.
-            output_path: Destination path for the JSON report.
-        """
-        logger.info("Generating cluster report to %s.", output_path)
-        report = []
-        for pattern, cluster_id in zip(self.patterns, cluster_ids):
-            entry = dict(pattern)
-            entry["cluster"] = int(cluster_id)
-            report.append(entry)
-
-        with output_path.open("w", encoding="utf-8") as fh:
-            json.dump(report, fh, indent=2, ensure_ascii=False)
-        logger.info("Cluster report written (%d entries).", len(report))
+        all_embeddings: list = []
+        for start in range(0, total, bs):
+            end = min(start + bs, total)
+            batch = texts[start:end]
+            logger.debug(
+                "Encoding batch %d: items %d-%d",
+                start // bs + 1,
+                start,
+                end - 1,
+            )
+            batch_embs = self.model.encode(batch, show_progress_bar=False)
+            all_embeddings.extend(batch_embs)
+        return np.array(all_embeddings)
+
+
+def _label_centroids(embeddings: np.ndarray, labels: np.ndarray) -> np.ndarray:
+    """Return the mean embedding of each non-negative label.
+
+    Args:
+        embeddings: Array of shape ``(n_samples, dim)``.
+        labels: Cluster id per row; ``-1`` rows are ignored.
+
+    Returns:
+        Array of shape ``(labels.max() + 1, dim)``.
+    """
+    clustered = labels >= 0
+    n_clusters = int(labels.max()) + 1 if clustered.any() else 0
+    sums = np.zeros((n_clusters, embeddings.shape[1]))
+    np.add.at(sums, labels[clustered], embeddings[clustered])
+    counts = np.bincount(labels[clustered], minlength=n_clusters)
+    return sums / np.maximum(counts, 1)[:, None]
+
+
+def _project_2d(embeddings: np.ndarray) -> np.ndarray:
+    """Project *embeddings* onto their first two principal axes.
+
+    Returns:
+        Array of shape ``(n_samples, 2)``; missing axes are zero.
+    """
+    centered = embeddings - embeddings.mean(axis=0)
+    _, _, components = np.linalg.svd(centered, full_matrices=False)
+    reduced = np.zeros((embeddings.shape[0], 2))
+    axes = centered @ components[:2].T
+    reduced[:, : axes.shape[1]] = axes
+    return reduced
+
+
+def _knee(ks: List[int], values: List[float]) -> int:
+    """Return the *k* at the knee of a decreasing curve.
+
+    Both axes are normalised to ``[0, 1]`` and the point with the largest
+    perpendicular distance from the chord between the end points is chosen.
+
+    Args:
+        ks: Candidate cluster counts in ascending order.
+        values: The inertia measured for each candidate.
+
+    Returns:
+        The candidate at the knee, or the first one if the curve is flat.
+    """
+    if len(ks) < 3:
+        return ks[0]
+    x = np.asarray(ks, dtype=float)
+    y = np.asarray(values, dtype=float)
+    x = (x - x[0]) / (x[-1] - x[0])
+    span = y[0] - y[-1]
+    if span <= 0:
+        return ks[0]
+    y = (y[0] - y) / span
+    # Distance from the diagonal y = x in normalised space.
+    return ks[int(np.argmax(y - x))]
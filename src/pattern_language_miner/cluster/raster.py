@@ -0,0 +1,121 @@
+"""Matplotlib-free rendering of large 2-D cluster projections.
+
+Points are binned straight into a fixed-size pixel grid with
+:func:`numpy.bincount`, in the spirit of datashader: every pixel gets the
+average colour of the clusters that landed in it and an opacity that grows
+with the log of its point count.  The image is then written as a PNG with
+:mod:`zlib`, so cost scales with the number of points once and with the
+image size after that — a million points render in well under a second
+without a plotting library.
+"""
+
+from __future__ import annotations
+
+import logging
+import struct
+import zlib
+from pathlib import Path
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+#: Matplotlib's ``tab10`` colours, used so both backends look alike.
+TAB10: np.ndarray = np.array(
+    [
+        (31, 119, 180),
+        (255, 127, 14),
+        (44, 160, 44),
+        (214, 39, 40),
+        (148, 103, 189),
+        (140, 86, 75),
+        (227, 119, 194),
+        (127, 127, 127),
+        (188, 189, 34),
+        (23, 190, 207),
+    ],
+    dtype=np.float64,
+)
+
+#: Colour used for points labelled ``-1`` (noise).
+NOISE_COLOUR: np.ndarray = np.array((200, 200, 200), dtype=np.float64)
+
+
+def rasterize_points(
+    points: np.ndarray,
+    labels: np.ndarray,
+    width: int = 1000,
+    height: int = 600,
+    min_alpha: float = 0.35,
+) -> np.ndarray:
+    """Bin 2-D *points* into an RGB image coloured by *labels*.
+
+    Args:
+        points: Array of shape ``(n, 2)``.
+        labels: Integer cluster id per point; ``-1`` is drawn as noise.
+        width: Image width in pixels.
+        height: Image height in pixels.
+        min_alpha: Opacity of a pixel holding a single point.  Denser
+            pixels scale logarithmically up to full opacity.
+
+    Returns:
+        A ``uint8`` array of shape ``(height, width, 3)`` on a white
+        background, with the y axis pointing up.
+    """
+    image = np.full((height, width, 3), 255, dtype=np.uint8)
+    if len(points) == 0:
+        return image
+
+    xy = np.asarray(points, dtype=np.float64)
+    lo = xy.min(axis=0)
+    span = xy.max(axis=0) - lo
+    span[span == 0] = 1.0
+    col = np.minimum(((xy[:, 0] - lo[0]) / span[0] * (width - 1)).round(), width - 1)
+    row = np.minimum(((xy[:, 1] - lo[1]) / span[1] * (height - 1)).round(), height - 1)
+    pixel = ((height - 1 - row) * width + col).astype(np.int64)
+
+    labels = np.asarray(labels, dtype=np.int64)
+    colours = np.where(
+        (labels >= 0)[:, None], TAB10[np.maximum(labels, 0) % len(TAB10)], NOISE_COLOUR
+    )
+    n_pixels = width * height
+    counts = np.bincount(pixel, minlength=n_pixels).astype(np.float64)
+    filled = counts > 0
+    mean = np.empty((n_pixels, 3))
+    for channel in range(3):
+        sums = np.bincount(pixel, weights=colours[:, channel], minlength=n_pixels)
+        mean[filled, channel] = sums[filled] / counts[filled]
+
+    alpha = np.zeros(n_pixels)
+    peak = np.log1p(counts.max())
+    alpha[filled] = min_alpha + (1.0 - min_alpha) * np.log1p(counts[filled]) / peak
+    flat = image.reshape(-1, 3).astype(np.float64)
+    a = alpha[filled, None]
+    flat[filled] = flat[filled] * (1.0 - a) + mean[filled] * a
+    return flat.round().astype(np.uint8).reshape(height, width, 3)
+
+
+def write_png(image: np.ndarray, output_path: Path) -> None:
+    """Write an RGB ``uint8`` array as an 8-bit PNG.
+
+    Args:
+        image: Array of shape ``(height, width, 3)``.
+        output_path: Destination file.
+    """
+    height, width, _ = image.shape
+    # Each scanline is prefixed with filter type 0 (None).
+    raw = np.zeros((height, width * 3 + 1), dtype=np.uint8)
+    raw[:, 1:] = image.reshape(height, width * 3)
+
+    def _chunk(tag: bytes, data: bytes) -> bytes:
+        body = tag + data
+        return struct.pack(">I", len(data)) + body + struct.pack(">I", zlib.crc32(body))
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    png = (
+        b"\x89PNG\r\n\x1a\n"
+        + _chunk(b"IHDR", header)
+        + _chunk(b"IDAT", zlib.compress(raw.tobytes(), 6))
+        + _chunk(b"IEND", b"")
+    )
+    Path(output_path).write_bytes(png)
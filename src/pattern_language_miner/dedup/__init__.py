@@ -0,0 +1,12 @@
+"""Dedup sub-package.
+
+Provides :class:`~pattern_language_miner.dedup.pattern_dedup.PatternDeduplicator`
+and the standalone
+:func:`~pattern_language_miner.dedup.pattern_dedup.deduplicate_patterns`
+helper for merging contained and near-duplicate patterns between
+``analyze`` and ``enrich``.
+"""
+
+from .pattern_dedup import PatternDeduplicator, deduplicate_patterns
+
+__all__ = ["PatternDeduplicator", "deduplicate_patterns"]
@@ -0,0 +1,400 @@
+"""Near-duplicate pattern deduplication.
+
+Sits between ``analyze`` and ``enrich``.  Extraction emits heavily
+overlapping n-grams ("install the package", "install the package using");
+this stage links such patterns in three passes and merges each connected
+group into its most frequent member:
+
+1. **Containment** — a pattern whose tokens contain another pattern's
+   tokens as a contiguous run is linked to it when it accounts for at least
+   ``min_containment`` of the shorter pattern's occurrences.  Lookups go
+   through a hash of every pattern's token tuple, so no pairs are compared.
+2. **Lexical near-duplicates** — MinHash/LSH over character shingles finds
+   candidates ("install the package" / "install the packages"), which are
+   confirmed with exact Jaccard similarity.
+3. **Semantic near-duplicates** (optional) — cached embeddings are blocked
+   with random-hyperplane SimHash bands and compared by cosine similarity
+   only within a block.
+
+Every pass is linear in the number of patterns (times small per-pattern
+constants), so the stage scales to large extraction outputs.
+
+The module exposes two entry-points:
+
+- :func:`deduplicate_patterns` — merge a list of pattern dicts.
+- :class:`PatternDeduplicator` — batch-process a directory of YAML files.
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+import yaml
+
+from .minhash import lsh_buckets, minhash_signatures, shingles
+
+logger = logging.getLogger(__name__)
+
+
+# ---------------------------------------------------------------------------
+# Grouping
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class DuplicateGroup:
+    """A set of patterns that will be merged into one.
+
+    Attributes:
+        representative: Index of the surviving pattern.
+        members: Indices of the other patterns in the group.
+        frequency: Merged frequency.  Occurrences of a containing pattern
+            are already counted by the pattern it contains, so only the
+            frequencies of patterns not absorbed by containment are summed.
+    """
+
+    representative: int
+    members: List[int] = field(default_factory=list)
+    frequency: int = 0
+
+
+class _UnionFind:
+    def __init__(self, size: int) -> None:
+        self.parent = list(range(size))
+
+    def find(self, item: int) -> int:
+        root = item
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[item] != root:
+            self.parent[item], item = root, self.parent[item]
+        return root
+
+    def union(self, a: int, b: int) -> None:
+        ra, rb = self.find(a), self.find(b)
+        if ra != rb:
+            self.parent[max(ra, rb)] = min(ra, rb)
+
+
+def find_duplicate_groups(
+    texts: Sequence[str],
+    frequencies: Sequence[int],
+    min_containment: float = 0.2,
+    jaccard_threshold: float = 0.8,
+    shingle_size: int = 3,
+    num_perm: int = 64,
+    bands: int = 16,
+    embeddings: np.ndarray | None = None,
+    cosine_threshold: float = 0.92,
+    max_block: int = 512,
+) -> List[DuplicateGroup]:
+    """Group duplicate texts and pick a representative for each group.
+
+    Args:
+        texts: Pattern texts (space-separated tokens).
+        frequencies: Corpus frequency of each text.
+        min_containment: Minimum ``freq(longer) / freq(shorter)`` for a
+            containment link; ``0`` links every containment, values above
+            ``1`` disable the pass.
+        jaccard_threshold: Minimum shingle Jaccard similarity for a lexical
+            near-duplicate; values above ``1`` disable the pass.
+        shingle_size: Character shingle width.
+        num_perm: MinHash signature length.
+        bands: LSH bands; must divide *num_perm*.
+        embeddings: Optional array of shape ``(len(texts), dim)``.  Rows of
+            all zeros (e.g. texts without a cached embedding) are skipped.
+        cosine_threshold: Minimum cosine similarity for a semantic
+            near-duplicate.
+        max_block: Largest SimHash block compared exhaustively; larger
+            blocks are compared in consecutive chunks of this size.
+
+    Returns:
+        One :class:`DuplicateGroup` per surviving pattern, including
+        singletons, in input order of their representatives.
+    """
+    n_items = len(texts)
+    groups = _UnionFind(n_items)
+    absorbed = np.zeros(n_items, dtype=bool)
+
+    if min_containment <= 1:
+        links = _containment_links(texts, frequencies, min_containment)
+        for longer, shorter in links:
+            groups.union(longer, shorter)
+            absorbed[longer] = True
+        logger.debug("Containment pass linked %d pattern(s).", len(links))
+
+    if jaccard_threshold <= 1:
+        merged = _lexical_links(
+            texts, groups, jaccard_threshold, shingle_size, num_perm, bands
+        )
+        logger.debug("MinHash pass merged %d pair(s).", merged)
+
+    if embeddings is not None:
+        merged = _semantic_links(embeddings, groups, cosine_threshold, max_block)
+        logger.debug("Embedding pass merged %d pair(s).", merged)
+
+    members: Dict[int, List[int]] = {}
+    for idx in range(n_items):
+        members.setdefault(groups.find(idx), []).append(idx)
+
+    result: List[DuplicateGroup] = []
+    for indices in members.values():
+        rep = max(indices, key=lambda i: (frequencies[i], len(texts[i].split()), -i))
+        freq = sum(int(frequencies[i]) for i in indices if not absorbed[i])
+        result.append(
+            DuplicateGroup(
+                representative=rep,
+                members=[i for i in indices if i != rep],
+                frequency=max(freq, int(frequencies[rep])),
+            )
+        )
+    result.sort(key=lambda g: g.representative)
+    return result
+
+
+def _containment_links(
+    texts: Sequence[str], frequencies: Sequence[int], min_containment: float
+) -> List[Tuple[int, int]]:
+    """Link each pattern to the contained pattern it explains best."""
+    index = {tuple(text.split()): i for i, text in enumerate(texts)}
+    links: List[Tuple[int, int]] = []
+    for i, text in enumerate(texts):
+        tokens = text.split()
+        best, best_share = -1, min_containment
+        for n in range(1, len(tokens)):
+            for start in range(len(tokens) - n + 1):
+                j = index.get(tuple(tokens[start:start + n]))
+                if j is None or j == i or not frequencies[j]:
+                    continue
+                share = frequencies[i] / frequencies[j]
+                if share >= best_share:
+                    best, best_share = j, share
+        if best >= 0:
+            links.append((i, best))
+    return links
+
+
+def _lexical_links(
+    texts: Sequence[str],
+    groups: _UnionFind,
+    threshold: float,
+    shingle_size: int,
+    num_perm: int,
+    bands: int,
+) -> int:
+    """Union MinHash/LSH candidates whose exact Jaccard meets *threshold*."""
+    sets = [shingles(text, shingle_size) for text in texts]
+    merged = 0
+    for bucket in lsh_buckets(minhash_signatures(sets, num_perm), bands):
+        anchor = int(bucket[0])
+        for other in bucket[1:]:
+            other = int(other)
+            if groups.find(anchor) == groups.find(other):
+                continue
+            a, b = sets[anchor], sets[other]
+            if len(a & b) >= threshold * len(a | b):
+                groups.union(anchor, other)
+                merged += 1
+    return merged
+
+
+def _semantic_links(
+    embeddings: np.ndarray,
+    groups: _UnionFind,
+    threshold: float,
+    max_block: int,
+    n_bits: int = 32,
+    band_bits: int = 8,
+) -> int:
+    """Union embedding pairs above *threshold* within SimHash blocks."""
+    norms = np.linalg.norm(embeddings, axis=1)
+    valid = np.flatnonzero(norms > 0)
+    if len(valid) < 2:
+        return 0
+    unit = embeddings[valid] / norms[valid, None]
+    planes = np.random.default_rng(42).normal(size=(unit.shape[1], n_bits))
+    bits = (unit @ planes > 0).astype(np.int64)
+    weights = 1 << np.arange(band_bits)
+
+    merged = 0
+    for start in range(0, n_bits, band_bits):
+        keys = bits[:, start:start + band_bits] @ weights
+        order = np.argsort(keys, kind="stable")
+        bounds = np.flatnonzero(np.diff(keys[order])) + 1
+        for block in np.split(order, bounds):
+            for chunk_start in range(0, len(block), max_block):
+                chunk = block[chunk_start:chunk_start + max_block]
+                if len(chunk) < 2:
+                    continue
+                sims = unit[chunk] @ unit[chunk].T
+                for a, b in zip(*np.nonzero(np.triu(sims >= threshold, k=1))):
+                    ia, ib = int(valid[chunk[a]]), int(valid[chunk[b]])
+                    if groups.find(ia) != groups.find(ib):
+                        groups.union(ia, ib)
+                        merged += 1
+    return merged
+
+
+# ---------------------------------------------------------------------------
+# Merging
+# ---------------------------------------------------------------------------
+
+
+def deduplicate_patterns(
+    patterns: List[Dict[str, Any]],
+    field: str = "pattern",
+    embeddings: np.ndarray | None = None,
+    **options: Any,
+) -> List[Dict[str, Any]]:
+    """Merge duplicate *patterns* and return the survivors.
+
+    The *patterns* argument is **not** mutated.  Each survivor is a copy of
+    its group's representative with the merged ``frequency`` and the
+    *field* texts of the merged patterns appended to ``related_patterns``.
+
+    Args:
+        patterns: Pattern dicts, typically loaded from ``analyze`` output.
+        field: Key holding the pattern text.
+        embeddings: Optional embeddings aligned with *patterns*.
+        **options: Forwarded to :func:`find_duplicate_groups`.
+
+    Returns:
+        The merged patterns, sorted by descending frequency.
+
+    Example:
+        >>> deduplicate_patterns([
+        ...     {"pattern": "install the package", "frequency": 10},
+        ...     {"pattern": "install the package using", "frequency": 4},
+        ... ])[0]["related_patterns"]
+        ['install the package using']
+    """
+    merged = [
+        merge_group(patterns, group, field)
+        for group in find_duplicate_groups(
+            [str(p.get(field, "")) for p in patterns],
+            [int(p.get("frequency", 1)) for p in patterns],
+            embeddings=embeddings,
+            **options,
+        )
+    ]
+    return sorted(merged, key=lambda p: -p.get("frequency", 0))
+
+
+def merge_group(
+    patterns: Sequence[Dict[str, Any]], group: DuplicateGroup, field: str = "pattern"
+) -> Dict[str, Any]:
+    """Return the merged pattern dict for *group*."""
+    merged: Dict[str, Any] = dict(patterns[group.representative])
+    if not group.members:
+        return merged
+    related = list(merged.get("related_patterns") or [])
+    for idx in group.members:
+        text = patterns[idx].get(field)
+        if text is not None and text not in related:
+            related.append(text)
+    merged["frequency"] = group.frequency
+    merged["related_patterns"] = related
+    return merged
+
+
+# ---------------------------------------------------------------------------
+# Batch deduplicator class
+# ---------------------------------------------------------------------------
+
+
+class PatternDeduplicator:
+    """Deduplicate every YAML pattern file in *input_dir* into *output_dir*.
+
+    Surviving patterns keep the filename of their representative.
+
+    Args:
+        input_dir: Directory of raw ``*.yaml`` / ``*.yml`` pattern files.
+        output_dir: Directory where the merged patterns are written.
+        field: Key holding the pattern text.
+        embedding_cache: Optional
+            :class:`~pattern_language_miner.cluster.embedding_cache.EmbeddingCache`
+            enabling the semantic pass for texts it has vectors for.
+        **options: Forwarded to :func:`find_duplicate_groups`.
+
+    Example:
+        >>> PatternDeduplicator("./raw_patterns", "./deduped_patterns").run()
+    """
+
+    def __init__(
+        self,
+        input_dir: Path | str,
+        output_dir: Path | str,
+        field: str = "pattern",
+        embedding_cache: Any = None,
+        **options: Any,
+    ) -> None:
+        self.input_dir = Path(input_dir)
+        self.output_dir = Path(output_dir)
+        self.field = field
+        self.embedding_cache = embedding_cache
+        self.options = options
+
+    def run(self) -> List[Dict[str, Any]]:
+        """Read, deduplicate and write the patterns.
+
+        Files that cannot be parsed are skipped with a WARNING log entry.
+
+        Returns:
+            The merged patterns that were written.
+        """
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        files = sorted(
+            list(self.input_dir.glob("*.yml")) + list(self.input_dir.glob("*.yaml"))
+        )
+        paths: List[Path] = []
+        patterns: List[Dict[str, Any]] = []
+        for path in files:
+            try:
+                with path.open("r", encoding="utf-8") as fh:
+                    pattern = yaml.safe_load(fh) or {}
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("Failed to read %s: %s", path.name, exc)
+                continue
+            paths.append(path)
+            patterns.append(pattern)
+
+        texts = [str(p.get(self.field, "")) for p in patterns]
+        groups = find_duplicate_groups(
+            texts,
+            [int(p.get("frequency", 1)) for p in patterns],
+            embeddings=self._cached_embeddings(texts),
+            **self.options,
+        )
+        merged = []
+        for group in groups:
+            pattern = merge_group(patterns, group, self.field)
+            out = self.output_dir / paths[group.representative].name
+            with out.open("w", encoding="utf-8") as fh:
+                yaml.dump(pattern, fh, allow_unicode=True, sort_keys=False)
+            merged.append(pattern)
+
+        logger.info(
+            "Deduplicated %d pattern(s) into %d. Saved to %s",
+            len(patterns),
+            len(merged),
+            self.output_dir,
+        )
+        return merged
+
+    def _cached_embeddings(self, texts: List[str]) -> np.ndarray | None:
+        """Stack cached vectors for *texts*, zero rows for cache misses."""
+        if self.embedding_cache is None or not texts:
+            return None
+        vectors, missing = self.embedding_cache.lookup(texts)
+        present = [v for v in vectors if v is not None]
+        if not present:
+            logger.warning("No cached embeddings for these patterns; skipping semantic pass.")
+            return None
+        if missing:
+            logger.info("%d pattern(s) have no cached embedding.", len(missing))
+        dim = len(present[0])
+        return np.stack([v if v is not None else np.zeros(dim) for v in vectors])
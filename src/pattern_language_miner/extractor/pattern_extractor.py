@@ -1,9 +1,10 @@
 """Lexical n-gram pattern extractor.
 
 This module provides :class:`PatternExtractor`, which scans a directory of
-documents, tokenises the text with NLTK, and discovers frequently recurring
-n-gram patterns.  Results are serialised as individual YAML files in the
-configured output directory.
+documents, tokenises the text (with NLTK by default, see
+:mod:`~pattern_language_miner.extractor.word_tokenizers`), and discovers
+frequently recurring n-gram patterns.  Results are serialised as individual
+YAML files in the configured output directory.
 """
 
 from __future__ import annotations
@@ -11,12 +12,18 @@ from __future__ import annotations
 import logging
 from collections import Counter
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 import nltk
 import yaml
 
+from pattern_language_miner.extractor.suffix_array import count_repeated_phrases
+from pattern_language_miner.extractor.word_tokenizers import get_tokenizer
+from pattern_language_miner.parser.base_parser import BaseParser, Block
+from pattern_language_miner.parser.text_parser import TextParser
+from pattern_language_miner.utils.chunked_reader import ChunkedText
 from pattern_language_miner.utils.config_validation import load_and_validate_config
+from pattern_language_miner.walker import DirectoryWalker
 
 # Ensure required NLTK data is present at import time.
 nltk.download("punkt", quiet=True)
@@ -29,6 +36,85 @@ logger = logging.getLogger(__name__)
 #: Path to the bundled JSON Schema for configuration validation.
 _CONFIG_SCHEMA = Path(__file__).parent.parent / "schema" / "config_schema.json"
 
+#: Values accepted by the ``output_mode`` config option.
+OUTPUT_MODES: frozenset[str] = frozenset({"all", "closed", "maximal"})
+
+#: A document as raw text or as the blocks its parser extracted.
+Document = Union[str, Iterable[Block]]
+
+#: Default ``large_file_threshold``: files from 64 MiB are streamed.
+LARGE_FILE_THRESHOLD = 64 * 1024 * 1024
+
+#: Splits raw-text documents into paragraph blocks.
+_TEXT_PARSER = TextParser()
+
+#: Values accepted by the ``engine`` config option.
+ENGINES: frozenset[str] = frozenset({"counter", "suffix_array"})
+
+
+def select_patterns(
+    counts: Dict[Tuple[str, ...], int], output_mode: str = "all"
+) -> Dict[Tuple[str, ...], int]:
+    """Drop frequent n-grams that are subsumed by a longer frequent n-gram.
+
+    - ``"all"`` keeps every n-gram in *counts*.
+    - ``"closed"`` keeps n-grams with no one-token extension of equal
+      frequency; a sub-n-gram that only ever occurs inside a longer pattern
+      adds no information.
+    - ``"maximal"`` keeps n-grams with no frequent extension at all.
+
+    Every longer super-n-gram occurs at most as often as the one-token
+    extension it contains, so it is enough to look at the extensions.  One
+    pass maps each n-gram's prefix and suffix to the largest extension
+    frequency seen — a hash-based trie walk with no pairwise comparisons.
+
+    Args:
+        counts: Frequent n-grams, keyed by token tuple.
+        output_mode: One of :data:`OUTPUT_MODES`.
+
+    Returns:
+        The retained subset of *counts*.
+
+    Raises:
+        ValueError: If *output_mode* is not recognised.
+
+    Example:
+        >>> select_patterns({("a", "b"): 2, ("a", "b", "c"): 2}, "closed")
+        {('a', 'b', 'c'): 2}
+    """
+    if output_mode not in OUTPUT_MODES:
+        raise ValueError(
+            f"Unsupported output_mode {output_mode!r}. "
+            f"Choose from: {', '.join(sorted(OUTPUT_MODES))}"
+        )
+    if output_mode == "all":
+        return counts
+
+    extension_freq: Dict[Tuple[str, ...], int] = {}
+    for gram, freq in counts.items():
+        for sub in (gram[:-1], gram[1:]):
+            if freq > extension_freq.get(sub, 0):
+                extension_freq[sub] = freq
+
+    if output_mode == "closed":
+        return {
+            gram: freq
+            for gram, freq in counts.items()
+            if extension_freq.get(gram, 0) < freq
+        }
+    return {gram: freq for gram, freq in counts.items() if gram not in extension_freq}
+
+
+class _StreamedDocument:
+    """Re-iterable blocks of a large file, parsed chunk by chunk on demand."""
+
+    def __init__(self, parser: BaseParser, content: ChunkedText) -> None:
+        self.parser = parser
+        self.content = content
+
+    def __iter__(self) -> Iterator[Block]:
+        return self.parser.iter_blocks(self.content)
+
 
 class PatternExtractor:
     """Extract frequent lexical n-gram patterns from a document corpus.
@@ -40,7 +126,8 @@ class PatternExtractor:
         config_path: Path to the YAML configuration file.
         input_dir: Directory containing source documents to analyse.
         output_dir: Directory where extracted pattern YAML files are written.
-            Created automatically if it does not exist.
+            Created automatically if it does not exist.  May be ``None``
+            when patterns are only needed in memory (see :meth:`extract`).
 
     Example:
         >>> extractor = PatternExtractor(
@@ -55,17 +142,39 @@ class PatternExtractor:
         self,
         config_path: Path,
         input_dir: Path,
-        output_dir: Path,
+        output_dir: Optional[Path] = None,
     ) -> None:
         self.input_dir = Path(input_dir)
-        self.output_dir = Path(output_dir)
-        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.output_dir = Path(output_dir) if output_dir is not None else None
+        if self.output_dir is not None:
+            self.output_dir.mkdir(parents=True, exist_ok=True)
 
         config = load_and_validate_config(
             Path(config_path), _CONFIG_SCHEMA
         )["pattern_extraction"]
 
-        self.file_type: str = config.get("file_type", "md")
+        self.file_types: List[str] = config.get("file_types") or [
+            config.get("file_type", "md")
+        ]
+        html_backend = config.get("html_backend")
+        parser_options = (
+            {ext: {"backend": html_backend} for ext in (".html", ".htm")}
+            if html_backend
+            else None
+        )
+        self.walker = DirectoryWalker(
+            self.input_dir,
+            extensions=self.file_types,
+            workers=config.get("read_workers", 1),
+            large_file_threshold=config.get(
+                "large_file_threshold", LARGE_FILE_THRESHOLD
+            ),
+            encodings=config.get("encodings"),
+            include=config.get("include"),
+            exclude=config.get("exclude"),
+            max_file_size=config.get("max_file_size"),
+            parser_options=parser_options,
+        )
         self.frequency_threshold: int = config.get("frequency_threshold", 3)
         self.minimum_token_count: int = config.get("minimum_token_count", 2)
         self.scope: str = config.get("scope", "sentence")
@@ -76,15 +185,31 @@ class PatternExtractor:
         self.block_elements: frozenset[str] = frozenset(
             config.get("block_elements", [])
         )
+        self.exclude_block_elements: frozenset[str] = frozenset(
+            config.get("exclude_block_elements", [])
+        )
         self.ngram_min: int = config.get("ngram_min", 2)
         self.ngram_max: int = config.get("ngram_max", 5)
+        self.output_mode: str = config.get("output_mode", "all")
+        self.engine: str = config.get("engine", "counter")
+        if self.engine not in ENGINES:
+            raise ValueError(
+                f"Unsupported engine {self.engine!r}. "
+                f"Choose from: {', '.join(sorted(ENGINES))}"
+            )
+        self.tokenizer: str = config.get("tokenizer", "nltk")
+        self._tokenize = get_tokenizer(self.tokenizer)
 
         logger.debug(
-            "PatternExtractor initialised: scope=%s, ngram=%d-%d, threshold=%d",
+            "PatternExtractor initialised: scope=%s, ngram=%d-%d, threshold=%d, "
+            "output_mode=%s, engine=%s, tokenizer=%s",
             self.scope,
             self.ngram_min,
             self.ngram_max,
             self.frequency_threshold,
+            self.output_mode,
+            self.engine,
+            self.tokenizer,
         )
 
     # ------------------------------------------------------------------
@@ -96,30 +221,85 @@ class PatternExtractor:
 
         Loads documents, extracts n-gram patterns, and writes YAML output
         files to :attr:`output_dir`.
+
+        Raises:
+            ValueError: If the extractor was created without an output
+                directory.
+        """
+        if self.output_dir is None:
+            raise ValueError("PatternExtractor.run() requires an output_dir.")
+        self._write_patterns(self.extract())
+
+    def extract(self) -> List[Dict[str, Any]]:
+        """Load the documents in :attr:`input_dir` and extract their patterns.
+
+        Nothing is written to disk.
+
+        Returns:
+            The patterns, as returned by :meth:`extract_patterns`.
         """
         logger.info("Starting pattern extraction from %s", self.input_dir)
-        documents = self._load_documents()
-        patterns = self.extract_patterns(documents)
-        self._write_patterns(patterns)
+        return self.extract_patterns(self._load_documents())
 
-    def extract_patterns(self, documents: List[str]) -> List[Dict[str, Any]]:
+    def extract_patterns(self, documents: List[Document]) -> List[Dict[str, Any]]:
         """Extract frequent lexical n-grams from *documents*.
 
         Args:
-            documents: List of raw text strings to analyse.
+            documents: Documents to analyse, as parsed :class:`Block`
+                lists or as raw text (split into paragraphs at blank
+                lines).
 
         Returns:
             A list of pattern dictionaries, each with ``pattern`` and
-            ``frequency`` keys, sorted by descending frequency.
+            ``frequency`` keys, sorted by descending frequency.  With an
+            :attr:`output_mode` of ``closed`` or ``maximal``, n-grams
+            subsumed by a longer frequent n-gram are left out (see
+            :func:`select_patterns`).  Both :attr:`engine` values return
+            the same patterns; only the order of equal-frequency patterns
+            may differ.
         """
-        ngrams_counter: Counter = Counter()
+        sentences = self._token_sequences(documents)
+        if self.engine == "suffix_array":
+            frequent = count_repeated_phrases(
+                list(sentences),
+                self.ngram_min,
+                self.ngram_max,
+                self.frequency_threshold,
+            )
+        else:
+            frequent = self._count_ngrams(sentences)
+
+        patterns = [
+            {"pattern": " ".join(gram), "frequency": freq}
+            for gram, freq in select_patterns(frequent, self.output_mode).items()
+        ]
 
+        result = sorted(patterns, key=lambda x: -x["frequency"])
+        logger.info("Extracted %d pattern(s) meeting frequency threshold", len(result))
+        return result
+
+    # ------------------------------------------------------------------
+    # Private helpers
+    # ------------------------------------------------------------------
+
+    def _token_sequences(self, documents: List[Document]) -> Iterator[List[str]]:
+        """Yield the token list of every sentence eligible for counting.
+
+        Sentences shorter than ``max(ngram_min, minimum_token_count)`` or
+        failing POS filtering are skipped.
+
+        Args:
+            documents: Block lists or raw text strings.
+
+        Yields:
+            Lower-cased token lists, split by the configured
+            :attr:`tokenizer`.
+        """
+        min_length = max(self.ngram_min, self.minimum_token_count)
         for doc in documents:
             for scope_text in self._split_scope(doc):
                 for sentence in nltk.sent_tokenize(scope_text):
-                    tokens = nltk.word_tokenize(sentence.lower())
-
-                    min_length = max(self.ngram_min, self.minimum_token_count)
+                    tokens = self._tokenize(sentence.lower())
                     if len(tokens) < min_length:
                         continue
 
@@ -130,70 +310,88 @@ class PatternExtractor:
                         ):
                             continue
 
-                    max_n = min(len(tokens), self.ngram_max)
-                    for n in range(self.ngram_min, max_n + 1):
-                        for gram in nltk.ngrams(tokens, n):
-                            ngrams_counter[" ".join(gram)] += 1
+                    yield tokens
 
-        patterns = [
-            {"pattern": ngram, "frequency": freq}
-            for ngram, freq in ngrams_counter.items()
-            if freq >= self.frequency_threshold
-        ]
+    def _count_ngrams(
+        self, sentences: Iterable[List[str]]
+    ) -> Dict[Tuple[str, ...], int]:
+        """Count every window of every length (the ``counter`` engine).
 
-        result = sorted(patterns, key=lambda x: -x["frequency"])
-        logger.info("Extracted %d pattern(s) meeting frequency threshold", len(result))
-        return result
+        Args:
+            sentences: Token lists to count n-grams in.
 
-    # ------------------------------------------------------------------
-    # Private helpers
-    # ------------------------------------------------------------------
+        Returns:
+            N-grams meeting :attr:`frequency_threshold`, keyed by token tuple.
+        """
+        ngrams_counter: Counter = Counter()
+        for tokens in sentences:
+            max_n = min(len(tokens), self.ngram_max)
+            for n in range(self.ngram_min, max_n + 1):
+                for gram in nltk.ngrams(tokens, n):
+                    ngrams_counter[gram] += 1
+
+        return {
+            gram: freq
+            for gram, freq in ngrams_counter.items()
+            if freq >= self.frequency_threshold
+        }
 
-    def _load_documents(self) -> List[str]:
-        """Read all files with the configured extension from *input_dir*.
+    def _load_documents(self) -> List[Iterable[Block]]:
+        """Read every file of the configured :attr:`file_types` from *input_dir*.
+
+        Files are found by
+        :class:`~pattern_language_miner.walker.DirectoryWalker` and
+        segmented into :class:`Block` objects by their parser in one pass,
+        so Markdown and HTML markup never reaches the tokenizer.  Files of
+        at least ``large_file_threshold`` bytes are not read here: their
+        blocks are produced when the document is iterated, chunk by chunk
+        for text and HTML (Markdown files are still read whole then).
 
         Returns:
-            A list of raw document strings.
+            One block list (or lazy block iterable) per document.
         """
-        docs: List[str] = []
-        for path in sorted(self.input_dir.rglob(f"*.{self.file_type}")):
+        docs: List[Iterable[Block]] = []
+        for path, content, parser in self.walker.walk():
+            if isinstance(content, ChunkedText):
+                logger.info(
+                    "Streaming large file %s (%d bytes)", path.name, content.size
+                )
+                docs.append(_StreamedDocument(parser, content))
+                continue
             try:
-                docs.append(path.read_text(encoding="utf-8"))
-            except OSError as exc:
-                logger.warning("Could not read %s: %s", path.name, exc)
+                docs.append(parser.extract_blocks(content))
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("Could not extract text from %s: %s", path.name, exc)
         logger.debug("Loaded %d document(s) from %s", len(docs), self.input_dir)
         return docs
 
-    def _split_scope(self, doc: str) -> List[str]:
+    def _split_scope(self, doc: Document) -> Iterator[str]:
         """Divide a document into analysis units based on :attr:`scope`.
 
-        Args:
-            doc: Full document text.
-
-        Returns:
-            A list of text segments to tokenise independently.
-        """
-        if self.scope == "line":
-            return [line for line in doc.splitlines() if line.strip()]
-        if self.scope == "sentence":
-            return nltk.sent_tokenize(doc)
-        if self.scope == "block":
-            return self._split_blocks(doc)
-        return [doc]
-
-    def _split_blocks(self, doc: str) -> List[str]:
-        """Split *doc* into paragraph blocks separated by blank lines.
+        Blocks whose kind is in :attr:`exclude_block_elements` are dropped
+        first.  Lines and sentences never span two blocks.  Units are
+        produced lazily, so line, sentence and per-element block scopes
+        hold one block of a streamed document in memory at a time.
 
         Args:
-            doc: Full document text.
+            doc: Document blocks, or raw text split at blank lines.
 
-        Returns:
-            A list of non-empty paragraph strings, or the whole document
-            wrapped in a list if ``"paragraph"`` is not in
-            :attr:`block_elements`.
+        Yields:
+            Text segments to tokenise independently.
         """
-        paragraphs = [p.strip() for p in doc.split("\n\n") if p.strip()]
-        return paragraphs if "paragraph" in self.block_elements else [doc]
+        if isinstance(doc, str):
+            doc = _TEXT_PARSER.iter_blocks(doc)
+        blocks = (b for b in doc if b.kind not in self.exclude_block_elements)
+        if self.scope == "line":
+            for b in blocks:
+                yield from (line for line in b.text.splitlines() if line.strip())
+        elif self.scope == "sentence":
+            for b in blocks:
+                yield from nltk.sent_tokenize(b.text)
+        elif self.scope == "block" and self.block_elements:
+            yield from (b.text for b in blocks if b.kind in self.block_elements)
+        else:
+            yield "\n\n".join(b.text for b in blocks)
 
     def _write_patterns(self, patterns: List[Dict[str, Any]]) -> None:
         """Write each pattern to its own YAML file in :attr:`output_dir`.
@@ -0,0 +1,161 @@
+"""Suffix-array n-gram counting.
+
+Provides :func:`count_repeated_phrases`, the ``suffix_array`` extraction
+engine.  Instead of enumerating every window of every length per sentence
+(``O(tokens * ngram_max)`` dictionary updates), the tokenised corpus is
+concatenated into one integer sequence, suffix-sorted, and scanned once:
+
+1. :func:`suffix_array` sorts all suffixes by prefix doubling, vectorised
+   with NumPy, stopping as soon as suffixes are distinguished up to the
+   longest phrase of interest.
+2. :func:`lcp_array` derives the longest common prefix of neighbouring
+   suffixes from the doubling ranks.
+3. A single stack pass over the LCP array enumerates *LCP intervals*: every
+   run of suffixes sharing a prefix.  An interval of ``k`` suffixes with
+   LCP ``l`` whose enclosing interval has LCP ``p`` stands for the phrases
+   of lengths ``p + 1 .. l`` that occur exactly ``k`` times.
+
+Each sentence ends in its own unique sentinel, so no phrase crosses a
+sentence boundary and the counts match the ``counter`` engine exactly.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def suffix_array(ids: np.ndarray, max_length: int | None = None) -> Tuple[np.ndarray, List[np.ndarray]]:
+    """Sort the suffixes of *ids* by prefix doubling.
+
+    Args:
+        ids: Non-negative integer sequence.
+        max_length: Stop once suffixes are ordered by their first
+            *max_length* symbols; ``None`` sorts them completely.
+
+    Returns:
+        A 2-tuple ``(sa, ranks)``.  *sa* lists suffix start positions in
+        sorted order.  ``ranks[j][i]`` is the rank of the length-``2**j``
+        prefix of suffix *i* (equal prefixes share a rank).
+    """
+    n = len(ids)
+    rank = np.unique(ids, return_inverse=True)[1].astype(np.int64).ravel()
+    ranks = [rank]
+    sa = np.argsort(rank, kind="stable")
+    k = 1
+    while n and rank.max() < n - 1 and (max_length is None or k < max_length):
+        second = np.full(n, -1, dtype=np.int64)
+        second[: n - k] = rank[k:]
+        sa = np.lexsort((second, rank))
+        changed = np.empty(n, dtype=bool)
+        changed[0] = False
+        changed[1:] = (rank[sa[1:]] != rank[sa[:-1]]) | (second[sa[1:]] != second[sa[:-1]])
+        rank = np.empty(n, dtype=np.int64)
+        rank[sa] = np.cumsum(changed)
+        ranks.append(rank)
+        k *= 2
+    return sa, ranks
+
+
+def lcp_array(sa: np.ndarray, ranks: List[np.ndarray]) -> np.ndarray:
+    """Return ``lcp[i] = LCP(suffix sa[i-1], suffix sa[i])`` (``lcp[0] = 0``).
+
+    Computed for all neighbours at once by binary lifting over the doubling
+    ranks, so the result is capped at ``2 ** len(ranks) - 1``.
+    """
+    n = len(sa)
+    lcp = np.zeros(n, dtype=np.int64)
+    if n < 2:
+        return lcp
+    left, right = sa[:-1], sa[1:]
+    common = np.zeros(n - 1, dtype=np.int64)
+    for level in range(len(ranks) - 1, -1, -1):
+        step = 1 << level
+        a, b = left + common, right + common
+        ok = (a < n) & (b < n)
+        rank = ranks[level]
+        ok[ok] = rank[a[ok]] == rank[b[ok]]
+        common += ok * step
+    lcp[1:] = common
+    return lcp
+
+
+def count_repeated_phrases(
+    sentences: Sequence[Sequence[str]],
+    ngram_min: int,
+    ngram_max: int,
+    frequency_threshold: int,
+) -> Dict[Tuple[str, ...], int]:
+    """Count every phrase of *ngram_min*..*ngram_max* tokens meeting the threshold.
+
+    Args:
+        sentences: Token lists; phrases never span two of them.
+        ngram_min: Shortest phrase length.
+        ngram_max: Longest phrase length.
+        frequency_threshold: Minimum number of occurrences.
+
+    Returns:
+        Frequent phrases keyed by token tuple, as the ``counter`` engine
+        produces them (iteration order may differ).
+    """
+    vocab: Dict[str, int] = {}
+    ids: List[int] = []
+    for sentence in sentences:
+        ids.extend(vocab.setdefault(token, len(vocab)) for token in sentence)
+        ids.append(-1)
+    if not ids:
+        return {}
+    seq = np.asarray(ids, dtype=np.int64)
+    boundaries = np.flatnonzero(seq < 0)
+    # Unique sentinels above every token id keep phrases within a sentence.
+    seq[boundaries] = len(vocab) + np.arange(len(boundaries))
+    tokens = [None] * len(vocab)
+    for token, idx in vocab.items():
+        tokens[idx] = token
+
+    sa, ranks = suffix_array(seq, max_length=ngram_max)
+    lcp = np.minimum(lcp_array(sa, ranks), ngram_max)
+    logger.debug("Suffix array built over %d symbol(s).", len(seq))
+
+    seq_list = seq.tolist()
+    sa_list = sa.tolist()
+    counts: Dict[Tuple[str, ...], int] = {}
+
+    def emit(start: int, lengths: range, freq: int) -> None:
+        for length in lengths:
+            counts[tuple(tokens[t] for t in seq_list[start:start + length])] = freq
+
+    # Stack pass over LCP intervals: (lcp, left bound).
+    stack: List[Tuple[int, int]] = [(0, 0)]
+    lcp_list = lcp.tolist() + [0]
+    n = len(sa_list)
+    for i in range(1, n + 1):
+        h = lcp_list[i] if i < n else 0
+        left = i - 1
+        while h < stack[-1][0]:
+            value, left = stack.pop()
+            parent = max(h, stack[-1][0])
+            freq = i - left
+            if freq >= frequency_threshold:
+                emit(sa_list[left], range(max(parent + 1, ngram_min), value + 1), freq)
+        if h > stack[-1][0]:
+            stack.append((h, left))
+
+    if frequency_threshold <= 1:
+        # Phrases occurring once extend past the LCP with both neighbours.
+        remaining = _distance_to_sentinel(seq, boundaries)
+        shared = np.maximum(lcp, np.append(lcp[1:], 0))
+        for i, start in enumerate(sa_list):
+            longest = min(int(remaining[start]), ngram_max)
+            emit(start, range(max(int(shared[i]) + 1, ngram_min), longest + 1), 1)
+    return counts
+
+
+def _distance_to_sentinel(seq: np.ndarray, boundaries: np.ndarray) -> np.ndarray:
+    """Return, per position, the number of tokens before the next sentinel."""
+    next_boundary = boundaries[np.searchsorted(boundaries, np.arange(len(seq)))]
+    return next_boundary - np.arange(len(seq))
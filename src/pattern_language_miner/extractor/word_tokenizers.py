@@ -0,0 +1,102 @@
+"""Word tokenizers selectable through the ``tokenizer`` config option.
+
+- ``nltk``: :func:`nltk.word_tokenize`, the Penn Treebank rules.  The most
+  faithful option and the slowest: it re-runs sentence splitting and a
+  dozen regex substitutions per sentence.
+- ``regex``: :func:`regex_tokenize`, a single precompiled pattern that
+  reproduces the Treebank splits that matter for n-gram counting
+  (punctuation, contractions and possessives) in one ``findall`` call.
+- ``rust``: the ``BertPreTokenizer`` from Hugging Face ``tokenizers``,
+  implemented in Rust.  The package ships with ``sentence-transformers``.
+
+The three agree on plain prose.  Where they differ:
+
+- Contractions and possessives: ``nltk`` and ``regex`` give ``do n't`` and
+  ``it 's``; ``rust`` gives ``don ' t`` and ``it ' s``.
+- Double quotes: ``nltk`` rewrites them as Treebank opening and closing
+  quotes (two backticks, two apostrophes); the others keep ``"``.
+- Abbreviations: ``nltk`` keeps ``e.g.`` whole; ``regex`` gives ``e.g .``
+  and ``rust`` gives ``e . g .``.
+- Numbers, versions and ellipses (``1,000``, ``v1.2-beta``, ``...``) stay
+  whole with ``nltk`` and ``regex``; ``rust`` splits every punctuation
+  mark.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+from typing import Callable, List
+
+import nltk
+
+logger = logging.getLogger(__name__)
+
+#: Splits a sentence into word tokens.
+Tokenizer = Callable[[str], List[str]]
+
+#: Values accepted by the ``tokenizer`` config option.
+TOKENIZERS: frozenset[str] = frozenset({"nltk", "regex", "rust"})
+
+_TOKEN_RE = re.compile(
+    r"""
+    \w+(?=n't\b)                    # "do" of "don't"
+    | n't\b                         # negation clitic
+    | '(?:s|re|ve|ll|d|m)\b         # possessive and verb clitics
+    | \w+(?:[-.,/]\w+)*             # words, numbers, hyphenated compounds
+    | \.\.\.                        # ellipsis
+    | [^\w\s]                       # any other punctuation mark
+    """,
+    re.VERBOSE | re.IGNORECASE,
+)
+
+
+def regex_tokenize(text: str) -> List[str]:
+    """Split *text* into Treebank-like word tokens with one regex pass.
+
+    Example:
+        >>> regex_tokenize("Don't install v1.2-beta, it's broken.")
+        ['Do', "n't", 'install', 'v1.2-beta', ',', 'it', "'s", 'broken', '.']
+    """
+    return _TOKEN_RE.findall(text)
+
+
+def _rust_tokenizer() -> Tokenizer:
+    try:
+        from tokenizers.pre_tokenizers import BertPreTokenizer
+    except ImportError as exc:
+        raise ImportError(
+            "The 'rust' tokenizer requires the 'tokenizers' package "
+            "(pip install tokenizers)."
+        ) from exc
+    pre_tokenizer = BertPreTokenizer()
+
+    def tokenize(text: str) -> List[str]:
+        return [token for token, _ in pre_tokenizer.pre_tokenize_str(text)]
+
+    return tokenize
+
+
+def get_tokenizer(name: str) -> Tokenizer:
+    """Return the word tokenizer registered as *name*.
+
+    Args:
+        name: One of :data:`TOKENIZERS`.
+
+    Returns:
+        A callable mapping a sentence to its tokens.
+
+    Raises:
+        ValueError: If *name* is not recognised.
+        ImportError: If ``rust`` is requested without ``tokenizers``.
+    """
+    if name == "nltk":
+        return nltk.word_tokenize
+    if name == "regex":
+        return regex_tokenize
+    if name == "rust":
+        return _rust_tokenizer()
+    raise ValueError(
+        f"Unsupported tokenizer {name!r}. "
+        f"Choose from: {', '.join(sorted(TOKENIZERS))}"
+    )
@@ -1,12 +1,19 @@
 """Parser sub-package.
 
-Provides :class:`BaseParser` and concrete implementations for
-text, Markdown, and HTML documents.
+Provides :class:`BaseParser`, concrete implementations for text, Markdown,
+and HTML documents, and the :class:`Block` segments they extract.
 """
 
-from .base_parser import BaseParser
+from .base_parser import BLOCK_KINDS, BaseParser, Block
 from .html_parser import HTMLParser
 from .markdown_parser import MarkdownParser
 from .text_parser import TextParser
 
-__all__ = ["BaseParser", "HTMLParser", "MarkdownParser", "TextParser"]
+__all__ = [
+    "BLOCK_KINDS",
+    "BaseParser",
+    "Block",
+    "HTMLParser",
+    "MarkdownParser",
+    "TextParser",
+]
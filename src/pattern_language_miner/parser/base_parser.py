@@ -1,6 +1,70 @@
-"""Abstract base class for all document parsers."""
+"""Abstract base class for all document parsers.
+
+Also defines :class:`Block`, the unit of document structure that parsers
+produce for block-scoped extraction.
+"""
 
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Iterable, Iterator, List, Sequence
+
+from ..utils.chunked_reader import iter_paragraphs
+
+#: Kinds of :class:`Block`; values accepted by ``block_elements`` and
+#: ``exclude_block_elements``.
+BLOCK_KINDS: frozenset[str] = frozenset(
+    {"blockquote", "code", "heading", "list", "ordered_list", "paragraph", "table"}
+)
+
+_HEADINGS = frozenset({"h1", "h2", "h3", "h4", "h5", "h6"})
+
+
+@dataclass(frozen=True)
+class Block:
+    """One block-level text segment of a parsed document.
+
+    Attributes:
+        kind: Structural kind, one of :data:`BLOCK_KINDS`.
+        text: Text of the block with markup removed.
+        tag: HTML element the block came from (``"p"``, ``"li"``, ...),
+            or ``""`` for plain text.
+    """
+
+    kind: str
+    text: str
+    tag: str = ""
+
+
+def block_kind(open_tags: Sequence[str]) -> str:
+    """Classify text by the HTML elements enclosing it.
+
+    The innermost structural element decides: a paragraph inside a list
+    item is ``"list"``, a code block inside a quote is ``"code"``.
+
+    Args:
+        open_tags: Names of the enclosing elements, outermost first.
+
+    Returns:
+        One of :data:`BLOCK_KINDS`; ``"paragraph"`` if nothing else fits.
+    """
+    for depth in range(len(open_tags) - 1, -1, -1):
+        tag = open_tags[depth]
+        if tag == "pre":
+            return "code"
+        if tag in _HEADINGS:
+            return "heading"
+        if tag in ("td", "th"):
+            return "table"
+        if tag == "li":
+            parent = next(
+                (t for t in reversed(open_tags[:depth]) if t in ("ol", "ul")), "ul"
+            )
+            return "ordered_list" if parent == "ol" else "list"
+        if tag in ("dt", "dd"):
+            return "list"
+        if tag == "blockquote":
+            return "blockquote"
+    return "paragraph"
 
 
 class BaseParser(ABC):
@@ -22,3 +86,51 @@ class BaseParser(ABC):
             parser variant, plus additional payload keys defined by each
             concrete implementation.
         """
+
+    def extract_text(self, content: str) -> str:
+        """Return the readable text of *content* with markup removed.
+
+        Block-level elements (paragraphs, headings, list items, ...) are
+        separated by a blank line so that line and block scoping still see
+        the document structure.  The default implementation returns
+        *content* unchanged; parsers for markup formats override it.
+
+        Args:
+            content: The raw text content read from a file.
+
+        Returns:
+            Plain text suitable for tokenisation.
+        """
+        return content
+
+    def extract_blocks(self, content: str) -> List[Block]:
+        """Split *content* into its block-level segments in document order.
+
+        Args:
+            content: The raw text content read from a file.
+
+        Returns:
+            The non-empty blocks of the document; see :meth:`iter_blocks`.
+        """
+        return list(self.iter_blocks(content))
+
+    def iter_blocks(self, content: str | Iterable[str]) -> Iterator[Block]:
+        """Yield the block-level segments of *content* incrementally.
+
+        The default implementation treats text separated by blank lines as
+        paragraphs and consumes chunked input (such as a
+        :class:`~pattern_language_miner.utils.chunked_reader.ChunkedText`)
+        piece by piece, so memory stays bounded.  Parsers for markup
+        formats override it to report headings, list items, table cells
+        and code blocks; not all of them can stream (Markdown joins the
+        chunks first).
+
+        Args:
+            content: The whole document, or an iterable of text chunks.
+
+        Yields:
+            Non-empty :class:`Block` objects.
+        """
+        chunks = [content] if isinstance(content, str) else content
+        for paragraph in iter_paragraphs(chunks):
+            yield Block("paragraph", paragraph)
@@ -1,20 +1,111 @@
-"""HTML document parser."""
+"""HTML document parser.
+
+:class:`HTMLParser` offers two ways in:
+
+- :meth:`HTMLParser.parse` builds a BeautifulSoup tree.
+- :meth:`HTMLParser.iter_blocks`, used for text extraction, streams the
+  document through an event-based parser and yields block-level text
+  segments as soon as they close, without building a tree.
+
+Both use the parser's backend: the standard library's ``html.parser`` or
+the much faster ``lxml``, whose feed parser reports the same events.
+"""
+
+from html.parser import HTMLParser as _EventParser
+from typing import Iterable, Iterator, List
 
 from bs4 import BeautifulSoup
 
-from .base_parser import BaseParser
+from .base_parser import BaseParser, Block, block_kind
+
+#: Backends accepted by :class:`HTMLParser`.
+HTML_BACKENDS: frozenset[str] = frozenset({"html.parser", "lxml"})
+
+#: Elements whose text forms a separate block in extracted text.
+BLOCK_TAGS: frozenset[str] = frozenset(
+    {
+        "address",
+        "article",
+        "aside",
+        "blockquote",
+        "dd",
+        "div",
+        "dt",
+        "figcaption",
+        "footer",
+        "h1",
+        "h2",
+        "h3",
+        "h4",
+        "h5",
+        "h6",
+        "header",
+        "li",
+        "main",
+        "nav",
+        "p",
+        "pre",
+        "section",
+        "td",
+        "th",
+        "tr",
+    }
+)
+
+#: Elements that only group other blocks (lists, tables, ...).
+CONTAINER_TAGS: frozenset[str] = frozenset(
+    {"body", "dl", "hr", "html", "ol", "table", "tbody", "tfoot", "thead", "ul"}
+)
+
+#: Elements whose content is never document text.  Each must be closed
+#: by its end tag.  ``<head>`` is handled separately because HTML5 lets
+#: its end tag be omitted.
+SKIPPED_TAGS: frozenset[str] = frozenset(
+    {"noscript", "script", "style", "template", "title"}
+)
+
+#: Characters fed to the event parser at a time when streaming a string.
+_CHUNK_SIZE = 1 << 16
 
 
 class HTMLParser(BaseParser):
-    """Parse HTML files using BeautifulSoup and return a normalised payload.
+    """Parse HTML files with BeautifulSoup or stream their text blocks.
+
+    Args:
+        backend: Parser behind both :meth:`parse` and :meth:`iter_blocks`,
+            one of :data:`HTML_BACKENDS`.  ``lxml`` needs the ``lxml``
+            package.  Note that ``lxml`` wraps fragments in
+            ``<html><body>``.
+
+    Raises:
+        ValueError: If *backend* is not recognised.
+        ImportError: If ``lxml`` is requested but not installed.
 
     Example:
         >>> parser = HTMLParser()
         >>> result = parser.parse("<p>Hello</p>")
         >>> result["type"]
         'html'
+        >>> [b.text for b in parser.iter_blocks("<h1>Title</h1><p>Hi <b>you</b></p>")]
+        ['Title', 'Hi you']
     """
 
+    def __init__(self, backend: str = "html.parser") -> None:
+        if backend not in HTML_BACKENDS:
+            raise ValueError(
+                f"Unsupported backend {backend!r}. "
+                f"Choose from: {', '.join(sorted(HTML_BACKENDS))}"
+            )
+        if backend == "lxml":
+            try:
+                import lxml  # noqa: F401
+            except ImportError as exc:
+                raise ImportError(
+                    "The 'lxml' backend requires the 'lxml' package "
+                    "(pip install lxml)."
+                ) from exc
+        self.backend = backend
+
     def parse(self, content: str) -> dict:
         """Normalise raw HTML content with BeautifulSoup.
 
@@ -27,8 +118,174 @@ class HTMLParser(BaseParser):
             - ``type`` (*str*): Always ``"html"``.
             - ``html`` (*str*): The normalised HTML string.
         """
-        soup = BeautifulSoup(content, "html.parser")
+        soup = BeautifulSoup(content, self.backend)
         return {
             "type": "html",
             "html": str(soup),
         }
+
+    def extract_text(self, content: str) -> str:
+        """Return the visible text of an HTML document.
+
+        Args:
+            content: Raw HTML source text.
+
+        Returns:
+            Text with tags, scripts and styles removed and one blank line
+            between block-level elements.
+        """
+        return "\n\n".join(block.text for block in self.iter_blocks(content))
+
+    def iter_blocks(self, content: str | Iterable[str]) -> Iterator[Block]:
+        """Stream the block-level text segments of an HTML document.
+
+        Paragraphs, headings, list items, table cells and the like each
+        become one :class:`Block`.  Whitespace is collapsed except inside
+        ``<pre>``; scripts, styles and ``<head>`` are dropped.  Unclosed
+        blocks end where the next block starts, and an unclosed ``<head>``
+        where ``<body>`` or any block element starts, as in browsers.
+
+        Args:
+            content: The whole document, or an iterable of text chunks
+                (e.g. from a file read incrementally).  Segments are
+                yielded as soon as the chunks that close them are fed.
+
+        Yields:
+            Blocks whose :attr:`Block.tag` is the innermost block element
+            containing the text, or ``"body"`` for loose text.
+        """
+        chunks = content
+        if isinstance(content, str):
+            chunks = (
+                content[i:i + _CHUNK_SIZE] for i in range(0, len(content), _CHUNK_SIZE)
+            )
+        collector = _LxmlCollector() if self.backend == "lxml" else _BlockCollector()
+        for chunk in chunks:
+            collector.feed(chunk)
+            yield from collector.drain()
+        collector.close()
+        yield from collector.drain()
+
+
+class _BlockBuilder:
+    """Turn tag events into :class:`Block` objects.
+
+    The method names follow lxml's parser-target interface, so an instance
+    can be handed to ``lxml.etree.HTMLParser(target=...)`` directly.
+    """
+
+    def __init__(self) -> None:
+        self.open_blocks: List[str] = []
+        self.skip_depth = 0
+        self.in_head = False
+        self.buffer: List[str] = []
+        self.ready: List[Block] = []
+
+    def drain(self) -> List[Block]:
+        ready, self.ready = self.ready, []
+        return ready
+
+    def start(self, tag: str, attrs: object = None) -> None:
+        if tag == "head":
+            self.in_head = True
+        elif tag != "html" and (tag in BLOCK_TAGS or tag in CONTAINER_TAGS):
+            # Body content implicitly ends an unclosed <head>.
+            self.in_head = False
+        if tag in SKIPPED_TAGS:
+            self.skip_depth += 1
+        elif tag == "br":
+            self.buffer.append("\n")
+        elif tag in BLOCK_TAGS or tag in CONTAINER_TAGS:
+            self.flush()
+            # Any block start implicitly closes an open paragraph.
+            if self.open_blocks and self.open_blocks[-1] == "p":
+                self.open_blocks.pop()
+            self.open_blocks.append(tag)
+
+    def start_end(self, tag: str) -> None:
+        if tag == "br":
+            self.buffer.append("\n")
+        elif tag in BLOCK_TAGS or tag in CONTAINER_TAGS:
+            self.flush()
+
+    def end(self, tag: str) -> None:
+        if tag == "head":
+            self.in_head = False
+        elif tag in SKIPPED_TAGS:
+            self.skip_depth = max(self.skip_depth - 1, 0)
+        elif tag in BLOCK_TAGS or tag in CONTAINER_TAGS:
+            self.flush()
+            if tag in self.open_blocks:
+                while self.open_blocks.pop() != tag:
+                    pass
+
+    def data(self, data: str) -> None:
+        if not self.skip_depth and not self.in_head:
+            self.buffer.append(data)
+
+    def close(self) -> None:
+        self.flush()
+
+    def flush(self) -> None:
+        text = "".join(self.buffer)
+        self.buffer = []
+        element = next(
+            (tag for tag in reversed(self.open_blocks) if tag in BLOCK_TAGS), "body"
+        )
+        if element == "pre":
+            text = text.strip("\n")
+        else:
+            text = " ".join(text.split())
+        if text.strip():
+            self.ready.append(Block(block_kind(self.open_blocks), text, element))
+
+
+class _BlockCollector(_EventParser):
+    """Stream chunks through :mod:`html.parser` into a :class:`_BlockBuilder`."""
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.blocks = _BlockBuilder()
+
+    def drain(self) -> List[Block]:
+        return self.blocks.drain()
+
+    def close(self) -> None:
+        super().close()
+        self.blocks.close()
+
+    def handle_starttag(self, tag: str, attrs: list) -> None:
+        self.blocks.start(tag)
+
+    def handle_startendtag(self, tag: str, attrs: list) -> None:
+        self.blocks.start_end(tag)
+
+    def handle_endtag(self, tag: str) -> None:
+        self.blocks.end(tag)
+
+    def handle_data(self, data: str) -> None:
+        self.blocks.data(data)
+
+
+class _LxmlCollector:
+    """Stream chunks through lxml's feed parser into a :class:`_BlockBuilder`."""
+
+    def __init__(self) -> None:
+        from lxml import etree
+
+        self.blocks = _BlockBuilder()
+        self._parser = etree.HTMLParser(target=self.blocks)
+        self._fed = False
+
+    def feed(self, chunk: str) -> None:
+        if chunk:
+            self._parser.feed(chunk)
+            self._fed = True
+
+    def drain(self) -> List[Block]:
+        return self.blocks.drain()
+
+    def close(self) -> None:
+        # lxml rejects closing a parser that was never fed.
+        if self._fed:
+            self._parser.close()
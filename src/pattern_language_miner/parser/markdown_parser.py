@@ -1,27 +1,68 @@
 """Markdown document parser."""
 
+import html
+import re
+import threading
+import xml.etree.ElementTree as etree
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
 import markdown
 from bs4 import BeautifulSoup
+from markdown import util
+
+from .base_parser import BaseParser, Block, block_kind
+from .html_parser import BLOCK_TAGS, CONTAINER_TAGS
 
-from .base_parser import BaseParser
+_TAG = re.compile(r"<[^>]*>")
+_STASH_PLACEHOLDER = re.compile(util.HTML_PLACEHOLDER % r"(\d+)")
 
 
 class MarkdownParser(BaseParser):
-    """Convert Markdown files to an HTML representation via BeautifulSoup.
+    """Convert Markdown files to HTML, plain text or text blocks.
+
+    :meth:`parse` returns the HTML rendered by the ``markdown`` library
+    as is; pass ``normalize_html=True`` to re-serialise it through
+    BeautifulSoup as earlier versions did.  :meth:`extract_text` and
+    :meth:`extract_blocks` read the element tree that Python-Markdown
+    builds internally and never serialise or re-parse HTML.
 
-    The parser converts Markdown syntax to HTML using the ``markdown``
-    library, then normalises it with BeautifulSoup before returning the
-    result.
+    One :class:`markdown.Markdown` converter is built per parser, so
+    extensions are loaded once rather than per document.  The converter
+    keeps per-document state, so conversions are serialised with a lock
+    and the parser can be shared between threads.
+
+    Args:
+        extensions: Python-Markdown extensions to enable, e.g.
+            ``["tables", "fenced_code"]``.
+        extension_configs: Per-extension settings passed to
+            :class:`markdown.Markdown`.
+        normalize_html: Round-trip the rendered HTML through
+            BeautifulSoup in :meth:`parse`.
 
     Example:
         >>> parser = MarkdownParser()
         >>> result = parser.parse("# Hello")
         >>> result["type"]
         'markdown'
+        >>> [b.kind for b in parser.extract_blocks("# Hello\\n\\n- item")]
+        ['heading', 'list']
     """
 
+    def __init__(
+        self,
+        extensions: Optional[Iterable[Any]] = None,
+        extension_configs: Optional[Dict[str, Dict[str, Any]]] = None,
+        normalize_html: bool = False,
+    ) -> None:
+        self._markdown = markdown.Markdown(
+            extensions=list(extensions or []),
+            extension_configs=extension_configs or {},
+        )
+        self._lock = threading.Lock()
+        self.normalize_html = normalize_html
+
     def parse(self, content: str) -> dict:
-        """Convert Markdown content to a normalised HTML string.
+        """Convert Markdown content to an HTML string.
 
         Args:
             content: Raw Markdown source text.
@@ -30,11 +71,138 @@ class MarkdownParser(BaseParser):
             A dictionary with keys:
 
             - ``type`` (*str*): Always ``"markdown"``.
-            - ``html`` (*str*): The rendered, normalised HTML string.
+            - ``html`` (*str*): The rendered HTML string.
         """
-        html = markdown.markdown(content)
-        soup = BeautifulSoup(html, "html.parser")
+        rendered = self.render(content)
+        if self.normalize_html:
+            rendered = str(BeautifulSoup(rendered, "html.parser"))
         return {
             "type": "markdown",
-            "html": str(soup),
+            "html": rendered,
         }
+
+    def extract_text(self, content: str) -> str:
+        """Return the text of a Markdown document without markup.
+
+        Args:
+            content: Raw Markdown source text.
+
+        Returns:
+            Rendered text with one blank line between blocks.
+        """
+        return "\n\n".join(block.text for block in self.extract_blocks(content))
+
+    def extract_blocks(self, content: str) -> List[Block]:
+        """Split a Markdown document into its block-level text segments.
+
+        Paragraphs, headings, list items, table cells, code blocks and
+        the like each become one :class:`Block`, in document order, in a
+        single walk over the element tree.  Text of a list item that
+        contains a nested list precedes the nested items.
+
+        Args:
+            content: Raw Markdown source text.
+
+        Returns:
+            The non-empty blocks; :attr:`Block.tag` is the HTML element
+            the block renders to (``"p"``, ``"h2"``, ``"li"``, ``"pre"``, ...).
+        """
+        with self._lock:
+            root = self._element_tree(content)
+            stash = self._markdown.htmlStash.rawHtmlBlocks
+            return [block for block in _iter_blocks(root, stash, []) if block.text]
+
+    def iter_blocks(self, content: str | Iterable[str]) -> Iterator[Block]:
+        """Yield the blocks of a Markdown document.
+
+        Markdown block structure depends on the whole document (e.g. link
+        references, or list items continued after a blank line), so
+        chunked input is joined before parsing and a large file is held in
+        memory in full.
+        """
+        if not isinstance(content, str):
+            content = "".join(content)
+        yield from self.extract_blocks(content)
+
+    def render(self, content: str) -> str:
+        """Render *content* to HTML with the shared converter.
+
+        Args:
+            content: Raw Markdown source text.
+
+        Returns:
+            The HTML produced by Python-Markdown.
+        """
+        with self._lock:
+            return self._markdown.reset().convert(content)
+
+    def _element_tree(self, content: str) -> etree.Element:
+        """Run Python-Markdown up to, but not including, serialisation.
+
+        Mirrors :meth:`markdown.Markdown.convert`: preprocessors, the block
+        parser and all tree processors.  Must be called with the lock held;
+        the converter's HTML stash stays valid until the next call.
+        """
+        md = self._markdown.reset()
+        lines = content.split("\n")
+        for preprocessor in md.preprocessors:
+            lines = preprocessor.run(lines)
+        root = md.parser.parseDocument(lines).getroot()
+        for treeprocessor in md.treeprocessors:
+            new_root = treeprocessor.run(root)
+            if new_root is not None:
+                root = new_root
+        return root
+
+
+def _iter_blocks(
+    element: etree.Element, stash: List[Any], open_tags: List[str]
+) -> Iterator[Block]:
+    """Yield a :class:`Block` per block child of *element*, depth first."""
+    for child in element:
+        if child.tag not in BLOCK_TAGS and child.tag not in CONTAINER_TAGS:
+            continue
+        parts = [child.text or ""]
+        nested = []
+        for sub in child:
+            if sub.tag in BLOCK_TAGS or sub.tag in CONTAINER_TAGS:
+                nested.append(sub)
+            else:
+                parts.append(_inline_text(sub))
+            parts.append(sub.tail or "")
+        tags = open_tags + [child.tag]
+        yield Block(block_kind(tags), _restore("".join(parts), stash), child.tag)
+        if nested:
+            yield from _iter_blocks(child, stash, tags)
+
+
+def _inline_text(element: etree.Element) -> str:
+    """Return the text of an inline element.
+
+    Code spans and code blocks hold their text HTML-escaped (the
+    serialiser would emit it as is), so it is unescaped here.  A line
+    break adds a newline only when its tail does not already start with
+    one, so a paragraph never gains a blank line.
+    """
+    if element.tag == "br":
+        return "" if (element.tail or "").startswith("\n") else "\n"
+    if element.tag == "code":
+        return html.unescape("".join(element.itertext()))
+    parts = [element.text or ""]
+    for sub in element:
+        parts.append(_inline_text(sub))
+        parts.append(sub.tail or "")
+    return "".join(parts)
+
+
+def _restore(text: str, stash: List[Any]) -> str:
+    """Replace Python-Markdown placeholders in *text* with readable text."""
+
+    def unstash(match: re.Match) -> str:
+        raw = stash[int(match.group(1))]
+        if isinstance(raw, str):
+            return html.unescape(_TAG.sub("", raw))
+        return "".join(raw.itertext())
+
+    text = _STASH_PLACEHOLDER.sub(unstash, text)
+    return text.replace(util.AMP_SUBSTITUTE, "&").strip()
@@ -1,15 +1,30 @@
 """Pipeline sub-package.
 
 Provides the :class:`~pattern_language_miner.pipeline.pipeline.Pipeline`
-orchestrator and the :class:`~pattern_language_miner.pipeline.events.PipelineEvent`
-Observer infrastructure.
+orchestrator, the :class:`~pattern_language_miner.pipeline.events.PipelineEvent`
+Observer infrastructure, and the concrete steps in
+:mod:`~pattern_language_miner.pipeline.steps` used by ``run-all``.
 """
 
 from .events import EventBus, PipelineEvent, PipelineEventType
 from .pipeline import Pipeline, PipelineStep
+from .steps import (
+    AnalyzeStep,
+    ClusterStep,
+    DedupStep,
+    EnrichStep,
+    ExportStep,
+    GenerateStep,
+)
 
 __all__ = [
+    "AnalyzeStep",
+    "ClusterStep",
+    "DedupStep",
+    "EnrichStep",
     "EventBus",
+    "ExportStep",
+    "GenerateStep",
     "Pipeline",
     "PipelineEvent",
     "PipelineEventType",
@@ -20,6 +20,7 @@ Example:
 from __future__ import annotations
 
 import logging
+import threading
 from collections import defaultdict
 from dataclasses import dataclass, field
 from enum import Enum, auto
@@ -60,6 +61,10 @@ class EventBus:
     When an event is published, all registered handlers for that type are
     invoked in registration order.
 
+    The bus is thread-safe: subscription and publication are guarded by a
+    re-entrant lock, so handlers never run concurrently with each other
+    and may themselves publish events.
+
     Example:
         >>> bus = EventBus()
         >>> events = []
@@ -73,6 +78,7 @@ class EventBus:
         self._handlers: Dict[
             PipelineEventType, List[Callable[[PipelineEvent], None]]
         ] = defaultdict(list)
+        self._lock = threading.RLock()
 
     def subscribe(
         self,
@@ -85,7 +91,8 @@ class EventBus:
             event_type: The event type to listen for.
             handler: A callable that accepts a :class:`PipelineEvent`.
         """
-        self._handlers[event_type].append(handler)
+        with self._lock:
+            self._handlers[event_type].append(handler)
         logger.debug("Subscribed %s to %s.", handler, event_type)
 
     def publish(self, event: PipelineEvent) -> None:
@@ -97,13 +104,14 @@ class EventBus:
         Args:
             event: The event to broadcast.
         """
-        for handler in self._handlers.get(event.event_type, []):
-            try:
-                handler(event)
-            except Exception as exc:  # noqa: BLE001
-                logger.warning(
-                    "Handler %s raised an exception for %s: %s",
-                    handler,
-                    event.event_type,
-                    exc,
-                )
+        with self._lock:
+            for handler in list(self._handlers.get(event.event_type, [])):
+                try:
+                    handler(event)
+                except Exception as exc:  # noqa: BLE001
+                    logger.warning(
+                        "Handler %s raised an exception for %s: %s",
+                        handler,
+                        event.event_type,
+                        exc,
+                    )
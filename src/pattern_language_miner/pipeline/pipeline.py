@@ -4,6 +4,8 @@ Design Patterns
 ---------------
 - **Chain of Responsibility** — :class:`Pipeline` executes a sequence of
   :class:`PipelineStep` objects, each responsible for one transformation.
+  Steps that declare the context keys they read and write can instead be
+  scheduled as a dependency graph, running independent steps concurrently.
 - **Observer** — progress events are broadcast via an :class:`EventBus` so
   that callers can react without polluting step logic.
 - **Template Method** — :class:`PipelineStep` defines the contract; concrete
@@ -31,7 +33,9 @@ from __future__ import annotations
 
 import logging
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
 
 from .events import EventBus, PipelineEvent, PipelineEventType
 
@@ -48,11 +52,22 @@ class PipelineStep(ABC):
 
     The *context* dict is a shared mutable namespace that propagates state
     between consecutive steps.
+
+    To take part in concurrent execution a step also declares which
+    context keys it reads (:attr:`depends_on`) and writes
+    (:attr:`outputs`).  Steps that leave either as ``None`` are treated as
+    reading and writing everything, and so always run on their own.
     """
 
     #: Human-readable name shown in logs and events.
     name: str = "unnamed_step"
 
+    #: Context keys read by :meth:`run`; ``None`` if undeclared.
+    depends_on: Optional[Tuple[str, ...]] = None
+
+    #: Context keys written by :meth:`run`; ``None`` if undeclared.
+    outputs: Optional[Tuple[str, ...]] = None
+
     @abstractmethod
     def run(self, context: Dict[str, Any]) -> Dict[str, Any]:
         """Execute the step and return the (possibly mutated) context.
@@ -73,9 +88,22 @@ class Pipeline:
     exception the pipeline stops and re-raises, after publishing a
     :data:`PipelineEventType.STEP_ERROR` event.
 
+    With *max_workers* above 1 the steps form a dependency graph instead:
+    a step waits for every earlier step whose :attr:`~PipelineStep.outputs`
+    it reads or writes, or whose inputs it overwrites, and otherwise runs
+    as soon as a worker thread is free.  Each step then receives a copy of
+    the context and only its declared outputs are merged back, so the
+    result is the same as running the steps in list order.  All events
+    are published from the calling thread.
+
     Args:
         steps: Ordered list of steps to execute.
         event_bus: Optional :class:`EventBus` for progress notifications.
+        max_workers: Number of steps that may run at once; ``1`` runs
+            them strictly in order.
+
+    Raises:
+        ValueError: If *max_workers* is below 1.
 
     Example:
         >>> pipeline = Pipeline([step_a, step_b])
@@ -86,52 +114,142 @@ class Pipeline:
         self,
         steps: List[PipelineStep],
         event_bus: Optional[EventBus] = None,
+        max_workers: int = 1,
     ) -> None:
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1.")
         self.steps = steps
         self.event_bus = event_bus or EventBus()
+        self.max_workers = max_workers
 
     def execute(self, context: Dict[str, Any]) -> Dict[str, Any]:
-        """Run all steps in order, threading *context* through each one.
+        """Run all steps, threading *context* through each one.
 
         Args:
             context: Initial context dict passed to the first step.
 
         Returns:
-            The final context dict returned by the last step.
+            The final context dict.
 
         Raises:
             Exception: Re-raises any exception thrown by a step, after
                 publishing a :data:`PipelineEventType.STEP_ERROR` event.
+                Concurrently running steps are allowed to finish first.
         """
         self.event_bus.publish(
             PipelineEvent(PipelineEventType.PIPELINE_START, "pipeline")
         )
         logger.info("Pipeline starting with %d step(s).", len(self.steps))
 
-        for step in self.steps:
-            self.event_bus.publish(
-                PipelineEvent(PipelineEventType.STEP_START, step.name)
-            )
-            logger.info("Step [%s] starting.", step.name)
-            try:
-                context = step.run(context)
-            except Exception as exc:
-                self.event_bus.publish(
-                    PipelineEvent(
-                        PipelineEventType.STEP_ERROR,
-                        step.name,
-                        {"error": str(exc)},
-                    )
-                )
-                logger.error("Step [%s] failed: %s", step.name, exc)
-                raise
-            self.event_bus.publish(
-                PipelineEvent(PipelineEventType.STEP_COMPLETE, step.name)
-            )
-            logger.info("Step [%s] complete.", step.name)
+        if self.max_workers == 1:
+            for step in self.steps:
+                self._start(step)
+                try:
+                    context = step.run(context)
+                except Exception as exc:
+                    self._fail(step, exc)
+                    raise
+                self._complete(step)
+        else:
+            context = self._execute_graph(context)
 
         self.event_bus.publish(
             PipelineEvent(PipelineEventType.PIPELINE_COMPLETE, "pipeline")
         )
         logger.info("Pipeline complete.")
         return context
+
+    def dependencies(self) -> List[FrozenSet[int]]:
+        """Return, for each step, the indices of the steps it must wait for.
+
+        Step *i* waits for an earlier step *j* when *i* reads a key *j*
+        writes, writes a key *j* writes, or writes a key *j* reads.
+        Undeclared reads or writes conflict with every key.
+        """
+        deps: List[FrozenSet[int]] = []
+        for i, step in enumerate(self.steps):
+            deps.append(
+                frozenset(
+                    j
+                    for j, earlier in enumerate(self.steps[:i])
+                    if _overlaps(step.depends_on, earlier.outputs)
+                    or _overlaps(step.outputs, earlier.outputs)
+                    or _overlaps(step.outputs, earlier.depends_on)
+                )
+            )
+        return deps
+
+    # ------------------------------------------------------------------
+    # Private helpers
+    # ------------------------------------------------------------------
+
+    def _execute_graph(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        """Run the steps on a thread pool in dependency order."""
+        waiting = {i: set(deps) for i, deps in enumerate(self.dependencies())}
+        dependents: Dict[int, List[int]] = defaultdict(list)
+        for i, deps in waiting.items():
+            for j in deps:
+                dependents[j].append(i)
+
+        ready = [i for i, deps in waiting.items() if not deps]
+        running: Dict[Future, int] = {}
+        with ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="pipeline-step"
+        ) as pool:
+            while ready or running:
+                for i in ready:
+                    self._start(self.steps[i])
+                    running[pool.submit(self.steps[i].run, dict(context))] = i
+                ready = []
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                # Merge in list order so that events are deterministic.
+                for future in sorted(done, key=running.__getitem__):
+                    i = running.pop(future)
+                    step = self.steps[i]
+                    try:
+                        result = future.result()
+                    except Exception as exc:
+                        self._fail(step, exc)
+                        raise
+                    if step.outputs is None:
+                        context.update(result)
+                    else:
+                        context.update(
+                            (key, result[key]) for key in step.outputs if key in result
+                        )
+                    self._complete(step)
+                    for k in dependents[i]:
+                        waiting[k].discard(i)
+                        if not waiting[k]:
+                            ready.append(k)
+                ready.sort()
+        return context
+
+    def _start(self, step: PipelineStep) -> None:
+        self.event_bus.publish(PipelineEvent(PipelineEventType.STEP_START, step.name))
+        logger.info("Step [%s] starting.", step.name)
+
+    def _complete(self, step: PipelineStep) -> None:
+        self.event_bus.publish(
+            PipelineEvent(PipelineEventType.STEP_COMPLETE, step.name)
+        )
+        logger.info("Step [%s] complete.", step.name)
+
+    def _fail(self, step: PipelineStep, exc: Exception) -> None:
+        self.event_bus.publish(
+            PipelineEvent(
+                PipelineEventType.STEP_ERROR,
+                step.name,
+                {"error": str(exc)},
+            )
+        )
+        logger.error("Step [%s] failed: %s", step.name, exc)
+
+
+def _overlaps(a: Optional[Tuple[str, ...]], b: Optional[Tuple[str, ...]]) -> bool:
+    """Return whether two key declarations may share a key; ``None`` is "all"."""
+    if (a is not None and not a) or (b is not None and not b):
+        return False
+    if a is None or b is None:
+        return True
+    return not set(a).isdisjoint(b)
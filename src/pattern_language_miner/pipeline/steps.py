@@ -0,0 +1,272 @@
+"""Concrete pipeline steps behind the ``run-all`` command.
+
+Each step wraps one stage of the command-line workflow.  Instead of
+reading the previous stage's output directory, it takes its input from the
+shared *context* dict and leaves its result there for the next step:
+
+============  ==================================  ==========================================
+Step          Reads                               Writes
+============  ==================================  ==========================================
+analyze       —                                   ``patterns``
+dedup         ``patterns``                        ``patterns``
+enrich        ``patterns``                        ``patterns``
+cluster       ``patterns``                        ``embeddings``, ``cluster_ids``,
+                                                  ``clustered_patterns``
+generate      ``patterns``                        ``sentences``
+export        ``patterns``                        ``graph``
+============  ==================================  ==========================================
+
+The table is also declared on each step as
+:attr:`~pattern_language_miner.pipeline.pipeline.PipelineStep.depends_on`
+and :attr:`~pattern_language_miner.pipeline.pipeline.PipelineStep.outputs`,
+so a :class:`~pattern_language_miner.pipeline.pipeline.Pipeline` with
+several workers runs cluster, generate and export concurrently once
+enrichment is done.
+
+The pattern stages (analyze, dedup, enrich) write YAML files only when
+given an *intermediate_dir*.  The cluster, generate and export steps
+always write their results, as the corresponding commands do.
+
+Example:
+    >>> pipeline = Pipeline([
+    ...     AnalyzeStep(PatternExtractor(Path("config.yaml"), Path("./docs"))),
+    ...     EnrichStep(),
+    ...     ExportStep(Path("./graph.graphml")),
+    ... ])
+    >>> context = pipeline.execute({})
+"""
+
+from __future__ import annotations
+
+import logging
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from pattern_language_miner.dedup.pattern_dedup import deduplicate_patterns
+from pattern_language_miner.enricher.pattern_enricher import enrich_pattern
+from pattern_language_miner.graph.graph_export import GraphExporter, export_graph
+from pattern_language_miner.writer.yaml_writer import YamlWriter
+
+from .pipeline import PipelineStep
+
+logger = logging.getLogger(__name__)
+
+
+def _write_intermediate(context: Dict[str, Any], directory: Optional[Path]) -> None:
+    """Dump ``context["patterns"]`` as YAML files into *directory*, if set."""
+    if directory is not None:
+        YamlWriter(directory).write(context["patterns"])
+
+
+class AnalyzeStep(PipelineStep):
+    """Extract patterns from the extractor's input directory.
+
+    Args:
+        extractor: A configured
+            :class:`~pattern_language_miner.extractor.pattern_extractor.PatternExtractor`.
+        intermediate_dir: Optional directory for the extracted patterns.
+    """
+
+    name = "analyze"
+    depends_on = ()
+    outputs = ("patterns",)
+
+    def __init__(self, extractor: Any, intermediate_dir: Optional[Path] = None) -> None:
+        self.extractor = extractor
+        self.intermediate_dir = intermediate_dir
+
+    def run(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        context["patterns"] = self.extractor.extract()
+        _write_intermediate(context, self.intermediate_dir)
+        return context
+
+
+class DedupStep(PipelineStep):
+    """Merge contained and near-duplicate patterns.
+
+    Args:
+        field: Pattern field holding the text to compare.
+        intermediate_dir: Optional directory for the merged patterns.
+        **options: Forwarded to
+            :func:`~pattern_language_miner.dedup.pattern_dedup.deduplicate_patterns`.
+    """
+
+    name = "dedup"
+    depends_on = ("patterns",)
+    outputs = ("patterns",)
+
+    def __init__(
+        self,
+        field: str = "pattern",
+        intermediate_dir: Optional[Path] = None,
+        **options: Any,
+    ) -> None:
+        self.field = field
+        self.intermediate_dir = intermediate_dir
+        self.options = options
+
+    def run(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        before = len(context["patterns"])
+        context["patterns"] = deduplicate_patterns(
+            context["patterns"], field=self.field, **self.options
+        )
+        logger.info(
+            "Deduplicated %d pattern(s) into %d.", before, len(context["patterns"])
+        )
+        _write_intermediate(context, self.intermediate_dir)
+        return context
+
+
+class EnrichStep(PipelineStep):
+    """Add inferred metadata to every pattern.
+
+    Args:
+        intermediate_dir: Optional directory for the enriched patterns.
+    """
+
+    name = "enrich"
+    depends_on = ("patterns",)
+    outputs = ("patterns",)
+
+    def __init__(self, intermediate_dir: Optional[Path] = None) -> None:
+        self.intermediate_dir = intermediate_dir
+
+    def run(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        context["patterns"] = [enrich_pattern(p) for p in context["patterns"]]
+        _write_intermediate(context, self.intermediate_dir)
+        return context
+
+
+class ClusterStep(PipelineStep):
+    """Embed and cluster the patterns held in the context.
+
+    Writes ``clusters.png``, the cluster report and ``cluster_model.npz``
+    to *output_dir*, like the ``cluster`` command.  Patterns without the
+    clusterer's field are left out.
+
+    Args:
+        clusterer: A
+            :class:`~pattern_language_miner.cluster.pattern_cluster.PatternClusterer`;
+            its ``input_dir`` is not read.
+        output_dir: Directory for the clustering results.
+        n_clusters: Number of clusters, or ``None`` to choose it with the
+            clusterer's ``select_n_clusters``.
+        algorithm: Clustering backend name.
+        min_cluster_size: Smallest cluster reported by ``hdbscan``.
+        batch_size: Batch size for embedding.
+        plot_backend: ``"matplotlib"`` or ``"raster"``.
+        report_format: ``"json"`` or ``"jsonl"``.
+    """
+
+    name = "cluster"
+    depends_on = ("patterns",)
+    outputs = ("embeddings", "cluster_ids", "clustered_patterns")
+
+    def __init__(
+        self,
+        clusterer: Any,
+        output_dir: Path,
+        n_clusters: Optional[int] = 5,
+        algorithm: str = "kmeans",
+        min_cluster_size: int = 5,
+        batch_size: int = 32,
+        plot_backend: str = "matplotlib",
+        report_format: str = "json",
+    ) -> None:
+        self.clusterer = clusterer
+        self.output_dir = Path(output_dir)
+        self.n_clusters = n_clusters
+        self.algorithm = algorithm
+        self.min_cluster_size = min_cluster_size
+        self.batch_size = batch_size
+        self.plot_backend = plot_backend
+        self.report_format = report_format
+
+    def run(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        clusterer = self.clusterer
+        clusterer.patterns = [p for p in context["patterns"] if clusterer.field in p]
+        if not clusterer.patterns:
+            logger.warning("No patterns with field %r to cluster.", clusterer.field)
+            return context
+
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        embeddings = clusterer.embed_patterns(batch_size=self.batch_size)
+        n_clusters = self.n_clusters
+        if n_clusters is None:
+            n_clusters, _ = clusterer.select_n_clusters(embeddings)
+        reduced, cluster_ids = clusterer.cluster_and_reduce(
+            embeddings,
+            n_clusters=n_clusters,
+            algorithm=self.algorithm,
+            min_cluster_size=self.min_cluster_size,
+        )
+        clusterer.visualize_clusters(
+            reduced,
+            cluster_ids,
+            self.output_dir / "clusters.png",
+            backend=self.plot_backend,
+        )
+        clusterer.generate_cluster_report(
+            cluster_ids,
+            self.output_dir / f"clustered_patterns.{self.report_format}",
+            format_=self.report_format,
+        )
+        clusterer.save_cluster_model(self.output_dir / "cluster_model.npz")
+
+        context["embeddings"] = embeddings
+        context["cluster_ids"] = cluster_ids
+        context["clustered_patterns"] = [
+            dict(p, cluster=int(cid)) for p, cid in zip(clusterer.patterns, cluster_ids)
+        ]
+        return context
+
+
+class GenerateStep(PipelineStep):
+    """Render the patterns as sentences and write them out.
+
+    Args:
+        generator: A
+            :class:`~pattern_language_miner.generator.generate_sentences.SentenceGenerator`;
+            its ``input_dir`` is not read.
+    """
+
+    name = "generate"
+    depends_on = ("patterns",)
+    outputs = ("sentences",)
+
+    def __init__(self, generator: Any) -> None:
+        self.generator = generator
+
+    def run(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        if not context["patterns"]:
+            logger.warning("No patterns to generate sentences from.")
+            return context
+        sentences = [self.generator.generate_sentence(p) for p in context["patterns"]]
+        self.generator.write_output(self.generator.format_sentences(sentences))
+        context["sentences"] = sentences
+        return context
+
+
+class ExportStep(PipelineStep):
+    """Build the knowledge graph of the patterns and export it.
+
+    Args:
+        output_path: Destination file.
+        format_: One of ``"graphml"``, ``"mermaid"``, ``"neo4j"``, ``"json"``.
+    """
+
+    name = "export"
+    depends_on = ("patterns",)
+    outputs = ("graph",)
+
+    def __init__(self, output_path: Path, format_: str = "graphml") -> None:
+        self.output_path = Path(output_path)
+        self.format = format_
+
+    def run(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        exporter = GraphExporter(context["patterns"])
+        exporter.build_graph()
+        self.output_path.parent.mkdir(parents=True, exist_ok=True)
+        export_graph(exporter.graph, self.output_path, self.format)
+        context["graph"] = exporter.graph
+        return context
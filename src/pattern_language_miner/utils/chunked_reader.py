@@ -0,0 +1,123 @@
+"""Incremental reading of text files too large to hold in memory.
+
+:class:`ChunkedText` stands in for a file's content string.  Iterating it
+reads the file in fixed-size character chunks through a text-mode stream,
+whose incremental decoder keeps multi-byte characters and ``\\r\\n`` line
+endings intact across chunk boundaries.  :func:`iter_paragraphs` regroups
+chunks into paragraphs, carrying a partial paragraph over to the next
+chunk, so memory stays bounded by the chunk size plus the longest
+paragraph.
+
+Example:
+    >>> text = ChunkedText("dump.txt")
+    >>> for paragraph in iter_paragraphs(text):
+    ...     process(paragraph)
+"""
+
+from __future__ import annotations
+
+import re
+from pathlib import Path
+from typing import Iterable, Iterator
+
+#: Characters read per chunk.
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+#: Longest segment emitted before a forced split.
+DEFAULT_MAX_SEGMENT = 1 << 22
+
+_PARAGRAPH_BREAK = re.compile(r"\n[ \t]*\n\s*")
+_SENTENCE_END = re.compile(r"[.!?][\"')\]]*\s")
+
+
+class ChunkedText:
+    """Lazily readable, re-iterable text content of a file.
+
+    Args:
+        path: File to read.
+        encoding: Text encoding of the file.
+        errors: How decoding errors are handled, as for :func:`open`.
+        chunk_size: Characters per chunk yielded by iteration.
+
+    Attributes:
+        size: File size in bytes when the object was created.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        encoding: str = "utf-8",
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        errors: str = "strict",
+    ) -> None:
+        self.path = Path(path)
+        self.encoding = encoding
+        self.errors = errors
+        self.chunk_size = chunk_size
+        self.size = self.path.stat().st_size
+
+    def __iter__(self) -> Iterator[str]:
+        """Yield the decoded content chunk by chunk, from the start."""
+        with self.path.open(
+            encoding=self.encoding, errors=self.errors, newline=None
+        ) as fh:
+            while chunk := fh.read(self.chunk_size):
+                yield chunk
+
+    def __repr__(self) -> str:
+        return f"ChunkedText({str(self.path)!r}, size={self.size})"
+
+
+def iter_paragraphs(
+    chunks: Iterable[str], max_chars: int = DEFAULT_MAX_SEGMENT
+) -> Iterator[str]:
+    """Regroup text *chunks* into blank-line separated paragraphs.
+
+    A paragraph longer than *max_chars* is split early, at the last line
+    break, else the last sentence end, else the last whitespace before the
+    limit.
+
+    Args:
+        chunks: Consecutive pieces of one text, e.g. a :class:`ChunkedText`.
+        max_chars: Upper bound on the length of a yielded paragraph.
+
+    Yields:
+        Stripped, non-empty paragraphs in order.
+    """
+    carry = ""
+    for chunk in chunks:
+        carry += chunk
+        parts = _PARAGRAPH_BREAK.split(carry)
+        carry = parts.pop()
+        for part in parts:
+            yield from _bounded(part, max_chars)
+        while len(carry) > max_chars:
+            cut = _split_point(carry, max_chars)
+            head, carry = carry[:cut], carry[cut:]
+            if head.strip():
+                yield head.strip()
+    yield from _bounded(carry, max_chars)
+
+
+def _bounded(text: str, max_chars: int) -> Iterator[str]:
+    """Yield *text* stripped, split into pieces of at most *max_chars*."""
+    while len(text) > max_chars:
+        cut = _split_point(text, max_chars)
+        if text[:cut].strip():
+            yield text[:cut].strip()
+        text = text[cut:]
+    if text.strip():
+        yield text.strip()
+
+
+def _split_point(text: str, max_chars: int) -> int:
+    """Return the best index at most *max_chars* to split *text* at."""
+    window = text[:max_chars]
+    newline = window.rfind("\n")
+    if newline > 0:
+        return newline + 1
+    ends = list(_SENTENCE_END.finditer(window))
+    if ends:
+        return ends[-1].end()
+    space = max(window.rfind(" "), window.rfind("\t"))
+    return space + 1 if space > 0 else max_chars
@@ -1,9 +1,26 @@
 """Vector-store sub-package.
 
-Provides :class:`~pattern_language_miner.vector_store.weaviate_store.WeaviateStore`,
-a Weaviate adapter for semantic pattern search.
+Provides the :class:`~pattern_language_miner.vector_store.base.VectorStore`
+protocol and two implementations:
+:class:`~pattern_language_miner.vector_store.weaviate_store.WeaviateStore`,
+a Weaviate adapter for semantic pattern search, and
+:class:`~pattern_language_miner.vector_store.local_store.LocalVectorStore`,
+an embedded file-backed store that needs no server.
+:class:`~pattern_language_miner.vector_store.async_store.AsyncWeaviateStore`
+exposes the Weaviate store as coroutines.
+:class:`~pattern_language_miner.vector_store.base.BatchResult`
+is the report returned by bulk upserts.
 """
 
+from .async_store import AsyncWeaviateStore
+from .base import BatchResult, VectorStore
+from .local_store import LocalVectorStore
 from .weaviate_store import WeaviateStore
 
-__all__ = ["WeaviateStore"]
+__all__ = [
+    "AsyncWeaviateStore",
+    "BatchResult",
+    "LocalVectorStore",
+    "VectorStore",
+    "WeaviateStore",
+]
@@ -0,0 +1,301 @@
+"""Asyncio front end for :class:`WeaviateStore`.
+
+Provides :class:`AsyncWeaviateStore`, which exposes the vector-store
+interface as coroutines.  Requests still go through the wrapped store's
+keep-alive :class:`~pattern_language_miner.vector_store.rest.ConnectionPool`;
+they run on a dedicated thread pool while an :class:`asyncio.Semaphore`
+bounds how many are in flight, so the event loop stays free for other work
+such as computing the next batch of embeddings.
+
+Example:
+    >>> async def load(patterns):
+    ...     async with AsyncWeaviateStore(max_in_flight=8) as store:
+    ...         return await store.embed_and_upsert(patterns, model.encode)
+    >>> report = asyncio.run(load(patterns))
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import itertools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    Any,
+    AsyncIterable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    TypeVar,
+)
+
+import numpy as np
+
+from .base import BatchResult
+from .weaviate_store import WeaviateStore
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+#: Sentinel for an exhausted vector iterator.
+_MISSING = object()
+
+#: Embeds a list of texts into an array of shape ``(len(texts), dim)``.
+BatchEmbedFunction = Callable[[List[str]], Any]
+
+
+class AsyncWeaviateStore:
+    """Coroutine-based access to a Weaviate instance.
+
+    Args:
+        url: Base URL of the running Weaviate instance.  Ignored when
+            *store* is given.
+        class_name: Weaviate class used to store patterns.  Ignored when
+            *store* is given.
+        max_in_flight: Maximum number of concurrent requests.  A store
+            created here keeps as many pooled connections open.
+        store: Existing :class:`WeaviateStore` whose connection pool,
+            ``embed_fn`` and query cache should be shared.  Its
+            ``max_connections`` caps the connections that are reused.
+    """
+
+    def __init__(
+        self,
+        url: str = "http://localhost:8080",
+        class_name: str = "Pattern",
+        max_in_flight: int = 4,
+        store: WeaviateStore | None = None,
+    ) -> None:
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1.")
+        self.store = store or WeaviateStore(
+            url=url, class_name=class_name, max_connections=max_in_flight
+        )
+        self.max_in_flight = max_in_flight
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_in_flight, thread_name_prefix="weaviate-io"
+        )
+        self._semaphore: asyncio.Semaphore | None = None
+
+    async def __aenter__(self) -> "AsyncWeaviateStore":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Wait for running requests and close pooled connections."""
+        await asyncio.get_running_loop().run_in_executor(
+            None, functools.partial(self._executor.shutdown, wait=True)
+        )
+        self.store.close()
+
+    # ------------------------------------------------------------------
+    # VectorStore interface
+    # ------------------------------------------------------------------
+
+    async def upsert_pattern(
+        self, pattern: Dict[str, Any], vector: Sequence[float] | None = None
+    ) -> BatchResult:
+        """Insert or update one pattern through the store's ``upsert_patterns``.
+
+        Failed requests are retried with the store's default retry policy.
+
+        Returns:
+            A single-object :class:`BatchResult`.
+        """
+        vectors = [vector] if vector is not None else None
+        return await self._call(self.store.upsert_patterns, [pattern], vectors)
+
+    async def query_similar_patterns(
+        self, text: str, top_k: int = 5
+    ) -> List[Dict[str, Any]]:
+        """Return the *top_k* patterns closest to *text*."""
+        results = await self.query_similar_patterns_batch([text], top_k=top_k)
+        return results[0]
+
+    async def query_by_vector(
+        self, vector: Sequence[float], top_k: int = 5
+    ) -> List[Dict[str, Any]]:
+        """Return the *top_k* patterns closest to *vector*."""
+        return await self._call(self.store.query_by_vector, vector, top_k)
+
+    async def delete_pattern(self, uuid: str) -> Optional[Dict[str, Any]]:
+        """Remove the pattern identified by *uuid*."""
+        return await self._call(self.store.delete_pattern, uuid)
+
+    # ------------------------------------------------------------------
+    # Bulk operations
+    # ------------------------------------------------------------------
+
+    async def upsert_patterns(
+        self,
+        patterns: Iterable[Dict[str, Any]] | AsyncIterable[Dict[str, Any]],
+        vectors: Iterable[Sequence[float]] | None = None,
+        batch_size: int = 100,
+        max_retries: int = 3,
+        backoff: float = 0.5,
+    ) -> BatchResult:
+        """Bulk-upsert *patterns* with at most :attr:`max_in_flight` batches pending.
+
+        Accepts an async iterable, so patterns can be produced while
+        earlier batches upload.  Retries and error reporting follow
+        :meth:`WeaviateStore.upsert_patterns`.
+
+        Raises:
+            ValueError: If *vectors* and *patterns* differ in length.
+        """
+        self.store.clear_query_cache()
+        vector_iter = iter(vectors) if vectors is not None else None
+        uploads = _Uploads(self, max_retries, backoff)
+        batch: List[Any] = []
+        async for pattern in _aiter(patterns):
+            vector = None
+            if vector_iter is not None:
+                vector = next(vector_iter, _MISSING)
+                if vector is _MISSING:
+                    await uploads.result()
+                    raise ValueError("vectors is shorter than patterns.")
+            batch.append((pattern, vector))
+            if len(batch) == batch_size:
+                await uploads.submit(batch)
+                batch = []
+        if batch:
+            await uploads.submit(batch)
+        result = await uploads.result()
+        if vector_iter is not None and next(vector_iter, _MISSING) is not _MISSING:
+            raise ValueError("vectors is longer than patterns.")
+        return result
+
+    async def embed_and_upsert(
+        self,
+        patterns: Iterable[Dict[str, Any]],
+        embed_batch: BatchEmbedFunction,
+        field: str = "solution",
+        batch_size: int = 100,
+        max_retries: int = 3,
+        backoff: float = 0.5,
+    ) -> BatchResult:
+        """Embed *patterns* batch by batch and upload them as they are ready.
+
+        Each batch is embedded on the default executor while the previous
+        batches are still uploading, so embedding and network time overlap.
+        Embedding pauses once :attr:`max_in_flight` uploads are pending.
+
+        Args:
+            patterns: Pattern dictionaries, each with an ``"id"`` key.
+            embed_batch: Function embedding a list of texts, e.g.
+                ``SentenceTransformer.encode``.
+            field: Pattern field to embed.
+            batch_size: Patterns per embedding call and per upload.
+            max_retries: Retries per upload batch.
+            backoff: Initial retry delay in seconds.
+
+        Returns:
+            The combined :class:`BatchResult`.
+        """
+        loop = asyncio.get_running_loop()
+        self.store.clear_query_cache()
+        uploads = _Uploads(self, max_retries, backoff)
+        iterator = iter(patterns)
+        while batch := list(itertools.islice(iterator, batch_size)):
+            texts = [str(p.get(field, "")) for p in batch]
+            vectors = await loop.run_in_executor(None, embed_batch, texts)
+            await uploads.submit(list(zip(batch, np.asarray(vectors))))
+        return await uploads.result()
+
+    async def query_similar_patterns_batch(
+        self, texts: Iterable[str], top_k: int = 5, group_size: int = 20
+    ) -> List[List[Dict[str, Any]]]:
+        """Search many texts concurrently; results follow input order.
+
+        Texts are grouped as in :meth:`WeaviateStore.query_similar_patterns_batch`
+        and every group is one request, bounded by :attr:`max_in_flight`.
+        """
+        texts = list(texts)
+        groups = [texts[i:i + group_size] for i in range(0, len(texts), group_size)]
+        answers = await asyncio.gather(
+            *(
+                self._call(
+                    functools.partial(
+                        self.store.query_similar_patterns_batch,
+                        group,
+                        top_k=top_k,
+                        group_size=group_size,
+                        concurrency=1,
+                    )
+                )
+                for group in groups
+            )
+        )
+        return [result for answer in answers for result in answer]
+
+    # ------------------------------------------------------------------
+    # Private helpers
+    # ------------------------------------------------------------------
+
+    async def _call(self, func: Callable[..., T], *args: Any) -> T:
+        """Run blocking *func* on the I/O pool once a request slot is free."""
+        async with self._slots():
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._executor, functools.partial(func, *args)
+            )
+
+    def _slots(self) -> asyncio.Semaphore:
+        # Created lazily so the semaphore binds to the running loop.
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_in_flight)
+        return self._semaphore
+
+
+class _Uploads:
+    """Track pending batch uploads, waiting when too many are in flight."""
+
+    def __init__(self, owner: AsyncWeaviateStore, max_retries: int, backoff: float) -> None:
+        self.owner = owner
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.pending: set[asyncio.Task] = set()
+        self.total = BatchResult()
+
+    async def submit(self, batch: List[Any]) -> None:
+        while len(self.pending) >= self.owner.max_in_flight:
+            done, self.pending = await asyncio.wait(
+                self.pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                self.total.merge(task.result())
+        self.pending.add(
+            asyncio.create_task(
+                self.owner._call(
+                    self.owner.store.send_batch, batch, self.max_retries, self.backoff
+                )
+            )
+        )
+
+    async def result(self) -> BatchResult:
+        for task in asyncio.as_completed(self.pending):
+            self.total.merge(await task)
+        self.pending = set()
+        logger.info(
+            "Async upsert finished: %d imported, %d failed.",
+            self.total.imported,
+            self.total.failed,
+        )
+        return self.total
+
+
+async def _aiter(items: Iterable[T] | AsyncIterable[T]):
+    """Iterate sync and async iterables alike."""
+    if hasattr(items, "__aiter__"):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
@@ -0,0 +1,77 @@
+"""Common interface of the vector-store backends.
+
+Defines :class:`VectorStore`, the structural protocol implemented by
+:class:`~pattern_language_miner.vector_store.weaviate_store.WeaviateStore`
+and :class:`~pattern_language_miner.vector_store.local_store.LocalVectorStore`.
+Code that only stores, searches and deletes patterns should depend on this
+protocol so either backend can be swapped in.
+
+The types both backends share live here as well: :class:`BatchResult`,
+the report returned by bulk upserts, and :data:`EmbedFunction`.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Protocol,
+    Sequence,
+    runtime_checkable,
+)
+
+#: Maps a query text to its embedding, e.g. ``SentenceTransformer.encode``.
+EmbedFunction = Callable[[str], Sequence[float]]
+
+
+@dataclass
+class BatchResult:
+    """Outcome of a bulk upsert such as ``upsert_patterns``.
+
+    Attributes:
+        imported: Number of patterns the store accepted.
+        errors: Error message per pattern ``id`` that could not be imported,
+            either because the store rejected the object or because its batch
+            still failed after all retries.
+        retries: Number of batch requests that were re-sent.
+    """
+
+    imported: int = 0
+    errors: Dict[str, str] = field(default_factory=dict)
+    retries: int = 0
+
+    @property
+    def failed(self) -> int:
+        """Number of patterns that were not imported."""
+        return len(self.errors)
+
+    def merge(self, other: "BatchResult") -> None:
+        """Add the counts and errors of *other* to this result."""
+        self.imported += other.imported
+        self.errors.update(other.errors)
+        self.retries += other.retries
+
+
+@runtime_checkable
+class VectorStore(Protocol):
+    """Store patterns and search them by semantic similarity."""
+
+    def upsert_pattern(
+        self, pattern: Dict[str, Any], vector: Sequence[float] | None = None
+    ) -> None:
+        """Insert or update *pattern*, keyed by its ``"id"`` field."""
+        ...
+
+    def query_similar_patterns(
+        self, text: str, top_k: int = 5
+    ) -> List[Dict[str, Any]]:
+        """Return the *top_k* patterns closest to *text*, best first."""
+        ...
+
+    def delete_pattern(self, uuid: str) -> Optional[Any]:
+        """Remove the pattern identified by *uuid*."""
+        ...
@@ -0,0 +1,382 @@
+"""Embedded, file-backed vector store.
+
+Provides :class:`LocalVectorStore`, an in-process alternative to
+:class:`~pattern_language_miner.vector_store.weaviate_store.WeaviateStore`
+for tests and small deployments.  Vectors live in a memory-mapped ``.npy``
+matrix, so opening a store does not read it into RAM.  Search is exact
+brute-force cosine similarity until :meth:`LocalVectorStore.build_index` is
+called; after that an inverted-file (IVF) index restricts each query to the
+few partitions whose centroids are closest to the query.
+
+On-disk layout of a store directory::
+
+    vectors.npy      float32 matrix, one unit-length row per stored vector
+    patterns.json    pattern dicts aligned with the rows (null = deleted)
+    index.npz        IVF centroids and partition offsets (optional)
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from .base import BatchResult, EmbedFunction
+
+logger = logging.getLogger(__name__)
+
+_VECTORS_FILE = "vectors.npy"
+_PATTERNS_FILE = "patterns.json"
+_INDEX_FILE = "index.npz"
+
+
+class LocalVectorStore:
+    """Store patterns and their embeddings in a local directory.
+
+    Implements :class:`~pattern_language_miner.vector_store.base.VectorStore`.
+    Similarity is cosine similarity; results carry
+    ``_additional.distance = 1 - similarity`` like Weaviate's.
+
+    Updating or deleting a pattern only tombstones its old row.  New rows
+    are appended after the indexed region and always scanned exactly, so
+    the store stays correct between index rebuilds.  Call :meth:`save` to
+    persist changes.
+
+    Args:
+        path: Store directory; created on :meth:`save` if missing and loaded
+            if it already holds a store.
+        embed_fn: Optional function embedding texts, used by
+            :meth:`query_similar_patterns` and by upserts without a vector.
+        field: Pattern field embedded by *embed_fn* on upsert.
+        n_probe: Number of IVF partitions searched per query.
+
+    Example:
+        >>> store = LocalVectorStore("./out/vector_store", embed_fn=model.encode)
+        >>> store.upsert_patterns(patterns, vectors=embeddings)
+        >>> store.build_index()
+        >>> store.save()
+        >>> results = store.query_similar_patterns("software installation")
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        embed_fn: EmbedFunction | None = None,
+        field: str = "solution",
+        n_probe: int = 8,
+    ) -> None:
+        self.path = Path(path)
+        self.embed_fn = embed_fn
+        self.field = field
+        self.n_probe = n_probe
+        self._vectors: np.ndarray | None = None
+        self._patterns: List[Optional[Dict[str, Any]]] = []
+        self._rows: Dict[str, int] = {}
+        self._alive = np.zeros(0, dtype=bool)
+        self._centroids: np.ndarray | None = None
+        self._offsets: np.ndarray | None = None
+        self._pending: Path | None = None
+        if (self.path / _PATTERNS_FILE).exists():
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    @property
+    def dim(self) -> int | None:
+        """Vector dimensionality, or ``None`` while the store is empty."""
+        return None if self._vectors is None else self._vectors.shape[1]
+
+    # ------------------------------------------------------------------
+    # VectorStore interface
+    # ------------------------------------------------------------------
+
+    def upsert_pattern(
+        self, pattern: Dict[str, Any], vector: Sequence[float] | None = None
+    ) -> None:
+        """Insert or update *pattern*, keyed by its ``"id"`` field.
+
+        Args:
+            pattern: Pattern dictionary.  Must contain an ``"id"`` key.
+            vector: Precomputed embedding.  If omitted, *pattern*'s
+                :attr:`field` is embedded with :attr:`embed_fn`.
+
+        Raises:
+            ValueError: If no vector is given and there is no
+                :attr:`embed_fn`, or if the dimensionality is wrong.
+        """
+        if vector is None:
+            vector = self._embed(str(pattern.get(self.field, "")))
+        self._append([pattern], np.asarray(vector, dtype=np.float32)[None, :])
+
+    def upsert_patterns(
+        self,
+        patterns: Iterable[Dict[str, Any]],
+        vectors: Iterable[Sequence[float]] | None = None,
+        batch_size: int = 1024,
+    ) -> BatchResult:
+        """Insert or update many patterns, appending in batches.
+
+        Args:
+            patterns: Pattern dictionaries, each with an ``"id"`` key.
+            vectors: Embeddings aligned with *patterns*.  If omitted, each
+                pattern is embedded with :attr:`embed_fn`.
+            batch_size: Rows appended per write.
+
+        Returns:
+            A :class:`~pattern_language_miner.vector_store.base.BatchResult`.
+        """
+        result = BatchResult()
+        pairs = iter(zip(patterns, vectors)) if vectors is not None else (
+            (p, None) for p in patterns
+        )
+        batch: List[Dict[str, Any]] = []
+        rows: List[np.ndarray] = []
+        for pattern, vector in pairs:
+            if vector is None:
+                vector = self._embed(str(pattern.get(self.field, "")))
+            batch.append(pattern)
+            rows.append(np.asarray(vector, dtype=np.float32))
+            if len(batch) == batch_size:
+                self._append(batch, np.stack(rows))
+                result.imported += len(batch)
+                batch, rows = [], []
+        if batch:
+            self._append(batch, np.stack(rows))
+            result.imported += len(batch)
+        return result
+
+    def query_similar_patterns(
+        self, text: str, top_k: int = 5
+    ) -> List[Dict[str, Any]]:
+        """Return the *top_k* patterns closest to *text*.
+
+        Raises:
+            ValueError: If the store has no :attr:`embed_fn`.
+        """
+        return self.query_by_vector(self._embed(text), top_k=top_k)
+
+    def query_by_vector(
+        self, vector: Sequence[float], top_k: int = 5
+    ) -> List[Dict[str, Any]]:
+        """Return the *top_k* patterns closest to *vector*, best first.
+
+        Args:
+            vector: Query embedding from the model used at upsert time.
+            top_k: Maximum number of results to return.
+
+        Returns:
+            Copies of the stored pattern dicts, each with an
+            ``_additional.distance`` entry (cosine distance).
+        """
+        if self._vectors is None or not self._rows or top_k < 1:
+            return []
+        query = _normalise(np.asarray(vector, dtype=np.float32)[None, :])[0]
+        rows, scores = self._search(query)
+        live = self._alive[rows]
+        rows, scores = rows[live], scores[live]
+        if len(rows) > top_k:
+            top = np.argpartition(-scores, top_k - 1)[:top_k]
+            rows, scores = rows[top], scores[top]
+        order = np.argsort(-scores, kind="stable")
+        results = []
+        for row, score in zip(rows[order], scores[order]):
+            entry = dict(self._patterns[row])
+            entry["_additional"] = {"distance": float(1.0 - score)}
+            results.append(entry)
+        return results
+
+    def delete_pattern(self, uuid: str) -> Optional[Dict[str, Any]]:
+        """Remove the pattern identified by *uuid*.
+
+        Returns:
+            The removed pattern, or ``None`` if it was not stored.
+        """
+        row = self._rows.pop(uuid, None)
+        if row is None:
+            return None
+        removed = self._patterns[row]
+        self._patterns[row] = None
+        self._alive[row] = False
+        logger.debug("Deleted pattern %s.", uuid)
+        return removed
+
+    # ------------------------------------------------------------------
+    # Index and persistence
+    # ------------------------------------------------------------------
+
+    def build_index(self, n_lists: int | None = None, sample_size: int = 20000) -> None:
+        """Compact the store and build an IVF index over all live rows.
+
+        Rows are clustered with spherical mini-batch KMeans into *n_lists*
+        partitions and rewritten partition by partition, so every partition
+        is one contiguous slice of the memory-mapped matrix.  Tombstoned
+        rows are dropped.  The reordered matrix replaces ``vectors.npy``
+        only on :meth:`save`, together with ``patterns.json``.
+
+        Args:
+            n_lists: Number of partitions; defaults to ``sqrt(n)``.
+            sample_size: Rows used to train the partition centroids.
+        """
+        if self._vectors is None or not self._rows:
+            return
+        from sklearn.cluster import MiniBatchKMeans
+
+        live_rows = np.flatnonzero(self._alive)
+        vectors = np.asarray(self._vectors[live_rows])
+        n_lists = max(1, min(n_lists or int(np.sqrt(len(live_rows))), len(live_rows)))
+        rng = np.random.default_rng(42)
+        sample = vectors
+        if len(vectors) > sample_size:
+            sample = vectors[rng.choice(len(vectors), sample_size, replace=False)]
+        logger.info("Building IVF index: %d row(s), %d list(s).", len(vectors), n_lists)
+        kmeans = MiniBatchKMeans(n_clusters=n_lists, random_state=42, n_init="auto")
+        centroids = _normalise(kmeans.fit(sample).cluster_centers_.astype(np.float32))
+
+        lists = np.concatenate(
+            [
+                np.argmax(vectors[i:i + 8192] @ centroids.T, axis=1)
+                for i in range(0, len(vectors), 8192)
+            ]
+        )
+        order = np.argsort(lists, kind="stable")
+        offsets = np.searchsorted(lists[order], np.arange(n_lists + 1))
+
+        patterns = [self._patterns[live_rows[i]] for i in order]
+        reordered = self._allocate(len(order), vectors.shape[1])
+        reordered[: len(order)] = vectors[order]
+        self._swap_in(reordered)
+        self._patterns = patterns
+        self._rows = {str(p["id"]): i for i, p in enumerate(patterns)}
+        self._alive = np.ones(len(patterns), dtype=bool)
+        self._centroids = centroids
+        self._offsets = offsets
+
+    def save(self) -> None:
+        """Flush vectors and write patterns and the index to :attr:`path`.
+
+        A matrix reallocated since the last save is moved over
+        ``vectors.npy`` here, right before ``patterns.json`` is replaced, so
+        the two files on disk only change together.
+        """
+        self.path.mkdir(parents=True, exist_ok=True)
+        if self._vectors is not None:
+            self._vectors.flush()
+        if self._pending is not None:
+            os.replace(self._pending, self.path / _VECTORS_FILE)
+            self._pending = None
+        tmp = self.path / (_PATTERNS_FILE + ".tmp")
+        with tmp.open("w", encoding="utf-8") as fh:
+            json.dump(
+                {"dim": self.dim, "patterns": self._patterns}, fh, ensure_ascii=False
+            )
+        os.replace(tmp, self.path / _PATTERNS_FILE)
+        index_path = self.path / _INDEX_FILE
+        if self._centroids is not None:
+            with index_path.open("wb") as fh:
+                np.savez(fh, centroids=self._centroids, offsets=self._offsets)
+        elif index_path.exists():
+            index_path.unlink()
+        logger.info("Saved %d pattern(s) to %s.", len(self), self.path)
+
+    # ------------------------------------------------------------------
+    # Private helpers
+    # ------------------------------------------------------------------
+
+    def _embed(self, text: str) -> np.ndarray:
+        if self.embed_fn is None:
+            raise ValueError("No vector given and no embed_fn configured.")
+        return np.asarray(self.embed_fn(text), dtype=np.float32).ravel()
+
+    def _search(self, query: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Score candidate rows: probed IVF partitions plus the unindexed tail."""
+        count = len(self._patterns)
+        if self._centroids is None:
+            return np.arange(count), self._vectors[:count] @ query
+
+        n_indexed = int(self._offsets[-1])
+        n_probe = min(self.n_probe, len(self._centroids))
+        probe = np.argpartition(-(self._centroids @ query), n_probe - 1)[:n_probe]
+        slices = [(int(self._offsets[l]), int(self._offsets[l + 1])) for l in probe]
+        slices.append((n_indexed, count))
+        rows = np.concatenate([np.arange(a, b) for a, b in slices])
+        scores = np.concatenate([self._vectors[a:b] @ query for a, b in slices])
+        return rows, scores
+
+    def _append(self, patterns: List[Dict[str, Any]], vectors: np.ndarray) -> None:
+        if vectors.ndim != 2 or (self.dim is not None and vectors.shape[1] != self.dim):
+            raise ValueError(
+                f"Expected vectors of dimension {self.dim}, got shape {vectors.shape}."
+            )
+        # An id repeated within the batch keeps only its last occurrence.
+        last = {str(p["id"]): i for i, p in enumerate(patterns)}
+        if len(last) < len(patterns):
+            keep = sorted(last.values())
+            patterns = [patterns[i] for i in keep]
+            vectors = vectors[keep]
+        for pattern in patterns:
+            self.delete_pattern(str(pattern["id"]))
+        start = len(self._patterns)
+        self._reserve(start + len(patterns), vectors.shape[1])
+        self._vectors[start:start + len(patterns)] = _normalise(vectors)
+        for offset, pattern in enumerate(patterns):
+            self._rows[str(pattern["id"])] = start + offset
+        self._patterns.extend(patterns)
+        self._alive = np.concatenate([self._alive, np.ones(len(patterns), dtype=bool)])
+
+    def _reserve(self, n_rows: int, dim: int) -> None:
+        """Grow the memory-mapped matrix to hold at least *n_rows* rows."""
+        if self._vectors is not None and self._vectors.shape[0] >= n_rows:
+            return
+        old, count = self._vectors, len(self._patterns)
+        capacity = max(n_rows, 1024, 2 * (0 if old is None else old.shape[0]))
+        vectors = self._allocate(capacity, dim)
+        if old is not None:
+            vectors[:count] = old[:count]
+        self._swap_in(vectors)
+
+    def _allocate(self, capacity: int, dim: int) -> np.ndarray:
+        """Map a fresh matrix in a temporary file next to ``vectors.npy``."""
+        self.path.mkdir(parents=True, exist_ok=True)
+        fd, name = tempfile.mkstemp(
+            prefix=_VECTORS_FILE + ".", suffix=".tmp", dir=self.path
+        )
+        os.close(fd)
+        return np.lib.format.open_memmap(
+            name, mode="w+", dtype=np.float32, shape=(capacity, dim)
+        )
+
+    def _swap_in(self, vectors: np.ndarray) -> None:
+        """Use *vectors* from :meth:`_allocate` until :meth:`save` moves it in place."""
+        stale, self._pending = self._pending, Path(vectors.filename)
+        self._vectors = vectors
+        if stale is not None:
+            stale.unlink(missing_ok=True)
+
+    def _load(self) -> None:
+        with (self.path / _PATTERNS_FILE).open("r", encoding="utf-8") as fh:
+            data = json.load(fh)
+        self._patterns = data["patterns"]
+        self._alive = np.array([p is not None for p in self._patterns], dtype=bool)
+        self._rows = {
+            str(p["id"]): row for row, p in enumerate(self._patterns) if p is not None
+        }
+        if data["dim"] is not None:
+            self._vectors = np.load(self.path / _VECTORS_FILE, mmap_mode="r+")
+        index_path = self.path / _INDEX_FILE
+        if index_path.exists():
+            with np.load(index_path) as index:
+                self._centroids = index["centroids"]
+                self._offsets = index["offsets"]
+        logger.debug("Loaded %d pattern(s) from %s.", len(self), self.path)
+
+
+def _normalise(vectors: np.ndarray) -> np.ndarray:
+    """Scale each row of *vectors* to unit length (zero rows stay zero)."""
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return (vectors / np.where(norms == 0, 1.0, norms)).astype(np.float32)
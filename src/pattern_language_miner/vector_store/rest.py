@@ -0,0 +1,129 @@
+"""Keep-alive HTTP transport for the Weaviate REST API.
+
+Provides :class:`ConnectionPool`, a small thread-safe pool of persistent
+:mod:`http.client` connections.  Bulk operations in
+:class:`~pattern_language_miner.vector_store.weaviate_store.WeaviateStore`
+send many requests from worker threads; reusing one TCP connection per
+worker avoids a handshake per request and keeps the transport independent
+of the installed ``weaviate-client`` major version.
+"""
+
+from __future__ import annotations
+
+import http.client
+import json
+import logging
+import queue
+from typing import Any, Tuple
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+#: Exceptions that indicate a broken connection rather than an API error.
+TRANSPORT_ERRORS = (OSError, http.client.HTTPException)
+
+
+class ConnectionPool:
+    """Reuse up to *max_connections* keep-alive connections to *url*.
+
+    Connections are opened lazily and returned to the pool after each
+    request.  A connection that fails mid-request is discarded so the next
+    request opens a fresh one.
+
+    Args:
+        url: Base URL, e.g. ``"http://localhost:8080"``.
+        max_connections: Maximum number of idle connections kept open.
+        timeout: Socket timeout in seconds.
+
+    Example:
+        >>> pool = ConnectionPool("http://localhost:8080")
+        >>> status, body = pool.request("GET", "/v1/meta")
+    """
+
+    def __init__(
+        self, url: str, max_connections: int = 4, timeout: float = 30.0
+    ) -> None:
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https"):
+            raise ValueError(
+                f"Unsupported URL scheme {parts.scheme!r}. Choose from: http, https"
+            )
+        self._connection_class = (
+            http.client.HTTPSConnection
+            if parts.scheme == "https"
+            else http.client.HTTPConnection
+        )
+        self.host = parts.hostname or "localhost"
+        self.port = parts.port
+        self.base_path = parts.path.rstrip("/")
+        self.timeout = timeout
+        self._idle: queue.LifoQueue = queue.LifoQueue(maxsize=max_connections)
+
+    def request(
+        self, method: str, path: str, payload: Any = None
+    ) -> Tuple[int, Any]:
+        """Send a JSON request and return ``(status, decoded_body)``.
+
+        Args:
+            method: HTTP method.
+            path: Path below the base URL, e.g. ``"/v1/batch/objects"``.
+            payload: JSON-serialisable request body, or ``None``.
+
+        Returns:
+            The HTTP status code and the decoded JSON body (``None`` when the
+            response is empty, the raw text when it is not JSON).
+
+        Raises:
+            OSError: On connection failures.
+            http.client.HTTPException: On malformed responses.
+        """
+        body = None
+        headers = {"Accept": "application/json"}
+        if payload is not None:
+            body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            headers["Content-Type"] = "application/json"
+
+        conn = self._acquire()
+        try:
+            conn.request(method, self.base_path + path, body=body, headers=headers)
+            response = conn.getresponse()
+            raw = response.read()
+        except TRANSPORT_ERRORS:
+            conn.close()
+            raise
+        if response.will_close:
+            conn.close()
+        else:
+            self._release(conn)
+
+        if not raw:
+            return response.status, None
+        try:
+            return response.status, json.loads(raw)
+        except ValueError:
+            return response.status, raw.decode("utf-8", errors="replace")
+
+    def close(self) -> None:
+        """Close every idle connection."""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+    # ------------------------------------------------------------------
+    # Private helpers
+    # ------------------------------------------------------------------
+
+    def _acquire(self) -> http.client.HTTPConnection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            logger.debug("Opening connection to %s:%s.", self.host, self.port)
+            return self._connection_class(self.host, self.port, timeout=self.timeout)
+
+    def _release(self, conn: http.client.HTTPConnection) -> None:
+        try:
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            conn.close()
@@ -2,6 +2,7 @@
 
 Provides :class:`WeaviateStore`, which wraps the Weaviate REST client to
 support upsert, semantic search, and delete operations on pattern objects.
+Bulk upserts report a :class:`~pattern_language_miner.vector_store.base.BatchResult`.
 
 This is an implementation of the *Adapter* pattern: the Weaviate client API
 is adapted to the uniform interface expected by the pattern pipeline.
@@ -9,59 +10,244 @@ is adapted to the uniform interface expected by the pattern pipeline.
 
 from __future__ import annotations
 
+import itertools
+import json
 import logging
-from typing import Any, Dict, List, Optional
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
 
+import numpy as np
 import weaviate
 
+from .base import BatchResult, EmbedFunction
+from .rest import TRANSPORT_ERRORS, ConnectionPool
+
+if TYPE_CHECKING:
+    from ..cluster.embedding_cache import EmbeddingCache
+
 logger = logging.getLogger(__name__)
 
+#: HTTP statuses after which a batch request is retried.
+RETRYABLE_STATUSES: frozenset[int] = frozenset({429, 500, 502, 503, 504})
+
+#: Pattern properties returned by similarity queries.
+QUERY_PROPERTIES: List[str] = ["id", "name", "context", "solution"]
+
 
 class WeaviateStore:
     """Adapt the Weaviate client for pattern storage and retrieval.
 
+    The Weaviate client is created on first use.  Bulk upserts talk to the
+    REST batch endpoint directly through a pooled keep-alive
+    :class:`~pattern_language_miner.vector_store.rest.ConnectionPool`.
+
+    Patterns can be stored with locally computed vectors (for example from
+    :class:`~pattern_language_miner.cluster.embedding_cache.EmbeddingCache`),
+    in which case Weaviate does not vectorise them again.  Given an
+    *embed_fn*, text queries are embedded locally too and sent as
+    ``nearVector`` searches, so no remote vectoriser is involved at all.
+
     Args:
         url: Base URL of the running Weaviate instance.
         class_name: Weaviate class (collection) used to store patterns.
+        timeout: Socket timeout in seconds for bulk requests.
+        max_connections: Keep-alive connections kept open for bulk
+            requests; match it to the number of requests sent concurrently.
+        embed_fn: Optional function embedding query texts locally.  It must
+            be the model that produced the stored vectors.
+        query_cache_size: Number of ``(text, top_k)`` query results kept in
+            an LRU cache; ``0`` disables caching.  Any write clears it.
 
     Example:
         >>> store = WeaviateStore()
         >>> store.upsert_pattern({"id": "P-001", "name": "Install Package"})
         >>> results = store.query_similar_patterns("software installation")
+        >>> report = store.upsert_patterns(patterns, batch_size=200)
+        >>> neighbours = store.query_similar_patterns_batch(texts, top_k=3)
     """
 
     def __init__(
         self,
         url: str = "http://localhost:8080",
         class_name: str = "Pattern",
+        timeout: float = 30.0,
+        embed_fn: EmbedFunction | None = None,
+        query_cache_size: int = 0,
+        max_connections: int = 4,
     ) -> None:
-        self.client = weaviate.Client(url)
+        self.url = url
         self.class_name = class_name
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.embed_fn = embed_fn
+        self.query_cache_size = query_cache_size
+        self._query_cache: OrderedDict[Tuple[str, int], List[Dict[str, Any]]] = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._client: Any = None
+        self._pool: ConnectionPool | None = None
         logger.debug(
             "WeaviateStore initialised: url=%s, class=%s", url, class_name
         )
 
-    def upsert_pattern(self, pattern: Dict[str, Any]) -> None:
+    @property
+    def client(self) -> Any:
+        """The Weaviate client, created on first access."""
+        if self._client is None:
+            self._client = weaviate.Client(self.url)
+        return self._client
+
+    @client.setter
+    def client(self, value: Any) -> None:
+        self._client = value
+
+    def upsert_pattern(
+        self, pattern: Dict[str, Any], vector: Sequence[float] | None = None
+    ) -> None:
         """Insert or update *pattern* in the Weaviate index.
 
         The ``id`` field of *pattern* is used as the Weaviate object UUID.
 
         Args:
             pattern: Pattern dictionary.  Must contain an ``"id"`` key.
+            vector: Optional precomputed embedding.  When given, Weaviate
+                stores it instead of vectorising the pattern.
         """
         uuid = pattern["id"]
+        self.clear_query_cache()
         self.client.data_object.create(
             data_object=pattern,
             class_name=self.class_name,
             uuid=uuid,
+            vector=_as_vector(vector),
         )
         logger.debug("Upserted pattern %s.", uuid)
 
+    def upsert_patterns(
+        self,
+        patterns: Iterable[Dict[str, Any]],
+        vectors: Iterable[Sequence[float]] | None = None,
+        batch_size: int = 100,
+        concurrency: int = 4,
+        max_retries: int = 3,
+        backoff: float = 0.5,
+    ) -> BatchResult:
+        """Insert or update many patterns with Weaviate batch imports.
+
+        *patterns* is consumed lazily in chunks of *batch_size*; at most
+        ``2 * concurrency`` chunks are held in memory at once.  Each chunk is
+        sent as one ``POST /v1/batch/objects`` request.  Connection errors
+        and retryable statuses (429, 5xx) re-send the chunk after an
+        exponential backoff of ``backoff * 2**attempt`` seconds.  Objects
+        Weaviate rejects individually are reported, not retried, and never
+        abort the rest of the load.
+
+        Args:
+            patterns: Pattern dictionaries, each with an ``"id"`` key.
+            vectors: Optional precomputed embeddings aligned with
+                *patterns*; consumed lazily alongside them and required to
+                have the same length.
+            batch_size: Objects per batch request.
+            concurrency: Number of batch requests in flight.
+            max_retries: Retries per batch before its objects are reported
+                as failed.
+            backoff: Initial retry delay in seconds.
+
+        Returns:
+            A :class:`BatchResult` with the import count and a per-object
+            error report.
+
+        Raises:
+            ValueError: If *batch_size* or *concurrency* is below 1,
+                *max_retries* is negative, or *vectors* and *patterns*
+                differ in length.
+        """
+        if batch_size < 1 or concurrency < 1:
+            raise ValueError("batch_size and concurrency must be at least 1.")
+        if max_retries < 0:
+            raise ValueError("max_retries must not be negative.")
+
+        self.clear_query_cache()
+        result = BatchResult()
+        iterator = zip(patterns, vectors, strict=True) if vectors is not None else (
+            (pattern, None) for pattern in patterns
+        )
+        batches = iter(lambda: list(itertools.islice(iterator, batch_size)), [])
+        pending: Set[Future] = set()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            for batch in batches:
+                if len(pending) >= 2 * concurrency:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        result.merge(future.result())
+                pending.add(
+                    executor.submit(self.send_batch, batch, max_retries, backoff)
+                )
+            for future in pending:
+                result.merge(future.result())
+
+        logger.info(
+            "Batch upsert finished: %d imported, %d failed, %d retried request(s).",
+            result.imported,
+            result.failed,
+            result.retries,
+        )
+        return result
+
+    def upsert_patterns_from_cache(
+        self,
+        patterns: Sequence[Dict[str, Any]],
+        cache: EmbeddingCache,
+        field: str = "solution",
+        **kwargs: Any,
+    ) -> BatchResult:
+        """Bulk-upsert *patterns* with their vectors from *cache*.
+
+        Patterns whose *field* text has no cached embedding are not sent;
+        they are listed in the returned error report instead, so nothing is
+        vectorised remotely.
+
+        Args:
+            patterns: Pattern dictionaries, each with an ``"id"`` key.
+            cache: Embedding cache filled by
+                :class:`~pattern_language_miner.cluster.pattern_cluster.PatternClusterer`.
+            field: Pattern field whose text was embedded.
+            **kwargs: Forwarded to :meth:`upsert_patterns`.
+
+        Returns:
+            A :class:`BatchResult` covering all of *patterns*.
+        """
+        cached, missing = cache.lookup([str(p.get(field, "")) for p in patterns])
+        skipped = set(missing)
+        result = self.upsert_patterns(
+            (p for i, p in enumerate(patterns) if i not in skipped),
+            vectors=(v for i, v in enumerate(cached) if i not in skipped),
+            **kwargs,
+        )
+        for idx in missing:
+            result.errors[str(patterns[idx]["id"])] = f"no cached embedding for {field!r}"
+        return result
+
     def query_similar_patterns(
         self, text: str, top_k: int = 5
     ) -> List[Dict[str, Any]]:
         """Return the *top_k* patterns semantically closest to *text*.
 
+        With an :attr:`embed_fn` the query is embedded locally and run as
+        :meth:`query_by_vector`; otherwise Weaviate vectorises *text*.
+
         Args:
             text: Natural-language query string.
             top_k: Maximum number of results to return.
@@ -70,16 +256,101 @@ class WeaviateStore:
             A list of pattern dicts from Weaviate, each containing at least
             ``id``, ``name``, ``context``, and ``solution`` fields.
         """
-        results = (
-            self.client.query.get(
-                class_name=self.class_name,
-                properties=["id", "name", "context", "solution"],
+        cached = self._cache_get(text, top_k)
+        if cached is not None:
+            return cached
+        if self.embed_fn is not None:
+            found = self.query_by_vector(self.embed_fn(text), top_k=top_k)
+        else:
+            results = (
+                self.client.query.get(
+                    class_name=self.class_name,
+                    properties=QUERY_PROPERTIES,
+                )
+                .with_near_text({"concepts": [text]})
+                .with_limit(top_k)
+                .do()
             )
-            .with_near_text({"concepts": [text]})
-            .with_limit(top_k)
-            .do()
+            found = results["data"]["Get"].get(self.class_name, [])
+        self._cache_put(text, top_k, found)
+        return found
+
+    def query_similar_patterns_batch(
+        self,
+        texts: Iterable[str],
+        top_k: int = 5,
+        group_size: int = 20,
+        concurrency: int = 4,
+    ) -> List[List[Dict[str, Any]]]:
+        """Run :meth:`query_similar_patterns` for many texts at once.
+
+        Distinct, uncached texts are packed *group_size* at a time into one
+        GraphQL request, each as an aliased ``Get`` sub-query, and the
+        groups are sent concurrently over the pooled connections.
+
+        Args:
+            texts: Query strings.  Duplicates are only searched once.
+            top_k: Maximum number of results per text.
+            group_size: Sub-queries per GraphQL request.
+            concurrency: Number of requests in flight.
+
+        Returns:
+            One result list per input text, in input order.
+
+        Raises:
+            ValueError: If *group_size* or *concurrency* is below 1.
+            RuntimeError: If Weaviate reports a query error.
+        """
+        if group_size < 1 or concurrency < 1:
+            raise ValueError("group_size and concurrency must be at least 1.")
+        texts = list(texts)
+        found: Dict[str, List[Dict[str, Any]]] = {}
+        pending: List[str] = []
+        for text in dict.fromkeys(texts):
+            cached = self._cache_get(text, top_k)
+            if cached is None:
+                pending.append(text)
+            else:
+                found[text] = cached
+
+        groups = [pending[i:i + group_size] for i in range(0, len(pending), group_size)]
+        logger.debug(
+            "Batch query: %d text(s), %d cached, %d request(s).",
+            len(texts),
+            len(found),
+            len(groups),
+        )
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            answers = executor.map(lambda group: self._query_group(group, top_k), groups)
+            for group, objects in zip(groups, answers):
+                for text, result in zip(group, objects):
+                    found[text] = result
+                    self._cache_put(text, top_k, result)
+        return [list(found[text]) for text in texts]
+
+    def query_by_vector(
+        self, vector: Sequence[float], top_k: int = 5
+    ) -> List[Dict[str, Any]]:
+        """Return the *top_k* patterns closest to a precomputed *vector*.
+
+        Sends a GraphQL ``nearVector`` search over the pooled connection,
+        so no remote vectoriser is needed.
+
+        Args:
+            vector: Query embedding from the model used at upsert time.
+            top_k: Maximum number of results to return.
+
+        Returns:
+            Pattern dicts as in :meth:`query_similar_patterns`, each with an
+            ``_additional.distance`` entry.
+
+        Raises:
+            RuntimeError: If Weaviate reports a query error.
+        """
+        query = "{ Get { %s } }" % self._get_clause(
+            self.class_name, f"nearVector: {{vector: {json.dumps(_as_vector(vector))}}}", top_k
         )
-        return results["data"]["Get"].get(self.class_name, [])
+        return self._graphql(query).get(self.class_name) or []
 
     def delete_pattern(self, uuid: str) -> Optional[Dict[str, Any]]:
         """Remove the pattern identified by *uuid* from the index.
@@ -91,6 +362,166 @@ class WeaviateStore:
             The raw response from the Weaviate client, or ``None``.
         """
         logger.debug("Deleting pattern %s.", uuid)
+        self.clear_query_cache()
         return self.client.data_object.delete(
             uuid=uuid, class_name=self.class_name
         )
+
+    def send_batch(
+        self,
+        batch: List[Tuple[Dict[str, Any], Sequence[float] | None]],
+        max_retries: int = 3,
+        backoff: float = 0.5,
+    ) -> BatchResult:
+        """Send one batch request, retrying transient failures.
+
+        This is the single-request step of :meth:`upsert_patterns`, for
+        callers that do their own chunking and scheduling.  Unlike
+        :meth:`upsert_patterns` it leaves the query cache alone.
+
+        Args:
+            batch: ``(pattern, vector)`` pairs; *vector* may be ``None``.
+            max_retries: Retries before the objects are reported as failed.
+            backoff: Initial retry delay in seconds.
+
+        Returns:
+            A :class:`BatchResult` for the objects in *batch*.
+
+        Raises:
+            ValueError: If *max_retries* is negative.
+        """
+        if max_retries < 0:
+            raise ValueError("max_retries must not be negative.")
+        result = BatchResult()
+        objects = []
+        for pattern, vector in batch:
+            obj = {"class": self.class_name, "id": pattern["id"], "properties": pattern}
+            if vector is not None:
+                obj["vector"] = _as_vector(vector)
+            objects.append(obj)
+        payload = {"objects": objects}
+        patterns = [pattern for pattern, _ in batch]
+        for attempt in range(max_retries + 1):
+            if attempt:
+                result.retries += 1
+                time.sleep(backoff * 2 ** (attempt - 1))
+            try:
+                status, body = self.pool.request("POST", "/v1/batch/objects", payload)
+            except TRANSPORT_ERRORS as exc:
+                error = f"{type(exc).__name__}: {exc}"
+                logger.warning("Batch request failed (attempt %d): %s", attempt + 1, error)
+                continue
+            if status in RETRYABLE_STATUSES:
+                error = f"HTTP {status}: {body}"
+                logger.warning("Batch request failed (attempt %d): %s", attempt + 1, error)
+                continue
+            if status >= 400:
+                error = f"HTTP {status}: {body}"
+                break
+            return self._collect_errors(patterns, body, result)
+
+        for pattern in patterns:
+            result.errors[str(pattern["id"])] = error
+        return result
+
+    def clear_query_cache(self) -> None:
+        """Drop every cached query result."""
+        with self._cache_lock:
+            self._query_cache.clear()
+
+    def close(self) -> None:
+        """Close pooled bulk-request connections."""
+        if self._pool is not None:
+            self._pool.close()
+
+    # ------------------------------------------------------------------
+    # Private helpers
+    # ------------------------------------------------------------------
+
+    @property
+    def pool(self) -> ConnectionPool:
+        """Keep-alive connection pool used by bulk operations."""
+        if self._pool is None:
+            self._pool = ConnectionPool(
+                self.url, max_connections=self.max_connections, timeout=self.timeout
+            )
+        return self._pool
+
+    def _graphql(self, query: str) -> Dict[str, Any]:
+        """Run a ``Get`` query and return its ``data.Get`` mapping."""
+        status, body = self.pool.request("POST", "/v1/graphql", {"query": query})
+        if status >= 400 or not isinstance(body, dict) or body.get("errors"):
+            errors = body.get("errors") if isinstance(body, dict) else body
+            raise RuntimeError(f"Weaviate query failed (HTTP {status}): {errors}")
+        return (body.get("data") or {}).get("Get") or {}
+
+    def _get_clause(self, alias: str, search: str, top_k: int) -> str:
+        """Return one (optionally aliased) ``Get`` sub-query."""
+        prefix = "" if alias == self.class_name else f"{alias}: "
+        return "%s%s(%s, limit: %d) { %s _additional { distance } }" % (
+            prefix,
+            self.class_name,
+            search,
+            top_k,
+            " ".join(QUERY_PROPERTIES),
+        )
+
+    def _query_group(self, texts: List[str], top_k: int) -> List[List[Dict[str, Any]]]:
+        """Search *texts* with one aliased GraphQL request."""
+        clauses = []
+        for i, text in enumerate(texts):
+            if self.embed_fn is not None:
+                search = f"nearVector: {{vector: {json.dumps(_as_vector(self.embed_fn(text)))}}}"
+            else:
+                search = f"nearText: {{concepts: [{json.dumps(text)}]}}"
+            clauses.append(self._get_clause(f"q{i}", search, top_k))
+        data = self._graphql("{ Get { %s } }" % " ".join(clauses))
+        return [data.get(f"q{i}") or [] for i in range(len(texts))]
+
+    def _cache_get(self, text: str, top_k: int) -> List[Dict[str, Any]] | None:
+        if not self.query_cache_size:
+            return None
+        with self._cache_lock:
+            result = self._query_cache.get((text, top_k))
+            if result is not None:
+                self._query_cache.move_to_end((text, top_k))
+                return list(result)
+        return None
+
+    def _cache_put(self, text: str, top_k: int, result: List[Dict[str, Any]]) -> None:
+        if not self.query_cache_size:
+            return
+        with self._cache_lock:
+            self._query_cache[(text, top_k)] = list(result)
+            self._query_cache.move_to_end((text, top_k))
+            while len(self._query_cache) > self.query_cache_size:
+                self._query_cache.popitem(last=False)
+
+    @staticmethod
+    def _collect_errors(
+        batch: List[Dict[str, Any]], body: Any, result: BatchResult
+    ) -> BatchResult:
+        """Split a batch response into imported objects and object errors.
+
+        Objects without an entry in *body* (an empty or truncated response)
+        are reported as errors too, so every object is counted once.
+        """
+        items = body if isinstance(body, list) else []
+        for pattern in batch[len(items):]:
+            result.errors[str(pattern["id"])] = "missing from batch response"
+        for pattern, item in zip(batch, items):
+            errors = ((item.get("result") or {}).get("errors") or {}).get("error")
+            if errors:
+                result.errors[str(pattern["id"])] = "; ".join(
+                    e.get("message", str(e)) for e in errors
+                )
+            else:
+                result.imported += 1
+        return result
+
+
+def _as_vector(vector: Sequence[float] | None) -> List[float] | None:
+    """Convert *vector* (list or NumPy array) to a JSON-friendly list."""
+    if vector is None:
+        return None
+    return np.asarray(vector, dtype=np.float64).ravel().tolist()
@@ -4,29 +4,77 @@ This module provides two collaborating classes:
 
 - :class:`ParserFactory` — a *Factory Method* that selects the right
   :class:`~pattern_language_miner.parser.base_parser.BaseParser` for a
-  given file extension.
+  given file extension from an extensible registry.
 - :class:`DirectoryWalker` — recursively traverses a directory tree and
   yields ``(path, content, parser)`` tuples for every supported file.
 """
 
 from __future__ import annotations
 
+import codecs
 import logging
+import os
+import re
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Generator, Tuple
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Generator,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Union,
+)
 
 from .parser.base_parser import BaseParser
 from .parser.html_parser import HTMLParser
 from .parser.markdown_parser import MarkdownParser
 from .parser.text_parser import TextParser
+from .utils.chunked_reader import ChunkedText
 
 logger = logging.getLogger(__name__)
 
-#: File extensions handled by this package.
+#: File extensions handled out of the box.  More can be added with
+#: :meth:`ParserFactory.register`.
 SUPPORTED_EXTENSIONS: frozenset[str] = frozenset(
     {".txt", ".md", ".markdown", ".html", ".htm"}
 )
 
+#: Builds a parser from keyword options; called at most once per
+#: registration and set of options.
+ParserBuilder = Callable[..., BaseParser]
+
+#: Keyword options for parser builders, keyed by file extension.
+ParserOptions = Mapping[str, Mapping[str, Any]]
+
+#: File content as yielded by :meth:`DirectoryWalker.walk`.
+Content = Union[str, ChunkedText]
+
+#: Encodings tried in order when decoding a file.  ``latin-1`` maps every
+#: byte, so with the default chain no text file is dropped.
+DEFAULT_ENCODINGS: Tuple[str, ...] = ("utf-8", "cp1252", "latin-1")
+
+#: Bytes read to tell binary files from text and to pick an encoding.
+SNIFF_SIZE = 8192
+
+# Byte-order marks and the encodings they identify, longest first so that
+# UTF-32-LE is not mistaken for UTF-16-LE.
+_BOMS: Tuple[Tuple[bytes, str], ...] = (
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
 
 class ParserFactory:
     """Select the appropriate parser for a given file extension.
@@ -35,47 +83,152 @@ class ParserFactory:
     ask for a parser by extension without knowing which concrete class
     will be returned.
 
+    Parsers are stateless, so each registered builder is called once per
+    set of options and the instance is shared by every file (and thread)
+    with a matching extension.  Parsers with expensive setup, such as a
+    configured Markdown converter, therefore pay that cost once per
+    process.  New formats are added with :meth:`register`.
+
     Example:
         >>> parser = ParserFactory.get_parser(".md")
         >>> type(parser).__name__
         'MarkdownParser'
+        >>> parser is ParserFactory.get_parser(".markdown")
+        True
+        >>> ParserFactory.get_parser(".html", backend="lxml").backend
+        'lxml'
     """
 
-    @staticmethod
-    def get_parser(file_extension: str) -> BaseParser:
-        """Return a parser instance for *file_extension*.
+    _builders: Dict[str, ParserBuilder] = {
+        ".md": MarkdownParser,
+        ".markdown": MarkdownParser,
+        ".html": HTMLParser,
+        ".htm": HTMLParser,
+        ".txt": TextParser,
+    }
+    _instances: Dict[Tuple[ParserBuilder, Tuple[Tuple[str, Any], ...]], BaseParser] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def register(cls, extensions: str | Iterable[str], builder: ParserBuilder) -> None:
+        """Handle *extensions* with the parser built by *builder*.
+
+        Args:
+            extensions: One extension or several, with or without the
+                leading dot (case ignored).  Existing registrations are
+                replaced.
+            builder: A :class:`BaseParser` subclass or any callable
+                returning a parser instance.  It is called without
+                arguments unless options are passed to :meth:`get_parser`.
+
+        Example:
+            >>> ParserFactory.register([".rst", ".rest"], RstParser)
+        """
+        if isinstance(extensions, str):
+            extensions = [extensions]
+        with cls._lock:
+            for ext in extensions:
+                cls._builders["." + ext.lower().lstrip(".")] = builder
+
+    @classmethod
+    def supported_extensions(cls) -> frozenset[str]:
+        """Return every extension with a registered parser."""
+        return frozenset(cls._builders)
+
+    @classmethod
+    def get_parser(cls, file_extension: str, **options: Any) -> BaseParser:
+        """Return the shared parser instance for *file_extension*.
 
         Args:
             file_extension: The file extension including the leading dot
                 (e.g. ``".md"``).  Case is ignored.
+            **options: Keyword arguments for the parser's builder, such as
+                ``backend="lxml"`` for HTML.  Each distinct set of options
+                gets its own shared instance.
 
         Returns:
             A concrete :class:`~pattern_language_miner.parser.base_parser.BaseParser`
             instance appropriate for the supplied extension.
 
         Raises:
-            ValueError: If *file_extension* is not in
-                :data:`SUPPORTED_EXTENSIONS`.
+            ValueError: If no parser is registered for *file_extension*.
         """
-        ext = file_extension.lower()
-        if ext in {".md", ".markdown"}:
-            return MarkdownParser()
-        if ext in {".html", ".htm"}:
-            return HTMLParser()
-        if ext == ".txt":
-            return TextParser()
-        raise ValueError(f"Unsupported file extension: {file_extension!r}")
+        builder = cls._builders.get(file_extension.lower())
+        if builder is None:
+            raise ValueError(f"Unsupported file extension: {file_extension!r}")
+        key = (builder, tuple(sorted(options.items())))
+        parser = cls._instances.get(key)
+        if parser is None:
+            with cls._lock:
+                parser = cls._instances.get(key)
+                if parser is None:
+                    parser = cls._instances[key] = builder(**options)
+        return parser
 
 
 class DirectoryWalker:
     """Recursively walk a directory and yield parseable file contents.
 
-    Only files whose suffix belongs to :data:`SUPPORTED_EXTENSIONS` are
+    Only files with a parser registered in :class:`ParserFactory` are
     processed.  Files that cannot be read are logged at WARNING level and
     skipped gracefully.
 
+    The tree is enumerated lazily with :func:`os.scandir`, one directory at
+    a time, in the same order as ``sorted(root_dir.rglob("*"))``.  With
+    *workers* above 1, files are read on a thread pool that keeps up to
+    *prefetch* reads in flight ahead of the consumer, which hides latency
+    on network filesystems.  Results are still yielded in sorted order.
+
+    The first :data:`SNIFF_SIZE` bytes of every file are inspected before
+    it is read in full.  Files containing a NUL byte there (and no
+    UTF-16/32 byte-order mark) are binary and skipped.  Text is decoded
+    with the encoding named by a byte-order mark if there is one, else
+    with the first of *encodings* that decodes it.  Line endings are
+    normalised to ``\\n``.
+
+    *include* and *exclude* take glob patterns matched against paths
+    relative to *root_dir*, using ``/`` as separator.  A pattern without
+    a ``/`` matches a name at any depth (``node_modules``, ``*.min.html``);
+    one with a ``/`` matches from the root (``docs/api/**``), where ``**``
+    spans any number of directories.  Excluded directories are pruned
+    during the walk and never listed.
+
+    Files of at least *large_file_threshold* bytes are not read up front:
+    their content is yielded as a
+    :class:`~pattern_language_miner.utils.chunked_reader.ChunkedText`
+    that text and HTML parsers consume chunk by chunk via
+    :meth:`~pattern_language_miner.parser.base_parser.BaseParser.iter_blocks`.
+    Markdown needs the whole document and reads it into memory there.
+
     Args:
         root_dir: Path to the root directory to scan.
+        extensions: Restrict the walk to these extensions (with or without
+            the leading dot, case ignored).  Defaults to every extension
+            registered in :class:`ParserFactory`.
+        workers: Number of reader threads; ``1`` reads serially in the
+            calling thread.
+        prefetch: Maximum number of files read ahead of the consumer.
+            Defaults to ``4 * workers``.
+        large_file_threshold: Size in bytes from which content is read
+            lazily; ``None`` always reads whole files.
+        encodings: Encodings to try in order.  Defaults to
+            :data:`DEFAULT_ENCODINGS`.
+        include: If given, only files matching one of these patterns are
+            yielded.
+        exclude: Files and directories matching any of these patterns are
+            skipped.
+        max_file_size: Files larger than this many bytes are skipped
+            without being opened; ``None`` disables the limit.
+        parser_options: Keyword options passed to
+            :meth:`ParserFactory.get_parser` per extension, e.g.
+            ``{".html": {"backend": "lxml"}}``.
+
+    Raises:
+        ValueError: If *extensions* names an unsupported extension,
+            *encodings* names an unknown codec, *workers* or *prefetch*
+            is below 1, or *parser_options* are rejected by a parser.
+        ImportError: If *parser_options* select a parser backend that is
+            not installed.
 
     Example:
         >>> walker = DirectoryWalker("./docs")
@@ -83,31 +236,280 @@ class DirectoryWalker:
         ...     result = parser.parse(content)
     """
 
-    def __init__(self, root_dir: str | Path) -> None:
+    def __init__(
+        self,
+        root_dir: str | Path,
+        extensions: Iterable[str] | None = None,
+        workers: int = 1,
+        prefetch: int | None = None,
+        large_file_threshold: int | None = None,
+        encodings: Iterable[str] | None = None,
+        include: Iterable[str] | None = None,
+        exclude: Iterable[str] | None = None,
+        max_file_size: int | None = None,
+        parser_options: ParserOptions | None = None,
+    ) -> None:
         self.root_dir = Path(root_dir)
+        self.include = [_compile_glob(p) for p in include] if include else None
+        self.exclude = [_compile_glob(p) for p in exclude or []]
+        self.max_file_size = max_file_size
+        self.large_file_threshold = large_file_threshold
+        self.encodings = tuple(encodings or DEFAULT_ENCODINGS)
+        for encoding in self.encodings:
+            try:
+                codecs.lookup(encoding)
+            except LookupError:
+                raise ValueError(f"Unknown encoding: {encoding!r}") from None
+        self.workers = workers
+        self.prefetch = prefetch if prefetch is not None else 4 * workers
+        if self.workers < 1 or self.prefetch < 1:
+            raise ValueError("workers and prefetch must be at least 1.")
+        supported = ParserFactory.supported_extensions()
+        if extensions is None:
+            self.extensions = supported
+        else:
+            self.extensions = frozenset(
+                "." + ext.lower().lstrip(".") for ext in extensions
+            )
+            unsupported = self.extensions - supported
+            if unsupported:
+                raise ValueError(
+                    f"Unsupported file extension(s): {', '.join(sorted(unsupported))}. "
+                    f"Choose from: {', '.join(sorted(supported))}"
+                )
+        self.parser_options: Dict[str, Dict[str, Any]] = {
+            "." + ext.lower().lstrip("."): dict(options)
+            for ext, options in (parser_options or {}).items()
+        }
+        # Build configured parsers now so bad options fail here, not per file.
+        for ext, options in self.parser_options.items():
+            ParserFactory.get_parser(ext, **options)
 
     def walk(
         self,
-    ) -> Generator[Tuple[Path, str, BaseParser], None, None]:
+    ) -> Generator[Tuple[Path, Content, BaseParser], None, None]:
         """Yield ``(file_path, content, parser)`` for every supported file.
 
         Yields:
             A 3-tuple of:
 
             - :class:`~pathlib.Path` — absolute path to the file.
-            - *str* — raw text content of the file.
+            - *str* — raw text content of the file, or a
+              :class:`~pattern_language_miner.utils.chunked_reader.ChunkedText`
+              for files above :attr:`large_file_threshold`.
             - :class:`~pattern_language_miner.parser.base_parser.BaseParser`
               — the parser appropriate for this file type.
         """
-        for file_path in sorted(self.root_dir.rglob("*")):
-            if not file_path.is_file():
+        files = self.iter_files()
+        if self.workers == 1:
+            for file_path in files:
+                result = self._read(file_path)
+                if result is not None:
+                    yield result
+            return
+
+        pending: Deque[Future] = deque()
+        with ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="walker-read"
+        ) as pool:
+            try:
+                for file_path in files:
+                    pending.append(pool.submit(self._read, file_path))
+                    if len(pending) >= self.prefetch:
+                        result = pending.popleft().result()
+                        if result is not None:
+                            yield result
+                while pending:
+                    result = pending.popleft().result()
+                    if result is not None:
+                        yield result
+            finally:
+                # Abandoned early: drop reads that have not started yet.
+                for future in pending:
+                    future.cancel()
+
+    def iter_files(self) -> Iterator[Path]:
+        """Lazily yield every supported file below :attr:`root_dir` in sorted order.
+
+        A depth-first walk over name-sorted :func:`os.scandir` listings
+        visits paths in the order of ``sorted(root_dir.rglob("*"))``
+        without listing the whole tree first.  Symlinked directories are
+        not followed, and directories matching :attr:`exclude` are not
+        entered.
+
+        Yields:
+            Paths of files whose extension is in :attr:`extensions` and
+            that pass the include, exclude and size filters.
+        """
+        # Each level holds its remaining entries and its path relative to root.
+        stack: List[Tuple[Iterator[os.DirEntry], str]] = [
+            (self._scan(self.root_dir), "")
+        ]
+        while stack:
+            entries, prefix = stack[-1]
+            entry = next(entries, None)
+            if entry is None:
+                stack.pop()
                 continue
-            ext = file_path.suffix.lower()
-            if ext not in SUPPORTED_EXTENSIONS:
+            rel_path = prefix + entry.name
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if not _matches(self.exclude, rel_path):
+                        stack.append((self._scan(entry.path), rel_path + "/"))
+                    continue
+                is_file = entry.is_file()
+            except OSError:
                 continue
+            if (
+                is_file
+                and os.path.splitext(entry.name)[1].lower() in self.extensions
+                and (self.include is None or _matches(self.include, rel_path))
+                and not _matches(self.exclude, rel_path)
+                and self._within_size_limit(entry)
+            ):
+                yield Path(entry.path)
+
+    # ------------------------------------------------------------------
+    # Private helpers
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _scan(directory: str | Path) -> Iterator[os.DirEntry]:
+        """Return the entries of *directory* sorted by name."""
+        try:
+            with os.scandir(directory) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+        except OSError as exc:
+            logger.warning("Failed to list %s: %s", directory, exc)
+            entries = []
+        return iter(entries)
+
+    def _within_size_limit(self, entry: os.DirEntry) -> bool:
+        """Return whether *entry* is no larger than :attr:`max_file_size`."""
+        if self.max_file_size is None:
+            return True
+        try:
+            size = entry.stat().st_size
+        except OSError:
+            return True  # Let _read report the problem.
+        if size > self.max_file_size:
+            logger.info("Skipping %s: %d bytes exceeds max_file_size", entry.path, size)
+            return False
+        return True
+
+    def _read(self, file_path: Path) -> Optional[Tuple[Path, Content, BaseParser]]:
+        """Read *file_path* and pick its parser; ``None`` if that fails."""
+        try:
+            with file_path.open("rb") as fh:
+                head = fh.read(SNIFF_SIZE)
+                bom_encoding = _bom_encoding(head)
+                if bom_encoding is None and b"\0" in head:
+                    logger.info("Skipping binary file %s", file_path)
+                    return None
+                content: Content
+                if (
+                    self.large_file_threshold is not None
+                    and file_path.stat().st_size >= self.large_file_threshold
+                ):
+                    encoding = bom_encoding or self._sniff_encoding(head)
+                    content = ChunkedText(
+                        file_path, encoding=encoding, errors="replace"
+                    )
+                else:
+                    content = self._decode(head + fh.read(), bom_encoding, file_path)
+            parser = ParserFactory.get_parser(
+                file_path.suffix,
+                **self.parser_options.get(file_path.suffix.lower(), {}),
+            )
+            return file_path, content, parser
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("Failed to read or parse %s: %s", file_path, exc)
+            return None
+
+    def _decode(self, data: bytes, bom_encoding: str | None, file_path: Path) -> str:
+        """Decode *data* with the first workable encoding.
+
+        Raises:
+            UnicodeDecodeError: If no encoding in :attr:`encodings` fits.
+        """
+        candidates = (bom_encoding,) if bom_encoding else self.encodings
+        error: UnicodeDecodeError | None = None
+        for encoding in candidates:
             try:
-                content = file_path.read_text(encoding="utf-8")
-                parser = ParserFactory.get_parser(ext)
-                yield file_path, content, parser
-            except Exception as exc:  # noqa: BLE001
-                logger.warning("Failed to read or parse %s: %s", file_path, exc)
+                text = data.decode(encoding)
+            except UnicodeDecodeError as exc:
+                error = error or exc
+                continue
+            if encoding != candidates[0]:
+                logger.debug("Decoded %s as %s", file_path, encoding)
+            return text.replace("\r\n", "\n").replace("\r", "\n")
+        assert error is not None
+        raise error
+
+    def _sniff_encoding(self, head: bytes) -> str:
+        """Pick the first encoding that decodes the start of a large file.
+
+        Later undecodable bytes in a streamed file are replaced with
+        U+FFFD rather than aborting the analysis mid-file.
+        """
+        for encoding in self.encodings:
+            try:
+                # Not final: a multi-byte character may be cut at the end.
+                codecs.getincrementaldecoder(encoding)().decode(head, final=False)
+            except UnicodeDecodeError:
+                continue
+            return encoding
+        return self.encodings[-1]
+
+
+def _compile_glob(pattern: str) -> re.Pattern:
+    """Translate a walker glob *pattern* into a compiled regular expression.
+
+    ``*`` and ``?`` stay within one path component, ``**`` spans any
+    number of them, and a pattern without ``/`` may match at any depth.
+    A trailing ``/**`` also matches the directory itself, so that it can
+    be pruned.
+    """
+    glob = pattern.strip("/")
+    parts = [] if "/" in glob else ["(?:.*/)?"]
+    i = 0
+    while i < len(glob):
+        if glob.startswith("**/", i):
+            parts.append("(?:.*/)?")
+            i += 3
+        elif glob.startswith("/**", i) and i + 3 == len(glob):
+            parts.append("(?:/.*)?")
+            i += 3
+        elif glob.startswith("**", i):
+            parts.append(".*")
+            i += 2
+        elif glob[i] == "*":
+            parts.append("[^/]*")
+            i += 1
+        elif glob[i] == "?":
+            parts.append("[^/]")
+            i += 1
+        elif glob[i] == "[" and "]" in glob[i + 2 :]:
+            end = glob.index("]", i + 2)
+            body = glob[i + 1 : end]
+            if body.startswith("!"):
+                body = "^" + body[1:]
+            parts.append("[" + body.replace("\\", "\\\\") + "]")
+            i = end + 1
+        else:
+            parts.append(re.escape(glob[i]))
+            i += 1
+    return re.compile("".join(parts))
+
+
+def _matches(patterns: Iterable[re.Pattern], rel_path: str) -> bool:
+    """Return whether *rel_path* fully matches any of *patterns*."""
+    return any(pattern.fullmatch(rel_path) for pattern in patterns)
+
+
+def _bom_encoding(head: bytes) -> str | None:
+    """Return the encoding announced by a byte-order mark in *head*, if any."""
+    for bom, encoding in _BOMS:
+        if head.startswith(bom):
+            return encoding
+    return None
@@ -3,12 +3,21 @@
 from __future__ import annotations
 
 import json
+import struct
+import subprocess
+import sys
 from pathlib import Path
 
+import numpy as np
 import pytest
 import yaml
 
+from pattern_language_miner.cluster import backends
+from pattern_language_miner.cluster.assignment import ClusterModel, assign_to_centroids
+from pattern_language_miner.cluster.embedding_cache import EmbeddingCache, text_key
+from pattern_language_miner.cluster.neighbors import NeighborIndex
 from pattern_language_miner.cluster.pattern_cluster import PatternClusterer
+from pattern_language_miner.cluster.raster import rasterize_points
 
 
 # ---------------------------------------------------------------------------
@@ -113,3 +122,343 @@ def test_generate_cluster_report_cluster_ids_are_ints(tmp_path, temp_pattern_dir
     data = json.loads(out.read_text(encoding="utf-8"))
     for entry in data:
         assert isinstance(entry["cluster"], int)
+
+
+# ---------------------------------------------------------------------------
+# Automatic k selection and embedding cache
+# ---------------------------------------------------------------------------
+
+
+class CountingEncoder:
+    """Deterministic stand-in for a sentence transformer that counts calls."""
+
+    def __init__(self) -> None:
+        self.encoded: list = []
+
+    def encode(self, texts, show_progress_bar=False):
+        self.encoded.extend(texts)
+        return np.array([[len(t), t.count("o"), 1.0] for t in texts], dtype=float)
+
+
+def make_blobs(n_per_blob: int = 20, centers: int = 3) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    points = [
+        rng.normal(loc=i * 10.0, scale=0.3, size=(n_per_blob, 4))
+        for i in range(centers)
+    ]
+    return np.vstack(points)
+
+
+@pytest.mark.parametrize("metric", ["silhouette", "elbow"])
+def test_select_n_clusters_finds_blob_count(tmp_path, metric):
+    """The sweep recovers the number of well-separated blobs."""
+    clusterer = PatternClusterer(input_dir=tmp_path, field="solution")
+    best_k, scores = clusterer.select_n_clusters(
+        make_blobs(), k_min=2, k_max=6, metric=metric
+    )
+    assert best_k == 3
+    assert sorted(scores) == [2, 3, 4, 5, 6]
+
+
+def test_select_n_clusters_clamps_k_max(tmp_path):
+    clusterer = PatternClusterer(input_dir=tmp_path, field="solution")
+    _, scores = clusterer.select_n_clusters(make_blobs(2, 2), k_min=2, k_max=50)
+    assert max(scores) == 3
+
+
+def test_select_n_clusters_falls_back_to_one_cluster(tmp_path):
+    clusterer = PatternClusterer(input_dir=tmp_path, field="solution")
+    assert clusterer.select_n_clusters(make_blobs(1, 2)) == (1, {})
+
+
+def test_tiny_input_clusters_without_umap(tmp_path):
+    clusterer = PatternClusterer(input_dir=tmp_path, field="solution")
+    embeddings = make_blobs(1, 2)
+    n_clusters, _ = clusterer.select_n_clusters(embeddings)
+    reduced, ids = clusterer.cluster_and_reduce(embeddings, n_clusters=n_clusters)
+
+    assert reduced.shape == (2, 2)
+    assert ids.tolist() == [0, 0]
+
+
+def test_select_n_clusters_rejects_unknown_metric(tmp_path):
+    clusterer = PatternClusterer(input_dir=tmp_path, field="solution")
+    with pytest.raises(ValueError, match="Unsupported"):
+        clusterer.select_n_clusters(make_blobs(), metric="gap")
+
+
+def test_embedding_cache_skips_encoded_texts(tmp_path, temp_pattern_dir):
+    """A second run only encodes patterns missing from the cache."""
+    cache = tmp_path / "cache" / "embeddings.npz"
+    first = PatternClusterer(temp_pattern_dir, field="solution", cache_path=cache)
+    first.model = CountingEncoder()
+    first.load_patterns()
+    expected = first.embed_patterns()
+    assert len(first.model.encoded) == 6
+    assert cache.exists()
+
+    (temp_pattern_dir / "pattern-7.yaml").write_text(
+        yaml.dump({"id": "pattern-7", "solution": "Use podman"}), encoding="utf-8"
+    )
+    second = PatternClusterer(temp_pattern_dir, field="solution", cache_path=cache)
+    second.model = CountingEncoder()
+    second.load_patterns()
+    embeddings = second.embed_patterns()
+
+    assert second.model.encoded == ["Use podman"]
+    assert embeddings.shape == (7, 3)
+    np.testing.assert_allclose(embeddings[:6], expected)
+
+
+def test_embedding_cache_ignores_other_model(tmp_path):
+    cache_file = tmp_path / "embeddings.npz"
+    cache = EmbeddingCache(cache_file, "model-a")
+    cache.update(["hello"], np.ones((1, 3)))
+    cache.save()
+
+    _, missing = EmbeddingCache(cache_file, "model-b").lookup(["hello"])
+    assert missing == [0]
+    vectors, missing = EmbeddingCache(cache_file, "model-a").lookup(["hello"])
+    assert missing == []
+    np.testing.assert_allclose(vectors[0], np.ones(3))
+
+
+# ---------------------------------------------------------------------------
+# Incremental assignment
+# ---------------------------------------------------------------------------
+
+
+def make_model(field: str = "solution") -> ClusterModel:
+    """A two-cluster model over CountingEncoder vectors for 'aa' and 'oooooo'."""
+    return ClusterModel(
+        centroids=np.array([[2.0, 0.0, 1.0], [6.0, 6.0, 1.0]]),
+        labels={text_key("aa"): 0, text_key("oooooo"): 1},
+        model_name="all-MiniLM-L6-v2",
+        field=field,
+        baseline_distance=1.0,
+    )
+
+
+def test_assign_to_centroids_picks_nearest():
+    labels, distances = assign_to_centroids(
+        np.array([[0.0, 0.0], [9.0, 9.0], [1.0, 0.0]]),
+        np.array([[0.0, 0.0], [10.0, 10.0]]),
+    )
+    assert labels.tolist() == [0, 1, 0]
+    np.testing.assert_allclose(distances, [0.0, np.sqrt(2.0), 1.0])
+
+
+def test_assign_to_centroids_without_centroids_is_noise():
+    labels, distances = assign_to_centroids(np.ones((2, 3)), np.empty((0, 3)))
+    assert labels.tolist() == [-1, -1]
+    assert np.isinf(distances).all()
+
+
+def test_cluster_model_round_trip(tmp_path):
+    model = make_model()
+    model.save(tmp_path / "model.npz")
+    loaded = ClusterModel.load(tmp_path / "model.npz")
+    np.testing.assert_allclose(loaded.centroids, model.centroids)
+    assert loaded.labels == model.labels
+    assert loaded.field == "solution"
+    assert loaded.baseline_distance == 1.0
+
+
+def test_assign_patterns_embeds_only_new_patterns(tmp_path):
+    clusterer = PatternClusterer(input_dir=tmp_path, field="solution")
+    clusterer.model = CountingEncoder()
+    clusterer.patterns = [
+        {"solution": "oooooo"},
+        {"solution": "aa"},
+        {"solution": "bb"},
+        {"solution": "ooooo"},
+    ]
+
+    cluster_ids, refitted = clusterer.assign_patterns(make_model())
+
+    assert not refitted
+    assert clusterer.model.encoded == ["bb", "ooooo"]
+    assert cluster_ids.tolist() == [1, 0, 0, 1]
+    assert clusterer.cluster_model.labels[text_key("bb")] == 0
+
+
+def test_assign_patterns_refits_on_drift(tmp_path):
+    clusterer = PatternClusterer(input_dir=tmp_path, field="solution")
+    clusterer.model = CountingEncoder()
+    clusterer.patterns = [
+        {"solution": "aa"},
+        {"solution": "oooooo"},
+        {"solution": "x" * 40},
+    ]
+
+    cluster_ids, refitted = clusterer.assign_patterns(make_model(), drift_threshold=2.0)
+
+    assert refitted
+    assert len(cluster_ids) == 3
+    # Seeding from the old centroids keeps the original ids in place.
+    assert cluster_ids[0] == 0
+    assert clusterer.cluster_model.labels[text_key("x" * 40)] == cluster_ids[2]
+
+
+def test_assign_patterns_rejects_other_field(tmp_path):
+    clusterer = PatternClusterer(input_dir=tmp_path, field="title")
+    with pytest.raises(ValueError, match="field"):
+        clusterer.assign_patterns(make_model())
+
+
+def test_assign_patterns_rejects_model_without_clusters(tmp_path):
+    model = make_model()
+    model.centroids = np.empty((0, 3))
+    clusterer = PatternClusterer(input_dir=tmp_path, field="solution")
+    clusterer.model = CountingEncoder()
+    clusterer.patterns = [{"solution": "bb"}]
+    with pytest.raises(ValueError, match="no clusters"):
+        clusterer.assign_patterns(model)
+    assert clusterer.model.encoded == []
+
+
+# ---------------------------------------------------------------------------
+# Raster rendering
+# ---------------------------------------------------------------------------
+
+
+def test_rasterize_points_colours_only_occupied_pixels():
+    points = np.array([[0.0, 0.0], [1.0, 1.0], [1.0, 1.0]])
+    image = rasterize_points(points, np.array([0, 1, 1]), width=10, height=5)
+
+    assert image.shape == (5, 10, 3)
+    assert image.dtype == np.uint8
+    # Origin maps to the bottom-left corner, (1, 1) to the top-right.
+    assert tuple(image[4, 0]) != (255, 255, 255)
+    assert tuple(image[0, 9]) != (255, 255, 255)
+    assert (image[1:4, 1:9] == 255).all()
+    # The denser pixel is drawn more opaquely.
+    assert image[0, 9].sum() < image[4, 0].sum()
+
+
+def test_raster_backend_writes_png_without_matplotlib(tmp_path):
+    clusterer = PatternClusterer(input_dir=tmp_path, field="solution")
+    rng = np.random.default_rng(1)
+    out = tmp_path / "clusters.png"
+    clusterer.visualize_clusters(
+        rng.normal(size=(5000, 2)), rng.integers(-1, 4, 5000), out, backend="raster"
+    )
+
+    data = out.read_bytes()
+    assert data.startswith(b"\x89PNG\r\n\x1a\n")
+    width, height = struct.unpack(">II", data[16:24])
+    assert (width, height) == (1000, 600)
+
+
+def test_visualize_clusters_rejects_unknown_backend(tmp_path):
+    clusterer = PatternClusterer(input_dir=tmp_path, field="solution")
+    with pytest.raises(ValueError, match="Unsupported"):
+        clusterer.visualize_clusters(np.zeros((1, 2)), np.zeros(1), tmp_path / "x.png", "svg")
+
+
+def test_matplotlib_backend_plots_off_the_main_thread(tmp_path):
+    import threading
+
+    clusterer = PatternClusterer(input_dir=tmp_path, field="solution")
+    output = tmp_path / "clusters.png"
+    worker = threading.Thread(
+        target=clusterer.visualize_clusters,
+        args=(make_blobs(5, 2)[:, :2], np.array([0] * 5 + [1] * 5), output),
+    )
+    worker.start()
+    worker.join()
+
+    assert output.read_bytes().startswith(b"\x89PNG")
+    assert "matplotlib.pyplot" not in sys.modules
+
+
+def test_matplotlib_is_not_imported_eagerly():
+    code = (
+        "import sys, pattern_language_miner.cluster.pattern_cluster; "
+        "print('matplotlib' in sys.modules)"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "False"
+
+
+# ---------------------------------------------------------------------------
+# Clustering backends and the shared neighbour index
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize("algorithm", ["kmeans", "agglomerative", "hdbscan"])
+def test_backends_separate_blobs(tmp_path, algorithm):
+    clusterer = PatternClusterer(input_dir=tmp_path, field="solution")
+    reduced, ids = clusterer.cluster_and_reduce(
+        make_blobs(), n_clusters=3, algorithm=algorithm, min_cluster_size=5
+    )
+
+    assert reduced.shape == (60, 2)
+    assert len(set(ids.tolist()) - {-1}) == 3
+    for blob in range(3):
+        assert len(set(ids[blob * 20:(blob + 1) * 20].tolist())) == 1
+
+
+def test_cluster_and_reduce_rejects_unknown_algorithm(tmp_path):
+    clusterer = PatternClusterer(input_dir=tmp_path, field="solution")
+    with pytest.raises(ValueError, match="Unsupported"):
+        clusterer.cluster_and_reduce(make_blobs(), algorithm="dbscan")
+
+
+def test_neighbor_index_is_reused(tmp_path, monkeypatch):
+    cache = tmp_path / "neighbors.npz"
+    embeddings = make_blobs()
+    first = PatternClusterer(input_dir=tmp_path, field="solution", neighbor_cache_path=cache)
+    index = first.neighbor_index(embeddings, n_neighbors=10)
+    assert cache.exists()
+
+    def fail(*args, **kwargs):
+        raise AssertionError("neighbour index rebuilt")
+
+    monkeypatch.setattr(NeighborIndex, "build", classmethod(fail))
+    second = PatternClusterer(input_dir=tmp_path, field="solution", neighbor_cache_path=cache)
+    smaller = second.neighbor_index(embeddings, n_neighbors=5)
+    np.testing.assert_array_equal(smaller.indices, index.indices[:, :5])
+    with pytest.raises(AssertionError, match="rebuilt"):
+        second.neighbor_index(embeddings + 1.0, n_neighbors=5)
+
+
+def test_distance_graph_bridges_components():
+    embeddings = make_blobs(10, 2)
+    index = NeighborIndex.build(embeddings, n_neighbors=4)
+    graph = index.distance_graph(embeddings)
+
+    assert (graph != graph.T).nnz == 0
+    from scipy.sparse.csgraph import connected_components
+
+    assert connected_components(graph, directed=False)[0] == 1
+
+
+def test_hdbscan_keeps_duplicate_embeddings_together(tmp_path):
+    rng = np.random.default_rng(0)
+    centers = rng.normal(scale=5.0, size=(4, 8))
+    groups = [np.repeat(center[None, :], 10, axis=0) for center in centers]
+    embeddings = np.vstack(groups + [rng.normal(scale=5.0, size=(5, 8))])
+    index = NeighborIndex.build(embeddings, n_neighbors=15)
+    graph = index.distance_graph(embeddings)
+    assert graph.diagonal().sum() == 0
+    assert graph[0, 1] > 0
+
+    ids = backends._hdbscan(embeddings, index, 0, 5)
+    assert len(set(ids[:40].tolist()) - {-1}) == 4
+    for group in range(4):
+        assert len(set(ids[group * 10:(group + 1) * 10].tolist())) == 1
+
+
+def test_register_backend(tmp_path, monkeypatch):
+    monkeypatch.setattr(backends, "_BACKENDS", dict(backends._BACKENDS))
+    backends.register_backend(
+        "first-half", lambda emb, nn, k, m: (np.arange(len(emb)) >= len(emb) // 2).astype(int)
+    )
+    clusterer = PatternClusterer(input_dir=tmp_path, field="solution")
+    _, ids = clusterer.cluster_and_reduce(make_blobs(), algorithm="first-half")
+
+    assert "first-half" in backends.available_backends()
+    assert ids.tolist() == [0] * 30 + [1] * 30
@@ -0,0 +1,129 @@
+"""Unit tests for cluster report reading/writing and its CLI consumers."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+from click.testing import CliRunner
+
+from pattern_language_miner.cli import cli
+from pattern_language_miner.cluster.cluster_report import (
+    iter_cluster_report,
+    report_format_for,
+    write_cluster_report,
+)
+from pattern_language_miner.cluster.pattern_cluster import PatternClusterer
+
+
+PATTERNS = [
+    {"title": "Install Package", "tags": ["setup"]},
+    {"title": "Restart Service", "tags": ["ops"]},
+    {"title": "Delete File", "tags": ["cleanup"]},
+]
+
+
+@pytest.fixture()
+def in_tmp_dir(tmp_path, monkeypatch) -> Path:
+    """Run CLI commands from *tmp_path* so the log directory lands there."""
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+# ---------------------------------------------------------------------------
+# Report I/O
+# ---------------------------------------------------------------------------
+
+
+class TestClusterReport:
+    def test_format_inferred_from_suffix(self):
+        assert report_format_for("out/clustered_patterns.jsonl") == "jsonl"
+        assert report_format_for("out/clustered_patterns.json") == "json"
+
+    def test_jsonl_has_one_compact_row_per_line(self, tmp_path):
+        out = tmp_path / "report.jsonl"
+        count = write_cluster_report(zip(PATTERNS, [0, 1, 0]), out)
+
+        lines = out.read_text(encoding="utf-8").splitlines()
+        assert count == 3
+        assert len(lines) == 3
+        assert json.loads(lines[1]) == {**PATTERNS[1], "cluster": 1}
+        assert ": " not in lines[0]
+
+    def test_json_round_trip(self, tmp_path):
+        out = tmp_path / "report.json"
+        write_cluster_report(zip(PATTERNS, np.array([2, 1, 0])), out)
+        rows = list(iter_cluster_report(out))
+        assert [r["cluster"] for r in rows] == [2, 1, 0]
+        assert all(isinstance(r["cluster"], int) for r in rows)
+
+    def test_jsonl_is_read_lazily(self, tmp_path):
+        out = tmp_path / "report.jsonl"
+        write_cluster_report(zip(PATTERNS, [0, 0, 1]), out)
+        rows = iter_cluster_report(out)
+        assert next(rows)["title"] == "Install Package"
+
+    def test_unknown_suffix_is_sniffed(self, tmp_path):
+        out = tmp_path / "report.txt"
+        out.write_text(json.dumps(PATTERNS), encoding="utf-8")
+        assert len(list(iter_cluster_report(out))) == 3
+
+    def test_unsupported_format_raises(self, tmp_path):
+        with pytest.raises(ValueError, match="Unsupported"):
+            write_cluster_report([], tmp_path / "r.csv", "csv")
+
+    def test_clusterer_groups_jsonl_rows_by_cluster(self, tmp_path):
+        clusterer = PatternClusterer(input_dir=tmp_path, field="title")
+        clusterer.patterns = PATTERNS
+        out = tmp_path / "report.jsonl"
+        clusterer.generate_cluster_report(np.array([1, 0, 1]), out)
+
+        rows = list(iter_cluster_report(out))
+        assert [r["cluster"] for r in rows] == [0, 1, 1]
+        assert [r["title"] for r in rows[1:]] == ["Install Package", "Delete File"]
+
+
+# ---------------------------------------------------------------------------
+# CLI consumers
+# ---------------------------------------------------------------------------
+
+
+class TestReportConsumers:
+    @pytest.mark.parametrize("suffix", [".json", ".jsonl"])
+    def test_summarize_clusters(self, in_tmp_dir, suffix):
+        report = in_tmp_dir / f"clustered{suffix}"
+        if suffix == ".json":
+            write_cluster_report(zip(PATTERNS, [1, 0, 1]), report)
+        else:
+            # JSONL reports are streamed, so they must arrive grouped by cluster.
+            rows = zip([PATTERNS[1], PATTERNS[0], PATTERNS[2]], [0, 1, 1])
+            write_cluster_report(rows, report)
+        summary = in_tmp_dir / "summary.md"
+
+        result = CliRunner().invoke(
+            cli,
+            ["summarize-clusters", "--input-json", str(report),
+             "--output-path", str(summary)],
+        )
+
+        assert result.exit_code == 0, result.output
+        text = summary.read_text(encoding="utf-8")
+        assert text.index("## Cluster 0") < text.index("## Cluster 1")
+        assert text.count("## Cluster") == 2
+        assert "- **Delete File**" in text
+
+    def test_export_graph_from_jsonl(self, in_tmp_dir):
+        report = in_tmp_dir / "clustered.jsonl"
+        write_cluster_report(zip(PATTERNS, [0, 0, 1]), report)
+        out = in_tmp_dir / "graph.mmd"
+
+        result = CliRunner().invoke(
+            cli,
+            ["export-graph", "--input-json", str(report),
+             "--output-path", str(out), "--format", "mermaid"],
+        )
+
+        assert result.exit_code == 0, result.output
+        assert "Install_Package -->|has_tag| setup" in out.read_text(encoding="utf-8")
@@ -0,0 +1,173 @@
+"""Unit tests for near-duplicate pattern deduplication."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+import yaml
+from click.testing import CliRunner
+
+from pattern_language_miner.cli import cli
+from pattern_language_miner.cluster.embedding_cache import EmbeddingCache
+from pattern_language_miner.dedup.minhash import lsh_buckets, minhash_signatures, shingles
+from pattern_language_miner.dedup.pattern_dedup import (
+    PatternDeduplicator,
+    deduplicate_patterns,
+    find_duplicate_groups,
+)
+
+
+def by_text(patterns):
+    return {p["pattern"]: p for p in patterns}
+
+
+# ---------------------------------------------------------------------------
+# MinHash / LSH
+# ---------------------------------------------------------------------------
+
+
+class TestMinHash:
+    def test_signature_agreement_tracks_jaccard(self):
+        sets = [shingles("install the package"), shingles("install the packages"),
+                shingles("restart the service")]
+        sig = minhash_signatures(sets, num_perm=128)
+        assert (sig[0] == sig[1]).mean() > 0.7
+        assert (sig[0] == sig[2]).mean() < 0.3
+
+    def test_identical_sets_share_every_bucket(self):
+        sig = minhash_signatures([{"ab", "bc"}, {"ab", "bc"}, {"xy"}], num_perm=8)
+        buckets = [sorted(b.tolist()) for b in lsh_buckets(sig, bands=4)]
+        assert buckets == [[0, 1]] * 4
+
+    def test_bands_must_divide_signature(self):
+        with pytest.raises(ValueError):
+            list(lsh_buckets(np.zeros((2, 10), dtype=np.int64), bands=3))
+
+
+# ---------------------------------------------------------------------------
+# Grouping and merging
+# ---------------------------------------------------------------------------
+
+
+class TestDeduplicatePatterns:
+    def test_contained_pattern_is_merged_without_double_counting(self):
+        result = deduplicate_patterns([
+            {"pattern": "install the package", "frequency": 10},
+            {"pattern": "install the package using", "frequency": 4},
+            {"pattern": "restart the service", "frequency": 3},
+        ])
+        merged = by_text(result)
+        assert set(merged) == {"install the package", "restart the service"}
+        assert merged["install the package"]["frequency"] == 10
+        assert merged["install the package"]["related_patterns"] == [
+            "install the package using"
+        ]
+
+    def test_rare_superstring_of_common_phrase_is_kept(self):
+        result = deduplicate_patterns(
+            [
+                {"pattern": "of the", "frequency": 500},
+                {"pattern": "list of the files", "frequency": 3},
+            ]
+        )
+        assert len(result) == 2
+
+    def test_equal_frequency_prefers_the_longer_pattern(self):
+        result = deduplicate_patterns([
+            {"pattern": "the package", "frequency": 5},
+            {"pattern": "install the package", "frequency": 5},
+        ])
+        assert [p["pattern"] for p in result] == ["install the package"]
+        assert result[0]["frequency"] == 5
+
+    def test_lexical_near_duplicates_sum_frequencies(self):
+        result = deduplicate_patterns([
+            {"pattern": "configure the network interfaces", "frequency": 6},
+            {"pattern": "configure the network interface", "frequency": 2},
+        ], min_containment=2)
+        assert len(result) == 1
+        assert result[0]["pattern"] == "configure the network interfaces"
+        assert result[0]["frequency"] == 8
+
+    def test_semantic_pass_uses_embeddings(self):
+        texts = ["remove the file", "delete the file", "open the door"]
+        embeddings = np.array([[1.0, 0.05, 0.0], [1.0, 0.0, 0.0], [0.0, 0.0, 1.0]])
+        groups = find_duplicate_groups(
+            texts, [3, 2, 1], min_containment=2, jaccard_threshold=2,
+            embeddings=embeddings, cosine_threshold=0.95,
+        )
+        assert [(g.representative, g.members, g.frequency) for g in groups] == [
+            (0, [1], 5),
+            (2, [], 1),
+        ]
+
+    def test_zero_embeddings_are_ignored(self):
+        groups = find_duplicate_groups(
+            ["a b", "c d"], [1, 1], min_containment=2, jaccard_threshold=2,
+            embeddings=np.zeros((2, 3)),
+        )
+        assert len(groups) == 2
+
+    def test_input_is_not_mutated(self):
+        patterns = [{"pattern": "a b", "frequency": 2}, {"pattern": "a b c", "frequency": 2}]
+        deduplicate_patterns(patterns)
+        assert "related_patterns" not in patterns[0]
+        assert "related_patterns" not in patterns[1]
+
+    def test_scales_linearly(self):
+        rng = np.random.default_rng(0)
+        words = [f"w{i}" for i in range(2000)]
+        patterns = [
+            {"pattern": " ".join(rng.choice(words, 3)), "frequency": int(f)}
+            for f in rng.integers(1, 20, 5000)
+        ]
+        assert len(deduplicate_patterns(patterns)) <= len(patterns)
+
+
+# ---------------------------------------------------------------------------
+# Directory and CLI
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture()
+def raw_pattern_dir(tmp_path: Path) -> Path:
+    d = tmp_path / "raw"
+    d.mkdir()
+    rows = [("install the package", 10), ("install the package using", 4),
+            ("delete the file", 3), ("remove the file", 2)]
+    for i, (text, freq) in enumerate(rows, start=1):
+        (d / f"pattern-{i:05d}.yaml").write_text(
+            yaml.dump({"pattern": text, "frequency": freq}), encoding="utf-8"
+        )
+    return d
+
+
+class TestPatternDeduplicator:
+    def test_run_keeps_representative_filenames(self, raw_pattern_dir, tmp_path):
+        out = tmp_path / "deduped"
+        PatternDeduplicator(raw_pattern_dir, out).run()
+        assert sorted(p.name for p in out.iterdir()) == [
+            "pattern-00001.yaml", "pattern-00003.yaml", "pattern-00004.yaml",
+        ]
+
+    def test_cli_uses_embedding_cache(self, raw_pattern_dir, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        cache = EmbeddingCache(tmp_path / "embeddings.npz", "test-model")
+        cache.update(["delete the file", "remove the file"], np.array([[1.0, 0.0], [1.0, 0.01]]))
+        cache.save()
+        out = tmp_path / "deduped"
+
+        result = CliRunner().invoke(
+            cli,
+            ["dedup", "--input-dir", str(raw_pattern_dir), "--output-dir", str(out),
+             "--embedding-cache", str(tmp_path / "embeddings.npz"),
+             "--model-name", "test-model"],
+        )
+
+        assert result.exit_code == 0, result.output
+        merged = yaml.safe_load((out / "pattern-00003.yaml").read_text(encoding="utf-8"))
+        assert merged["frequency"] == 5
+        assert merged["related_patterns"] == ["remove the file"]
+        assert len(list(out.iterdir())) == 2
@@ -7,7 +7,16 @@ from pathlib import Path
 import pytest
 import yaml
 
-from pattern_language_miner.extractor.pattern_extractor import PatternExtractor
+from pattern_language_miner.extractor.pattern_extractor import (
+    PatternExtractor,
+    select_patterns,
+)
+from pattern_language_miner.extractor.suffix_array import count_repeated_phrases
+from pattern_language_miner.extractor.word_tokenizers import (
+    get_tokenizer,
+    regex_tokenize,
+)
+from pattern_language_miner.parser.base_parser import Block
 
 
 # ---------------------------------------------------------------------------
@@ -167,3 +176,243 @@ class TestPatternExtractor:
 
         freqs = [p["frequency"] for p in patterns]
         assert freqs == sorted(freqs, reverse=True)
+
+    def test_file_types_load_mixed_corpus_as_text(self, tmp_path):
+        config = make_config(tmp_path, file_types=["md", "html", "txt"])
+        input_dir = tmp_path / "input"
+        input_dir.mkdir()
+        (input_dir / "a.md").write_text("# Install\n\nRun **pip**.", encoding="utf-8")
+        (input_dir / "b.html").write_text("<p>Run <code>pip</code>.</p>", encoding="utf-8")
+        (input_dir / "c.txt").write_text("Run pip.", encoding="utf-8")
+        (input_dir / "d.rst").write_text("Ignored.", encoding="utf-8")
+
+        extractor = PatternExtractor(config, input_dir, tmp_path / "output")
+        docs = extractor._load_documents()
+
+        assert [[b.text for b in doc] for doc in docs] == [
+            ["Install", "Run pip."],
+            ["Run pip."],
+            ["Run pip."],
+        ]
+
+    def test_large_files_load_lazily(self, tmp_path):
+        config = make_config(tmp_path, scope="line", large_file_threshold=16)
+        input_dir = tmp_path / "input"
+        input_dir.mkdir()
+        (input_dir / "big.txt").write_text(
+            "install the package\n\nthen run it\n", encoding="utf-8"
+        )
+
+        extractor = PatternExtractor(config, input_dir, tmp_path / "output")
+        (doc,) = extractor._load_documents()
+
+        assert not isinstance(doc, list)
+        assert list(extractor._split_scope(doc)) == ["install the package", "then run it"]
+        assert list(extractor._split_scope(doc)) == ["install the package", "then run it"]
+
+    def test_walk_filters_configured_in_yaml(self, tmp_path):
+        config = make_config(
+            tmp_path, exclude=["vendor", "*.gen.txt"], max_file_size=100
+        )
+        input_dir = tmp_path / "input"
+        (input_dir / "vendor").mkdir(parents=True)
+        (input_dir / "keep.txt").write_text("kept", encoding="utf-8")
+        (input_dir / "api.gen.txt").write_text("generated", encoding="utf-8")
+        (input_dir / "vendor" / "lib.txt").write_text("vendored", encoding="utf-8")
+        (input_dir / "huge.txt").write_text("x " * 100, encoding="utf-8")
+
+        extractor = PatternExtractor(config, input_dir, tmp_path / "output")
+        docs = extractor._load_documents()
+
+        assert [[b.text for b in doc] for doc in docs] == [["kept"]]
+
+    def test_html_backend_configured_in_yaml(self, tmp_path):
+        pytest.importorskip("lxml")
+        config = make_config(tmp_path, file_type="html", html_backend="lxml")
+        (tmp_path / "page.html").write_text("<p>hello</p>", encoding="utf-8")
+
+        extractor = PatternExtractor(config, tmp_path, tmp_path / "output")
+        _, _, parser = next(extractor.walker.walk())
+
+        assert parser.backend == "lxml"
+
+    def test_unsupported_file_type_rejected(self, tmp_path):
+        config = make_config(tmp_path, file_type="pdf")
+        with pytest.raises(ValueError, match="Unsupported"):
+            PatternExtractor(config, tmp_path, tmp_path / "output")
+
+    def test_block_scope_uses_parsed_structure(self, tmp_path):
+        config = make_config(
+            tmp_path,
+            scope="block",
+            block_elements=["list", "heading"],
+            exclude_block_elements=["code"],
+        )
+        extractor = PatternExtractor(config, tmp_path, tmp_path / "output")
+        blocks = [
+            Block("heading", "Setup"),
+            Block("paragraph", "Intro text."),
+            Block("list", "Run the installer"),
+            Block("code", "pip install x"),
+        ]
+
+        assert list(extractor._split_scope(blocks)) == ["Setup", "Run the installer"]
+
+    def test_excluded_blocks_dropped_in_every_scope(self, tmp_path):
+        config = make_config(tmp_path, scope="line", exclude_block_elements=["code"])
+        extractor = PatternExtractor(config, tmp_path, tmp_path / "output")
+        blocks = [Block("paragraph", "one\ntwo"), Block("code", "x = 1\ny = 2")]
+
+        assert list(extractor._split_scope(blocks)) == ["one", "two"]
+
+    def test_block_scope_without_elements_keeps_whole_document(self, tmp_path):
+        config = make_config(tmp_path, scope="block")
+        extractor = PatternExtractor(config, tmp_path, tmp_path / "output")
+
+        assert list(extractor._split_scope("first\n\nsecond")) == ["first\n\nsecond"]
+
+    def test_unknown_block_element_rejected(self, tmp_path):
+        from jsonschema import ValidationError
+
+        config = make_config(tmp_path, block_elements=["sidebar"])
+        with pytest.raises(ValidationError):
+            PatternExtractor(config, tmp_path, tmp_path / "output")
+
+    def test_closed_output_mode_drops_subsumed_ngrams(self, tmp_path):
+        config = make_config(tmp_path, output_mode="closed", ngram_max=5)
+        input_dir = tmp_path / "input"
+        input_dir.mkdir()
+        (input_dir / "a.txt").write_text(
+            "Install the package now. Install the package now.", encoding="utf-8"
+        )
+
+        extractor = PatternExtractor(config, input_dir, tmp_path / "output")
+        patterns = extractor.extract_patterns(extractor._load_documents())
+
+        assert [p["pattern"] for p in patterns] == ["install the package now ."]
+
+    def test_invalid_output_mode_rejected(self, tmp_path):
+        from jsonschema import ValidationError
+
+        config = make_config(tmp_path, output_mode="longest")
+        with pytest.raises(ValidationError):
+            PatternExtractor(config, tmp_path, tmp_path / "output")
+
+
+# ---------------------------------------------------------------------------
+# Subsumption filtering
+# ---------------------------------------------------------------------------
+
+
+COUNTS = {
+    ("install", "the"): 5,
+    ("the", "package"): 4,
+    ("install", "the", "package"): 4,
+    ("install", "the", "server"): 1,
+}
+
+
+class TestSelectPatterns:
+    def test_all_keeps_everything(self):
+        assert select_patterns(COUNTS, "all") == COUNTS
+
+    def test_closed_drops_ngrams_with_equal_frequency_extension(self):
+        assert select_patterns(COUNTS, "closed") == {
+            ("install", "the"): 5,
+            ("install", "the", "package"): 4,
+            ("install", "the", "server"): 1,
+        }
+
+    def test_maximal_drops_ngrams_with_any_frequent_extension(self):
+        assert select_patterns(COUNTS, "maximal") == {
+            ("install", "the", "package"): 4,
+            ("install", "the", "server"): 1,
+        }
+
+    def test_unknown_mode_raises(self):
+        with pytest.raises(ValueError, match="Unsupported"):
+            select_patterns(COUNTS, "longest")
+
+
+
+# ---------------------------------------------------------------------------
+# Suffix-array engine
+# ---------------------------------------------------------------------------
+
+
+def brute_force_counts(sentences, ngram_min, ngram_max, threshold):
+    counts = {}
+    for tokens in sentences:
+        for n in range(ngram_min, min(len(tokens), ngram_max) + 1):
+            for i in range(len(tokens) - n + 1):
+                gram = tuple(tokens[i:i + n])
+                counts[gram] = counts.get(gram, 0) + 1
+    return {gram: freq for gram, freq in counts.items() if freq >= threshold}
+
+
+class TestSuffixArrayEngine:
+    @pytest.mark.parametrize("threshold", [1, 2, 3])
+    @pytest.mark.parametrize("ngram_range", [(1, 1), (2, 5), (3, 12)])
+    def test_matches_window_counting(self, threshold, ngram_range):
+        import random
+
+        rng = random.Random(threshold * 100 + ngram_range[1])
+        sentences = [
+            [rng.choice("abcd") for _ in range(rng.randint(0, 15))]
+            for _ in range(40)
+        ]
+        expected = brute_force_counts(sentences, *ngram_range, threshold)
+
+        assert count_repeated_phrases(sentences, *ngram_range, threshold) == expected
+
+    def test_phrases_do_not_cross_sentences(self):
+        counts = count_repeated_phrases([["a", "b"], ["b", "a"], ["a", "b"]], 2, 4, 1)
+
+        assert counts == {("a", "b"): 2, ("b", "a"): 1}
+
+    def test_empty_corpus(self):
+        assert count_repeated_phrases([], 2, 5, 1) == {}
+
+    def test_engine_selected_from_config(self, tmp_path):
+        config = make_config(tmp_path, engine="suffix_array")
+        extractor = PatternExtractor(config, tmp_path, tmp_path / "output")
+
+        assert extractor.engine == "suffix_array"
+
+    def test_invalid_engine_rejected(self, tmp_path):
+        from jsonschema import ValidationError
+
+        config = make_config(tmp_path, engine="trie")
+        with pytest.raises(ValidationError):
+            PatternExtractor(config, tmp_path, tmp_path / "output")
+
+
+# ---------------------------------------------------------------------------
+# Word tokenizers
+# ---------------------------------------------------------------------------
+
+
+class TestWordTokenizers:
+    def test_regex_splits_punctuation_and_clitics(self):
+        tokens = regex_tokenize("don't install v1.2-beta, it's broken...")
+
+        assert tokens == [
+            "do", "n't", "install", "v1.2-beta", ",", "it", "'s", "broken", "...",
+        ]
+
+    def test_rust_tokenizer(self):
+        pytest.importorskip("tokenizers")
+
+        assert get_tokenizer("rust")("install the package.") == [
+            "install", "the", "package", ".",
+        ]
+
+    def test_unknown_tokenizer_raises(self):
+        with pytest.raises(ValueError, match="Unsupported"):
+            get_tokenizer("whitespace")
+
+    def test_tokenizer_selected_from_config(self, tmp_path):
+        config = make_config(tmp_path, tokenizer="regex")
+        extractor = PatternExtractor(config, tmp_path, tmp_path / "output")
+
+        assert extractor._tokenize is regex_tokenize
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 import pytest
 
-from pattern_language_miner.parser.base_parser import BaseParser
+from pattern_language_miner.parser.base_parser import BaseParser, Block
 from pattern_language_miner.parser.html_parser import HTMLParser
 from pattern_language_miner.parser.markdown_parser import MarkdownParser
 from pattern_language_miner.parser.text_parser import TextParser
@@ -40,6 +40,15 @@ class TestTextParser:
     def test_is_base_parser_subclass(self):
         assert isinstance(TextParser(), BaseParser)
 
+    def test_extract_text_returns_content(self):
+        assert TextParser().extract_text("line one\nline two") == "line one\nline two"
+
+    def test_extract_blocks_splits_paragraphs(self):
+        assert TextParser().extract_blocks("one\ntwo\n \n\nthree\n") == [
+            Block("paragraph", "one\ntwo"),
+            Block("paragraph", "three"),
+        ]
+
 
 # ---------------------------------------------------------------------------
 # MarkdownParser
@@ -70,6 +79,63 @@ class TestMarkdownParser:
     def test_is_base_parser_subclass(self):
         assert isinstance(MarkdownParser(), BaseParser)
 
+    def test_parse_returns_rendered_html_directly(self):
+        import markdown
+
+        content = "# Title\n\n---\n\nText &amp; more."
+        assert MarkdownParser().parse(content)["html"] == markdown.markdown(content)
+
+    def test_normalize_html_round_trips_through_soup(self):
+        result = MarkdownParser(normalize_html=True).parse("a\n\n---")
+        assert result["html"] == "<p>a</p>\n<hr/>"
+
+    def test_extract_blocks(self):
+        content = (
+            "# Title\n\nSome *em* &copy; <b>raw</b>.\n\n- one\n    - nested\n\n"
+            "After.\n\n    code"
+        )
+        assert MarkdownParser().extract_blocks(content) == [
+            Block("heading", "Title", "h1"),
+            Block("paragraph", "Some em © raw.", "p"),
+            Block("list", "one", "li"),
+            Block("list", "nested", "li"),
+            Block("paragraph", "After.", "p"),
+            Block("code", "code", "pre"),
+        ]
+
+    def test_extract_blocks_kinds_follow_structure(self):
+        content = "1. first\n\n    loose\n\n> quoted\n\n| a |\n|---|\n| b |"
+        blocks = MarkdownParser(extensions=["tables"]).extract_blocks(content)
+        assert [(b.kind, b.text) for b in blocks] == [
+            ("ordered_list", "first"),
+            ("ordered_list", "loose"),
+            ("blockquote", "quoted"),
+            ("table", "a"),
+            ("table", "b"),
+        ]
+
+    def test_code_text_is_unescaped(self):
+        content = (
+            "Run `a && b` now.\n\nUse `<div>` tags.\n\n"
+            "    if a < b && c > d:\n\n"
+            "```\nx<y && z>1\n```"
+        )
+        blocks = MarkdownParser(extensions=["fenced_code"]).extract_blocks(content)
+        assert [b.text for b in blocks] == [
+            "Run a && b now.",
+            "Use <div> tags.",
+            "if a < b && c > d:",
+            "x<y && z>1",
+        ]
+
+    def test_line_break_does_not_split_paragraph(self):
+        blocks = MarkdownParser().extract_blocks("first line  \nsecond line")
+        assert [b.text for b in blocks] == ["first line\nsecond line"]
+
+    def test_extract_text_strips_markup(self):
+        text = MarkdownParser().extract_text("# Title\n\nSome **bold** text.\n\n- one\n- two")
+        assert text == "Title\n\nSome bold text.\n\none\n\ntwo"
+
 
 # ---------------------------------------------------------------------------
 # HTMLParser
@@ -97,6 +163,65 @@ class TestHTMLParser:
     def test_is_base_parser_subclass(self):
         assert isinstance(HTMLParser(), BaseParser)
 
+    def test_extract_text_separates_blocks(self):
+        content = "<h1>Title</h1><p>Hello <a href='#'>link</a>.</p><ul><li>one</li></ul>"
+        assert HTMLParser().extract_text(content) == "Title\n\nHello link.\n\none"
+
+    def test_extract_text_drops_scripts_and_styles(self):
+        content = "<style>p {}</style><p>Visible</p><script>var x = 1;</script>"
+        assert HTMLParser().extract_text(content) == "Visible"
+
+    def test_iter_blocks_segments_block_elements(self):
+        content = (
+            "<html><head><title>T</title></head><body><h2>Head</h2>"
+            "<p>Unclosed &amp; wrapped\n text<ul><li>one<li>two</ul>"
+            "<table><tr><td>cell</td></tr></table><pre> keep  spaces</pre>loose</body></html>"
+        )
+        assert list(HTMLParser().iter_blocks(content)) == [
+            Block("heading", "Head", "h2"),
+            Block("paragraph", "Unclosed & wrapped text", "p"),
+            Block("list", "one", "li"),
+            Block("list", "two", "li"),
+            Block("table", "cell", "td"),
+            Block("code", " keep  spaces", "pre"),
+            Block("paragraph", "loose", "body"),
+        ]
+
+    def test_unclosed_head_ends_at_body(self):
+        for content in (
+            "<html><head><title>T</title><body><p>hello world</p></body></html>",
+            "<head><meta charset='utf-8'><style>p {}</style><h1>Hi</h1><p>hello world</p>",
+        ):
+            texts = [b.text for b in HTMLParser().iter_blocks(content)]
+            assert texts[-1] == "hello world"
+            assert "T" not in texts and "p {}" not in texts
+
+    def test_iter_blocks_accepts_chunks(self):
+        content = "<p>First paragraph</p><p>Second <em>one</em></p>"
+        chunks = [content[i:i + 7] for i in range(0, len(content), 7)]
+        assert list(HTMLParser().iter_blocks(chunks)) == list(
+            HTMLParser().iter_blocks(content)
+        )
+
+    def test_lxml_backend(self):
+        pytest.importorskip("lxml")
+        assert "<p>Para</p>" in HTMLParser(backend="lxml").parse("<p>Para</p>")["html"]
+
+    def test_lxml_backend_streams_the_same_blocks(self):
+        pytest.importorskip("lxml")
+        content = (
+            "<head><title>T</title><p>a &amp; b<br>c<p>d"
+            "<ul><li>one<li>two</ul><script>x()</script><pre> x\n y</pre>"
+        )
+        chunks = [content[i:i + 5] for i in range(0, len(content), 5)]
+        expected = list(HTMLParser().iter_blocks(content))
+        assert list(HTMLParser(backend="lxml").iter_blocks(chunks)) == expected
+        assert list(HTMLParser(backend="lxml").iter_blocks("")) == []
+
+    def test_unknown_backend_raises(self):
+        with pytest.raises(ValueError, match="Unsupported"):
+            HTMLParser(backend="html5lib")
+
 
 # ---------------------------------------------------------------------------
 # ParserFactory
@@ -121,3 +246,38 @@ class TestParserFactory:
 
     def test_case_insensitive(self):
         assert isinstance(ParserFactory.get_parser(".MD"), MarkdownParser)
+
+    def test_returns_cached_instance(self):
+        assert ParserFactory.get_parser(".md") is ParserFactory.get_parser(".markdown")
+        assert ParserFactory.get_parser(".txt") is ParserFactory.get_parser(".TXT")
+
+    def test_register_new_extension(self, monkeypatch, tmp_path):
+        from pattern_language_miner.walker import DirectoryWalker
+
+        monkeypatch.setattr(ParserFactory, "_builders", dict(ParserFactory._builders))
+        monkeypatch.setattr(ParserFactory, "_instances", {})
+        built = []
+
+        def build_rst_parser():
+            built.append(1)
+            return TextParser()
+
+        ParserFactory.register(["rst", ".REST"], build_rst_parser)
+        (tmp_path / "a.rst").write_text("Title", encoding="utf-8")
+
+        assert ".rst" in ParserFactory.supported_extensions()
+        assert ParserFactory.get_parser(".rest") is ParserFactory.get_parser(".rst")
+        assert [p.name for p, _, _ in DirectoryWalker(tmp_path, ["rst"]).walk()] == ["a.rst"]
+        assert len(built) == 1
+
+
+class TestMarkdownExtensions:
+    def test_configured_extensions_are_applied(self):
+        parser = MarkdownParser(extensions=["tables"])
+        html = parser.parse("| a | b |\n|---|---|\n| 1 | 2 |")["html"]
+        assert "<table>" in html
+
+    def test_converter_state_reset_between_documents(self):
+        parser = MarkdownParser(extensions=["footnotes"])
+        parser.parse("Text[^1].\n\n[^1]: Note.")
+        assert "footnote" not in parser.parse("Plain.")["html"]
@@ -2,16 +2,27 @@
 
 from __future__ import annotations
 
+import threading
 from typing import Any, Dict, List
 
+import numpy as np
 import pytest
 
+from pattern_language_miner.generator.generate_sentences import SentenceGenerator
 from pattern_language_miner.pipeline.events import (
     EventBus,
     PipelineEvent,
     PipelineEventType,
 )
 from pattern_language_miner.pipeline.pipeline import Pipeline, PipelineStep
+from pattern_language_miner.pipeline.steps import (
+    AnalyzeStep,
+    ClusterStep,
+    DedupStep,
+    EnrichStep,
+    ExportStep,
+    GenerateStep,
+)
 
 
 # ---------------------------------------------------------------------------
@@ -149,3 +160,173 @@ class TestPipeline:
         ctx = {"key": "value"}
         result = Pipeline([]).execute(ctx)
         assert result == ctx
+
+
+# ---------------------------------------------------------------------------
+# Concrete step tests
+# ---------------------------------------------------------------------------
+
+
+class FakeExtractor:
+    def extract(self):
+        return [
+            {"pattern": "install the package", "frequency": 5},
+            {"pattern": "install the package using", "frequency": 4},
+            {"pattern": "restart the service", "frequency": 3},
+        ]
+
+
+class FakeClusterer:
+    """Stands in for PatternClusterer without loading a model."""
+
+    field = "pattern"
+
+    def __init__(self):
+        self.patterns = []
+
+    def embed_patterns(self, batch_size=None):
+        return np.arange(len(self.patterns) * 2, dtype=float).reshape(-1, 2)
+
+    def cluster_and_reduce(self, embeddings, n_clusters, algorithm, min_cluster_size):
+        return embeddings, np.arange(len(embeddings)) % n_clusters
+
+    def visualize_clusters(self, reduced, cluster_ids, output_path, backend):
+        output_path.write_bytes(b"png")
+
+    def generate_cluster_report(self, cluster_ids, output_path, format_):
+        output_path.write_text("[]", encoding="utf-8")
+
+    def save_cluster_model(self, path):
+        path.write_bytes(b"npz")
+
+
+class TestSteps:
+    def test_patterns_stay_in_memory(self, tmp_path):
+        generator = SentenceGenerator(tmp_path, tmp_path / "out.md", "markdown")
+        steps = [
+            AnalyzeStep(FakeExtractor()),
+            DedupStep(),
+            EnrichStep(),
+            GenerateStep(generator),
+            ExportStep(tmp_path / "graph.json", format_="json"),
+        ]
+
+        context = Pipeline(steps).execute({})
+
+        assert [p["pattern"] for p in context["patterns"]] == [
+            "install the package",
+            "restart the service",
+        ]
+        assert all("keywords" in p for p in context["patterns"])
+        assert len(context["sentences"]) == 2
+        assert context["graph"].number_of_nodes() >= 1
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["graph.json", "out.md"]
+
+    def test_intermediate_files_on_request(self, tmp_path):
+        steps = [
+            AnalyzeStep(FakeExtractor(), intermediate_dir=tmp_path / "raw"),
+            EnrichStep(intermediate_dir=tmp_path / "enriched"),
+        ]
+        Pipeline(steps).execute({})
+
+        assert len(list((tmp_path / "raw").glob("*.yaml"))) == 3
+        assert len(list((tmp_path / "enriched").glob("*.yaml"))) == 3
+
+    def test_cluster_step_stores_results(self, tmp_path):
+        steps = [
+            AnalyzeStep(FakeExtractor()),
+            ClusterStep(FakeClusterer(), tmp_path / "clusters", n_clusters=2),
+            ExportStep(tmp_path / "graph.graphml"),
+        ]
+
+        context = Pipeline(steps).execute({})
+
+        assert context["embeddings"].shape == (3, 2)
+        assert [p["cluster"] for p in context["clustered_patterns"]] == [0, 1, 0]
+        assert (tmp_path / "clusters" / "clustered_patterns.json").exists()
+        assert (tmp_path / "graph.graphml").exists()
+
+
+# ---------------------------------------------------------------------------
+# Dependency-graph execution
+# ---------------------------------------------------------------------------
+
+
+class KeyStep(PipelineStep):
+    """Write ``outputs`` from ``depends_on`` after waiting on a barrier."""
+
+    def __init__(self, name, reads, writes, barrier=None):
+        self.name = name
+        self.depends_on = tuple(reads)
+        self.outputs = tuple(writes)
+        self.barrier = barrier
+
+    def run(self, context):
+        if self.barrier is not None:
+            self.barrier.wait(timeout=5)
+        for key in self.outputs:
+            context[key] = [context.get(k) for k in self.depends_on] + [self.name]
+        return context
+
+
+def fan_out(barrier=None):
+    return [
+        KeyStep("enrich", [], ["patterns"]),
+        KeyStep("cluster", ["patterns"], ["clusters"], barrier),
+        KeyStep("generate", ["patterns"], ["sentences"], barrier),
+        KeyStep("export", ["patterns"], ["graph"], barrier),
+    ]
+
+
+class TestParallelPipeline:
+    def test_dependencies_from_declared_keys(self):
+        steps = fan_out() + [IncrementStep()]
+        assert Pipeline(steps).dependencies() == [
+            frozenset(),
+            frozenset({0}),
+            frozenset({0}),
+            frozenset({0}),
+            frozenset({0, 1, 2, 3}),
+        ]
+
+    def test_independent_steps_run_concurrently(self):
+        # Deadlocks (and times out) unless all three run at the same time.
+        barrier = threading.Barrier(3)
+        result = Pipeline(fan_out(barrier), max_workers=3).execute({})
+
+        assert not barrier.broken
+        assert result["graph"] == [["enrich"], "export"]
+
+    def test_matches_sequential_result(self):
+        steps = fan_out() + [KeyStep("dedup", ["patterns"], ["patterns"]), IncrementStep()]
+        sequential = Pipeline(steps).execute({"count": 1})
+        parallel = Pipeline(steps, max_workers=4).execute({"count": 1})
+        assert parallel == sequential
+
+    def test_events_published_from_calling_thread(self):
+        bus = EventBus()
+        seen = []
+        for et in PipelineEventType:
+            bus.subscribe(et, lambda e: seen.append((e.event_type, e.step_name, threading.get_ident())))
+
+        Pipeline(fan_out(), event_bus=bus, max_workers=3).execute({})
+
+        assert {ident for *_, ident in seen} == {threading.get_ident()}
+        completed = [name for et, name, _ in seen if et == PipelineEventType.STEP_COMPLETE]
+        assert completed[0] == "enrich"
+        assert sorted(completed[1:]) == ["cluster", "export", "generate"]
+        assert seen[-1][0] == PipelineEventType.PIPELINE_COMPLETE
+
+    def test_failure_publishes_error_and_raises(self):
+        bus = EventBus()
+        errors = []
+        bus.subscribe(PipelineEventType.STEP_ERROR, errors.append)
+        steps = [KeyStep("a", [], ["x"]), FailingStep()]
+
+        with pytest.raises(RuntimeError, match="Deliberate failure"):
+            Pipeline(steps, event_bus=bus, max_workers=2).execute({})
+        assert [e.step_name for e in errors] == ["failing"]
+
+    def test_invalid_max_workers(self):
+        with pytest.raises(ValueError):
+            Pipeline([], max_workers=0)
@@ -0,0 +1,549 @@
+"""Unit tests for WeaviateStore bulk operations against a mock Weaviate."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List
+
+import numpy as np
+import pytest
+
+from pattern_language_miner.cluster.embedding_cache import EmbeddingCache
+from pattern_language_miner.vector_store.async_store import AsyncWeaviateStore
+from pattern_language_miner.vector_store.base import BatchResult, VectorStore
+from pattern_language_miner.vector_store.local_store import LocalVectorStore
+from pattern_language_miner.vector_store.weaviate_store import WeaviateStore
+
+
+# ---------------------------------------------------------------------------
+# Mock Weaviate server
+# ---------------------------------------------------------------------------
+
+
+class MockWeaviate(ThreadingHTTPServer):
+    """Record batch requests and answer them like Weaviate would."""
+
+    daemon_threads = True
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), MockHandler)
+        self.lock = threading.Lock()
+        self.batches: List[List[Dict[str, Any]]] = []
+        self.connections: set = set()
+        self.fail_next = 0
+        self.fail_status = 503
+        self.reject_ids: set = set()
+        self.truncate_response = 0
+        self.queries: List[str] = []
+        self.delay = 0.0
+        self.active = 0
+        self.peak = 0
+        self.batch_times: List[tuple] = []
+        self.query_response: Dict[str, Any] = {
+            "data": {"Get": {"Pattern": [{"id": "P-001", "name": "Install"}]}}
+        }
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+ALIASED_NEAR_TEXT = re.compile(
+    r'(q\d+): Pattern\(nearText: \{concepts: \[("(?:[^"\\]|\\.)*")\]\}'
+)
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args) -> None:  # keep test output quiet
+        pass
+
+    def do_POST(self) -> None:
+        server: MockWeaviate = self.server
+        length = int(self.headers["Content-Length"])
+        payload = json.loads(self.rfile.read(length))
+        if self.path == "/v1/graphql":
+            with server.lock:
+                server.queries.append(payload["query"])
+            aliases = ALIASED_NEAR_TEXT.findall(payload["query"])
+            if aliases:
+                # Echo each concept back as the id of its only hit.
+                get = {alias: [{"id": json.loads(text)}] for alias, text in aliases}
+                self._reply(200, {"data": {"Get": get}})
+            else:
+                self._reply(200, server.query_response)
+            return
+        objects = payload["objects"]
+        started = time.monotonic()
+        with server.lock:
+            server.active += 1
+            server.peak = max(server.peak, server.active)
+        time.sleep(server.delay)
+        with server.lock:
+            server.active -= 1
+            server.batch_times.append((started, time.monotonic()))
+            server.connections.add(self.client_address)
+            if server.fail_next:
+                server.fail_next -= 1
+                self._reply(server.fail_status, {"error": "unavailable"})
+                return
+            server.batches.append(objects)
+        response = []
+        for obj in objects:
+            item = {"id": obj["id"], "result": {}}
+            if obj["id"] in server.reject_ids:
+                item["result"] = {"errors": {"error": [{"message": "invalid object"}]}}
+            response.append(item)
+        self._reply(200, response[: len(response) - server.truncate_response])
+
+    def _reply(self, status: int, payload: Any) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture()
+def weaviate_server():
+    server = MockWeaviate()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def make_patterns(n: int) -> List[Dict[str, Any]]:
+    return [{"id": f"P-{i:03d}", "name": f"Pattern {i}"} for i in range(n)]
+
+
+# ---------------------------------------------------------------------------
+# Bulk upsert
+# ---------------------------------------------------------------------------
+
+
+class TestUpsertPatterns:
+    def test_patterns_are_sent_in_batches(self, weaviate_server):
+        store = WeaviateStore(url=weaviate_server.url, class_name="Pattern")
+        result = store.upsert_patterns(iter(make_patterns(25)), batch_size=10)
+
+        assert result.imported == 25
+        assert result.failed == 0
+        sizes = sorted(len(b) for b in weaviate_server.batches)
+        assert sizes == [5, 10, 10]
+        first = weaviate_server.batches[0][0]
+        assert first["class"] == "Pattern"
+        assert first["properties"]["id"] == first["id"]
+
+    def test_connections_are_reused(self, weaviate_server):
+        store = WeaviateStore(url=weaviate_server.url)
+        store.upsert_patterns(make_patterns(40), batch_size=2, concurrency=2)
+        assert len(weaviate_server.batches) == 20
+        assert len(weaviate_server.connections) <= 2
+
+    def test_rejected_objects_are_reported(self, weaviate_server):
+        weaviate_server.reject_ids = {"P-003"}
+        store = WeaviateStore(url=weaviate_server.url)
+        result = store.upsert_patterns(make_patterns(8), batch_size=4)
+
+        assert result.imported == 7
+        assert result.errors == {"P-003": "invalid object"}
+
+    def test_transient_failures_are_retried(self, weaviate_server):
+        weaviate_server.fail_next = 2
+        store = WeaviateStore(url=weaviate_server.url)
+        result = store.upsert_patterns(
+            make_patterns(4), batch_size=4, concurrency=1, backoff=0.01
+        )
+
+        assert result.imported == 4
+        assert result.retries == 2
+
+    def test_exhausted_retries_report_every_object(self, weaviate_server):
+        weaviate_server.fail_next = 10
+        store = WeaviateStore(url=weaviate_server.url)
+        result = store.upsert_patterns(
+            make_patterns(3), batch_size=3, max_retries=1, backoff=0.01
+        )
+
+        assert result.imported == 0
+        assert set(result.errors) == {"P-000", "P-001", "P-002"}
+        assert result.errors["P-000"].startswith("HTTP 503")
+
+    def test_client_errors_are_not_retried(self, weaviate_server):
+        weaviate_server.fail_next = 1
+        weaviate_server.fail_status = 422
+        store = WeaviateStore(url=weaviate_server.url)
+        result = store.upsert_patterns(make_patterns(2), backoff=0.01)
+
+        assert result.retries == 0
+        assert result.failed == 2
+
+    def test_unreachable_server_is_reported(self):
+        store = WeaviateStore(url="http://127.0.0.1:9", timeout=1.0)
+        result = store.upsert_patterns(make_patterns(2), max_retries=1, backoff=0.01)
+        assert result.failed == 2
+
+    def test_invalid_batch_size_raises(self):
+        with pytest.raises(ValueError):
+            WeaviateStore().upsert_patterns([], batch_size=0)
+
+    def test_negative_retries_raise(self):
+        with pytest.raises(ValueError, match="max_retries"):
+            WeaviateStore().upsert_patterns([], max_retries=-1)
+        with pytest.raises(ValueError, match="max_retries"):
+            WeaviateStore().send_batch([], max_retries=-1)
+
+    def test_truncated_response_reports_missing_objects(self, weaviate_server):
+        weaviate_server.truncate_response = 2
+        store = WeaviateStore(url=weaviate_server.url)
+        result = store.upsert_patterns(make_patterns(5), batch_size=5)
+
+        assert result.imported == 3
+        assert set(result.errors) == {"P-003", "P-004"}
+
+    def test_vector_count_must_match(self, weaviate_server):
+        store = WeaviateStore(url=weaviate_server.url)
+        with pytest.raises(ValueError):
+            store.upsert_patterns(make_patterns(3), vectors=[[1.0]] * 2)
+
+
+# ---------------------------------------------------------------------------
+# Bring-your-own vectors
+# ---------------------------------------------------------------------------
+
+
+class TestPrecomputedVectors:
+    def test_vectors_are_sent_with_objects(self, weaviate_server):
+        store = WeaviateStore(url=weaviate_server.url)
+        vectors = np.arange(6, dtype=np.float32).reshape(3, 2)
+        store.upsert_patterns(make_patterns(3), vectors=vectors, batch_size=3)
+
+        sent = weaviate_server.batches[0]
+        assert [obj["vector"] for obj in sent] == [[0.0, 1.0], [2.0, 3.0], [4.0, 5.0]]
+
+    def test_objects_without_vectors_omit_the_key(self, weaviate_server):
+        store = WeaviateStore(url=weaviate_server.url)
+        store.upsert_patterns(make_patterns(1))
+        assert "vector" not in weaviate_server.batches[0][0]
+
+    def test_upsert_from_embedding_cache(self, weaviate_server, tmp_path):
+        cache = EmbeddingCache(tmp_path / "embeddings.npz", "test-model")
+        cache.update(["install", "restart"], np.eye(2))
+        patterns = [
+            {"id": "P-1", "solution": "install"},
+            {"id": "P-2", "solution": "delete"},
+            {"id": "P-3", "solution": "restart"},
+        ]
+        store = WeaviateStore(url=weaviate_server.url)
+        result = store.upsert_patterns_from_cache(patterns, cache, batch_size=10)
+
+        assert result.imported == 2
+        assert list(result.errors) == ["P-2"]
+        sent = weaviate_server.batches[0]
+        assert [(o["id"], o["vector"]) for o in sent] == [
+            ("P-1", [1.0, 0.0]),
+            ("P-3", [0.0, 1.0]),
+        ]
+
+    def test_query_by_vector_uses_near_vector(self, weaviate_server):
+        store = WeaviateStore(url=weaviate_server.url)
+        results = store.query_by_vector(np.array([0.5, 0.25]), top_k=3)
+
+        assert results == [{"id": "P-001", "name": "Install"}]
+        query = weaviate_server.queries[0]
+        assert "nearVector: {vector: [0.5, 0.25]}" in query
+        assert "limit: 3" in query
+
+    def test_text_query_is_embedded_locally(self, weaviate_server):
+        store = WeaviateStore(url=weaviate_server.url, embed_fn=lambda text: [len(text), 0])
+        store.query_similar_patterns("abc", top_k=1)
+        assert "vector: [3.0, 0.0]" in weaviate_server.queries[0]
+
+    def test_query_errors_raise(self, weaviate_server):
+        weaviate_server.query_response = {"errors": [{"message": "no such class"}]}
+        store = WeaviateStore(url=weaviate_server.url)
+        with pytest.raises(RuntimeError, match="no such class"):
+            store.query_by_vector([1.0])
+
+
+# ---------------------------------------------------------------------------
+# Local vector store
+# ---------------------------------------------------------------------------
+
+
+def make_vectors(n: int, dim: int = 8, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(10, dim))
+    return centers[rng.integers(0, 10, n)] + 0.05 * rng.normal(size=(n, dim))
+
+
+class TestLocalVectorStore:
+    def test_both_backends_implement_the_protocol(self, tmp_path):
+        assert isinstance(LocalVectorStore(tmp_path), VectorStore)
+        assert isinstance(WeaviateStore(), VectorStore)
+
+    def test_local_store_does_not_depend_on_weaviate(self, tmp_path):
+        from pattern_language_miner.vector_store import base, local_store
+
+        shared = (local_store.BatchResult, local_store.EmbedFunction)
+        assert shared == (base.BatchResult, base.EmbedFunction)
+        assert BatchResult.__module__ == base.__name__
+        result = LocalVectorStore(tmp_path).upsert_patterns(
+            make_patterns(2), vectors=[[1.0, 0.0], [0.0, 1.0]]
+        )
+        assert type(result) is BatchResult
+        assert result.imported == 2
+
+    def test_query_returns_nearest_first(self, tmp_path):
+        store = LocalVectorStore(tmp_path)
+        store.upsert_patterns(
+            make_patterns(3), vectors=[[1.0, 0.0], [0.0, 1.0], [1.0, 1.0]]
+        )
+        results = store.query_by_vector([1.0, 0.1], top_k=2)
+
+        assert [r["id"] for r in results] == ["P-000", "P-002"]
+        assert results[0]["_additional"]["distance"] < results[1]["_additional"]["distance"]
+
+    def test_upsert_replaces_and_delete_removes(self, tmp_path):
+        store = LocalVectorStore(tmp_path)
+        store.upsert_pattern({"id": "a", "name": "old"}, [1.0, 0.0])
+        store.upsert_pattern({"id": "b"}, [0.0, 1.0])
+        store.upsert_pattern({"id": "a", "name": "new"}, [0.0, 1.0])
+
+        assert len(store) == 2
+        assert [r.get("name") for r in store.query_by_vector([0.0, 1.0], top_k=5)] == [
+            None,
+            "new",
+        ]
+        assert store.delete_pattern("b") == {"id": "b"}
+        assert store.delete_pattern("b") is None
+        assert [r["id"] for r in store.query_by_vector([0.0, 1.0])] == ["a"]
+
+    def test_text_queries_use_embed_fn(self, tmp_path):
+        store = LocalVectorStore(
+            tmp_path, embed_fn=lambda text: [text.count("a"), text.count("b")]
+        )
+        store.upsert_pattern({"id": "x", "solution": "aaa"})
+        store.upsert_pattern({"id": "y", "solution": "bbb"})
+        assert store.query_similar_patterns("ab b", top_k=1)[0]["id"] == "y"
+
+    def test_missing_embed_fn_raises(self, tmp_path):
+        with pytest.raises(ValueError, match="embed_fn"):
+            LocalVectorStore(tmp_path).query_similar_patterns("install")
+
+    def test_dimension_mismatch_raises(self, tmp_path):
+        store = LocalVectorStore(tmp_path)
+        store.upsert_pattern({"id": "a"}, [1.0, 0.0])
+        with pytest.raises(ValueError, match="dimension"):
+            store.upsert_pattern({"id": "b"}, [1.0, 0.0, 0.0])
+
+    def test_index_matches_brute_force(self, tmp_path):
+        vectors = make_vectors(2000)
+        store = LocalVectorStore(tmp_path, n_probe=4)
+        store.upsert_patterns(make_patterns(2000), vectors=vectors)
+        queries = vectors[:20] + 0.01
+        exact = [[r["id"] for r in store.query_by_vector(q, 5)] for q in queries]
+
+        store.build_index(n_lists=10)
+        indexed = [[r["id"] for r in store.query_by_vector(q, 5)] for q in queries]
+        assert indexed == exact
+
+    def test_rows_added_after_indexing_are_searched(self, tmp_path):
+        store = LocalVectorStore(tmp_path)
+        store.upsert_patterns(make_patterns(100), vectors=make_vectors(100))
+        store.build_index(n_lists=5)
+        store.upsert_pattern({"id": "late"}, [9.0] * 8)
+        assert store.query_by_vector([9.0] * 8, top_k=1)[0]["id"] == "late"
+
+    def test_store_round_trips_through_disk(self, tmp_path):
+        vectors = make_vectors(300)
+        store = LocalVectorStore(tmp_path)
+        store.upsert_patterns(make_patterns(300), vectors=vectors)
+        store.build_index(n_lists=8)
+        store.delete_pattern("P-001")
+        store.save()
+
+        reopened = LocalVectorStore(tmp_path)
+        assert len(reopened) == 299
+        assert reopened.query_by_vector(vectors[7], top_k=1)[0]["id"] == "P-007"
+        assert all(r["id"] != "P-001" for r in reopened.query_by_vector(vectors[1], 50))
+
+    def test_unsaved_index_leaves_saved_store_intact(self, tmp_path):
+        vectors = make_vectors(300)
+        store = LocalVectorStore(tmp_path)
+        store.upsert_patterns(make_patterns(300), vectors=vectors)
+        store.save()
+        store.build_index(n_lists=8)
+
+        reopened = LocalVectorStore(tmp_path)
+        assert reopened.query_by_vector(vectors[5], top_k=1)[0]["id"] == "P-005"
+        store.save()
+        assert LocalVectorStore(tmp_path).query_by_vector(vectors[5], 1)[0]["id"] == (
+            "P-005"
+        )
+        assert sorted(p.name for p in tmp_path.iterdir()) == [
+            "index.npz",
+            "patterns.json",
+            "vectors.npy",
+        ]
+
+    def test_repeated_id_in_one_batch_keeps_the_last(self, tmp_path):
+        store = LocalVectorStore(tmp_path)
+        store.upsert_patterns(
+            [{"id": "a", "name": "first"}, {"id": "a", "name": "second"}],
+            vectors=[[1.0, 0.0], [0.0, 1.0]],
+        )
+
+        assert len(store) == 1
+        results = store.query_by_vector([1.0, 0.0], top_k=5)
+        assert [(r["id"], r["name"]) for r in results] == [("a", "second")]
+
+
+# ---------------------------------------------------------------------------
+# Batched queries
+# ---------------------------------------------------------------------------
+
+
+class TestBatchQueries:
+    def test_results_follow_input_order(self, weaviate_server):
+        store = WeaviateStore(url=weaviate_server.url)
+        texts = [f"text {i}" for i in range(45)]
+        results = store.query_similar_patterns_batch(texts, top_k=2, group_size=10)
+
+        assert [r[0]["id"] for r in results] == texts
+        assert len(weaviate_server.queries) == 5
+        assert "limit: 2" in weaviate_server.queries[0]
+
+    def test_duplicates_are_queried_once(self, weaviate_server):
+        store = WeaviateStore(url=weaviate_server.url)
+        results = store.query_similar_patterns_batch(['say "hi"', "b", 'say "hi"'])
+
+        assert [r[0]["id"] for r in results] == ['say "hi"', "b", 'say "hi"']
+        assert weaviate_server.queries[0].count("nearText") == 2
+
+    def test_lru_cache_skips_repeated_queries(self, weaviate_server):
+        store = WeaviateStore(url=weaviate_server.url, query_cache_size=2)
+        store.query_similar_patterns_batch(["a", "b"])
+        store.query_similar_patterns_batch(["a", "b"])
+        assert len(weaviate_server.queries) == 1
+
+        store.query_similar_patterns_batch(["c"])  # evicts "a"
+        store.query_similar_patterns_batch(["a", "b", "c"])
+        assert weaviate_server.queries[-1].count("nearText") == 1
+
+    def test_writes_clear_the_cache(self, weaviate_server):
+        store = WeaviateStore(url=weaviate_server.url, query_cache_size=10)
+        store.query_similar_patterns_batch(["a"])
+        store.upsert_patterns(make_patterns(1))
+        store.query_similar_patterns_batch(["a"])
+        assert len(weaviate_server.queries) == 2
+
+    def test_embed_fn_sends_near_vector(self, weaviate_server):
+        store = WeaviateStore(url=weaviate_server.url, embed_fn=lambda t: [len(t)])
+        store.query_similar_patterns_batch(["ab", "abc"])
+        query = weaviate_server.queries[0]
+        assert "q0: Pattern(nearVector: {vector: [2.0]}" in query
+        assert "q1: Pattern(nearVector: {vector: [3.0]}" in query
+
+
+# ---------------------------------------------------------------------------
+# Asyncio store
+# ---------------------------------------------------------------------------
+
+
+class TestAsyncWeaviateStore:
+    def test_in_flight_requests_are_bounded(self, weaviate_server):
+        weaviate_server.delay = 0.05
+
+        async def load():
+            async with AsyncWeaviateStore(weaviate_server.url, max_in_flight=3) as store:
+                return await store.upsert_patterns(make_patterns(40), batch_size=4)
+
+        result = asyncio.run(load())
+        assert result.imported == 40
+        assert len(weaviate_server.batches) == 10
+        assert 1 < weaviate_server.peak <= 3
+
+    def test_single_upsert_is_retried(self, weaviate_server):
+        weaviate_server.fail_next = 1
+
+        async def load():
+            async with AsyncWeaviateStore(weaviate_server.url) as store:
+                return await store.upsert_pattern({"id": "P-001"}, [1.0, 0.0])
+
+        result = asyncio.run(load())
+        assert (result.imported, result.retries) == (1, 1)
+        assert weaviate_server.batches[0][0]["vector"] == [1.0, 0.0]
+
+    def test_accepts_async_iterables(self, weaviate_server):
+        async def produce():
+            for pattern in make_patterns(5):
+                await asyncio.sleep(0)
+                yield pattern
+
+        async def load():
+            async with AsyncWeaviateStore(weaviate_server.url) as store:
+                return await store.upsert_patterns(produce(), batch_size=2)
+
+        assert asyncio.run(load()).imported == 5
+
+    def test_embedding_overlaps_upload(self, weaviate_server):
+        weaviate_server.delay = 0.2
+        embed_starts: List[float] = []
+
+        def embed(texts):
+            embed_starts.append(time.monotonic())
+            return np.ones((len(texts), 2))
+
+        async def load():
+            async with AsyncWeaviateStore(weaviate_server.url) as store:
+                return await store.embed_and_upsert(
+                    make_patterns(6), embed, field="name", batch_size=2
+                )
+
+        result = asyncio.run(load())
+        assert result.imported == 6
+        assert weaviate_server.batches[0][0]["vector"] == [1.0, 1.0]
+        first_upload_end = min(end for _, end in weaviate_server.batch_times)
+        assert embed_starts[1] < first_upload_end
+
+    def test_batch_queries_keep_input_order(self, weaviate_server):
+        async def search():
+            async with AsyncWeaviateStore(weaviate_server.url) as store:
+                return await store.query_similar_patterns_batch(
+                    [f"t{i}" for i in range(7)], group_size=3
+                )
+
+        results = asyncio.run(search())
+        assert [r[0]["id"] for r in results] == [f"t{i}" for i in range(7)]
+        assert len(weaviate_server.queries) == 3
+
+    def test_shares_the_wrapped_store(self, weaviate_server):
+        store = WeaviateStore(url=weaviate_server.url)
+        assert AsyncWeaviateStore(store=store).store is store
+
+    def test_pool_matches_max_in_flight(self, weaviate_server):
+        store = AsyncWeaviateStore(weaviate_server.url, max_in_flight=8).store
+        assert store.max_connections == 8
+        assert store.pool._idle.maxsize == 8
+
+    def test_vectors_must_match_patterns(self, weaviate_server):
+        async def load(n_vectors):
+            async with AsyncWeaviateStore(weaviate_server.url) as store:
+                return await store.upsert_patterns(
+                    make_patterns(3), vectors=[[1.0]] * n_vectors, batch_size=2
+                )
+
+        with pytest.raises(ValueError, match="shorter"):
+            asyncio.run(load(2))
+        with pytest.raises(ValueError, match="longer"):
+            asyncio.run(load(4))
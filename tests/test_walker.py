@@ -9,6 +9,10 @@ from pattern_language_miner.walker import DirectoryWalker, ParserFactory, SUPPOR
 from pattern_language_miner.parser.markdown_parser import MarkdownParser
 from pattern_language_miner.parser.html_parser import HTMLParser
 from pattern_language_miner.parser.text_parser import TextParser
+from pattern_language_miner.utils.chunked_reader import (
+    ChunkedText,
+    iter_paragraphs,
+)
 
 
 class TestDirectoryWalker:
@@ -55,9 +59,238 @@ class TestDirectoryWalker:
         _, _, parser = next(DirectoryWalker(tmp_path).walk())
         assert isinstance(parser, HTMLParser)
 
+    def test_extensions_filter(self, tmp_path):
+        (tmp_path / "doc.txt").write_text("hello", encoding="utf-8")
+        (tmp_path / "page.md").write_text("# hi", encoding="utf-8")
+        (tmp_path / "page.html").write_text("<p>hi</p>", encoding="utf-8")
+
+        walker = DirectoryWalker(tmp_path, extensions=["md", ".HTML"])
+        names = [r[0].name for r in walker.walk()]
+        assert names == ["page.html", "page.md"]
+
+    def test_unsupported_extension_filter_raises(self, tmp_path):
+        with pytest.raises(ValueError, match="Unsupported"):
+            DirectoryWalker(tmp_path, extensions=["pdf"])
+
+    def test_parser_options_reach_the_factory(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(ParserFactory, "_builders", dict(ParserFactory._builders))
+        monkeypatch.setattr(ParserFactory, "_instances", {})
+        built = []
+
+        def builder(**options):
+            built.append(options)
+            return HTMLParser(**options)
+
+        ParserFactory.register(".html", builder)
+        (tmp_path / "page.html").write_text("<p>hi</p>", encoding="utf-8")
+        walker = DirectoryWalker(
+            tmp_path, parser_options={"HTML": {"backend": "html.parser"}}
+        )
+        _, _, parser = next(walker.walk())
+
+        assert built == [{"backend": "html.parser"}]
+        assert parser is ParserFactory.get_parser(".html", backend="html.parser")
+        assert parser is not ParserFactory.get_parser(".html")
+
+    def test_bad_parser_options_fail_early(self, tmp_path):
+        with pytest.raises(ValueError, match="Unsupported backend"):
+            DirectoryWalker(tmp_path, parser_options={".html": {"backend": "nope"}})
+
     def test_supported_extensions_constant(self):
         assert ".md" in SUPPORTED_EXTENSIONS
         assert ".txt" in SUPPORTED_EXTENSIONS
         assert ".html" in SUPPORTED_EXTENSIONS
         assert ".htm" in SUPPORTED_EXTENSIONS
         assert ".markdown" in SUPPORTED_EXTENSIONS
+
+
+class TestStreamingWalker:
+    @pytest.fixture()
+    def tree(self, tmp_path):
+        for rel in ["a.txt", "a/z.md", "a/b/c.txt", "a-b.txt", "B.md", "b/x.html", "ab.md", "a/skip.pdf"]:
+            path = tmp_path / rel
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(rel, encoding="utf-8")
+        return tmp_path
+
+    def test_iter_files_matches_sorted_rglob(self, tree):
+        expected = [
+            p for p in sorted(tree.rglob("*"))
+            if p.is_file() and p.suffix in SUPPORTED_EXTENSIONS
+        ]
+        assert list(DirectoryWalker(tree).iter_files()) == expected
+
+    @pytest.mark.parametrize("prefetch", [1, 3, None])
+    def test_threaded_walk_matches_serial(self, tree, prefetch):
+        serial = [(p, c) for p, c, _ in DirectoryWalker(tree).walk()]
+        threaded = [
+            (p, c) for p, c, _ in DirectoryWalker(tree, workers=4, prefetch=prefetch).walk()
+        ]
+        assert threaded == serial
+        assert [c for _, c in serial] == [p.relative_to(tree).as_posix() for p, _ in serial]
+
+    def test_prefetch_is_bounded(self, tree, monkeypatch):
+        reads = []
+        original = DirectoryWalker._read
+
+        def counting_read(self, path):
+            reads.append(path)
+            return original(self, path)
+
+        monkeypatch.setattr(DirectoryWalker, "_read", counting_read)
+        walk = DirectoryWalker(tree, workers=2, prefetch=2).walk()
+        next(walk)
+        walk.close()
+
+        assert len(reads) <= 2
+
+    def test_invalid_workers_raises(self, tmp_path):
+        with pytest.raises(ValueError):
+            DirectoryWalker(tmp_path, workers=0)
+
+
+class TestChunkedReading:
+    TEXT = "Ünïcode first.\r\nStill first.\r\n\r\n  \r\nSecond — para.\n\nThird\n"
+
+    @pytest.fixture()
+    def big_file(self, tmp_path):
+        path = tmp_path / "big.txt"
+        path.write_bytes(self.TEXT.encode("utf-8"))
+        return path
+
+    @pytest.mark.parametrize("chunk_size", [1, 2, 7, 1 << 20])
+    def test_chunks_decode_across_boundaries(self, big_file, chunk_size):
+        text = ChunkedText(big_file, chunk_size=chunk_size)
+        expected = self.TEXT.replace("\r\n", "\n")
+        assert "".join(text) == expected
+        assert "".join(text) == expected  # re-iterable
+
+    @pytest.mark.parametrize("chunk_size", [1, 3, 1 << 20])
+    def test_paragraphs_match_whole_text(self, big_file, chunk_size):
+        paragraphs = list(iter_paragraphs(ChunkedText(big_file, chunk_size=chunk_size)))
+        assert paragraphs == ["Ünïcode first.\nStill first.", "Second — para.", "Third"]
+        assert paragraphs == [b.text for b in TextParser().extract_blocks(self.TEXT.replace("\r\n", "\n"))]
+
+    def test_long_paragraph_is_split(self):
+        text = "one two three. four five six. seven eight nine."
+        parts = list(iter_paragraphs(iter(text), max_chars=20))
+        assert all(len(p) <= 20 for p in parts)
+        assert " ".join(parts).split() == text.split()
+
+    def test_large_files_stream(self, big_file, tmp_path):
+        (tmp_path / "small.txt").write_text("tiny", encoding="utf-8")
+        walker = DirectoryWalker(tmp_path, large_file_threshold=20)
+        contents = {p.name: c for p, c, _ in walker.walk()}
+
+        assert contents["small.txt"] == "tiny"
+        assert isinstance(contents["big.txt"], ChunkedText)
+
+    def test_html_blocks_stream_from_chunks(self, tmp_path):
+        path = tmp_path / "page.html"
+        path.write_text("<h1>Title</h1><p>Body <b>text</b></p>", encoding="utf-8")
+        blocks = list(HTMLParser().iter_blocks(ChunkedText(path, chunk_size=5)))
+        assert [(b.kind, b.text) for b in blocks] == [("heading", "Title"), ("paragraph", "Body text")]
+
+
+class TestEncodingHandling:
+    def test_binary_file_skipped_without_full_read(self, tmp_path, caplog):
+        (tmp_path / "blob.txt").write_bytes(b"PK\x03\x04\x00\x00" + b"x" * 100_000)
+        (tmp_path / "ok.txt").write_text("fine", encoding="utf-8")
+
+        with caplog.at_level("INFO"):
+            results = [(p.name, c) for p, c, _ in DirectoryWalker(tmp_path).walk()]
+
+        assert results == [("ok.txt", "fine")]
+        assert "Skipping binary file" in caplog.text
+
+    def test_falls_back_through_encodings(self, tmp_path):
+        (tmp_path / "win.txt").write_bytes("“quoted” café".encode("cp1252"))
+        (tmp_path / "raw.txt").write_bytes(b"caf\xe9 \x81")
+
+        contents = {p.name: c for p, c, _ in DirectoryWalker(tmp_path).walk()}
+
+        assert contents["win.txt"] == "“quoted” café"
+        assert contents["raw.txt"] == "café \x81"
+
+    def test_strict_chain_drops_undecodable_file(self, tmp_path):
+        (tmp_path / "win.txt").write_bytes("café".encode("cp1252"))
+        assert list(DirectoryWalker(tmp_path, encodings=["utf-8"]).walk()) == []
+
+    def test_byte_order_mark_wins(self, tmp_path):
+        (tmp_path / "wide.txt").write_bytes("hi\r\nthere".encode("utf-16"))
+        (tmp_path / "sig.txt").write_bytes("﻿bom".encode("utf-8"))
+
+        contents = {p.name: c for p, c, _ in DirectoryWalker(tmp_path).walk()}
+
+        assert contents == {"sig.txt": "bom", "wide.txt": "hi\nthere"}
+
+    def test_large_file_uses_sniffed_encoding(self, tmp_path):
+        (tmp_path / "big.txt").write_bytes("naïve text".encode("cp1252"))
+        (_, content, _), = DirectoryWalker(tmp_path, large_file_threshold=1).walk()
+
+        assert isinstance(content, ChunkedText)
+        assert content.encoding == "cp1252"
+        assert "".join(content) == "naïve text"
+
+    def test_unknown_encoding_rejected(self, tmp_path):
+        with pytest.raises(ValueError, match="Unknown encoding"):
+            DirectoryWalker(tmp_path, encodings=["utf-9"])
+
+
+class TestWalkFilters:
+    @pytest.fixture()
+    def repo(self, tmp_path):
+        for rel in [
+            "guide.md",
+            "CHANGELOG.md",
+            "node_modules/pkg/readme.md",
+            "docs/intro.md",
+            "docs/api/ref.html",
+            "docs/api/v2/ref.html",
+            "src/node_modules/x.txt",
+            "theme/app.min.html",
+        ]:
+            path = tmp_path / rel
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(rel, encoding="utf-8")
+        return tmp_path
+
+    def _walk(self, root, **kwargs):
+        return [p.relative_to(root).as_posix() for p in DirectoryWalker(root, **kwargs).iter_files()]
+
+    def test_exclude_names_at_any_depth(self, repo):
+        files = self._walk(repo, exclude=["node_modules", "*.min.html", "CHANGELOG.md"])
+        assert files == ["docs/api/ref.html", "docs/api/v2/ref.html", "docs/intro.md", "guide.md"]
+
+    def test_anchored_exclude_with_double_star(self, repo):
+        files = self._walk(repo, exclude=["docs/api/**", "**/node_modules"])
+        assert files == ["CHANGELOG.md", "docs/intro.md", "guide.md", "theme/app.min.html"]
+
+    def test_excluded_directories_are_not_scanned(self, repo, monkeypatch):
+        scanned = []
+        original = DirectoryWalker._scan
+
+        def recording_scan(directory):
+            scanned.append(Path(directory).relative_to(repo).as_posix())
+            return original(directory)
+
+        monkeypatch.setattr(DirectoryWalker, "_scan", staticmethod(recording_scan))
+        self._walk(repo, exclude=["node_modules", "docs/api"])
+
+        assert not any("node_modules" in d or d.startswith("docs/api") for d in scanned)
+
+    def test_include_restricts_files(self, repo):
+        assert self._walk(repo, include=["docs/**/*.html"]) == [
+            "docs/api/ref.html",
+            "docs/api/v2/ref.html",
+        ]
+        assert self._walk(repo, include=["*.md"], exclude=["node_modules"]) == [
+            "CHANGELOG.md",
+            "docs/intro.md",
+            "guide.md",
+        ]
+
+    def test_max_file_size(self, repo):
+        (repo / "guide.md").write_text("x" * 1000, encoding="utf-8")
+        assert "guide.md" not in self._walk(repo, max_file_size=100)
+        assert "guide.md" in self._walk(repo, max_file_size=1000)